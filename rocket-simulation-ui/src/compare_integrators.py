@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Accuracy against step size for the fixed-step integrators.
+
+Every scheme in simulation.INTEGRATORS is run at a range of step sizes and
+compared with a tight-tolerance adaptive (Dormand–Prince) reference run.
+
+Usage: python compare_integrators.py [thrust_curve_file]
+"""
+
+import sys
+import os
+import io
+import time
+from contextlib import redirect_stdout
+sys.path.insert(0, os.path.dirname(__file__))
+
+from simulation import run_simulation, INTEGRATORS
+
+# Default rocket from the GUI with a fixed deploy period so runs are comparable
+DEFAULT_PARAMS = dict(m=5.5, Cd=0.7, A=0.00456, rho=1.109, chute_size=1.5, chute_cd=2.2, deploy_period=1.0)
+STEP_SIZES = (0.2, 0.1, 0.05, 0.02, 0.01, 0.005)
+
+
+def compare_integrators(step_sizes=STEP_SIZES, integrators=INTEGRATORS, **params):
+    """
+    Run every integrator at every step size and return one dict per run:
+    integrator, time_step, apogee, apogee_error and landing_error (relative to
+    the reference), evaluations (force-model calls) and seconds (wall time).
+    Keyword arguments override DEFAULT_PARAMS.
+    """
+    params = {**DEFAULT_PARAMS, **params}
+    with redirect_stdout(io.StringIO()):  # run_simulation prints the total impulse every run
+        return _compare(step_sizes, integrators, params)
+
+
+def _compare(step_sizes, integrators, params):
+    reference = run_simulation(adaptive=True, rtol=1e-10, atol=1e-10, **params)
+    if isinstance(reference, dict):
+        raise ValueError(reference['error'])
+    ref_apogee = reference.event('apogee')['altitude']
+    ref_landing = reference.event('landing')['time']
+    rows = []
+    for integrator in integrators:
+        for dt in step_sizes:
+            start = time.perf_counter()
+            results = run_simulation(time_step=dt, integrator=integrator, **params)
+            seconds = time.perf_counter() - start
+            if isinstance(results, dict):
+                raise ValueError(results['error'])
+            apogee = results.event('apogee')['altitude']
+            landing = results.event('landing')['time']
+            rows.append({
+                'integrator': integrator,
+                'time_step': dt,
+                'apogee': apogee,
+                'apogee_error': (apogee - ref_apogee) / ref_apogee,
+                'landing_error': (landing - ref_landing) / ref_landing,
+                'evaluations': results.stats['evaluations'],
+                'seconds': seconds,
+            })
+    return rows
+
+
+if __name__ == "__main__":
+    params = {'thrust_curve_path': sys.argv[1]} if len(sys.argv) > 1 else {}
+    rows = compare_integrators(**params)
+    print(f"{'integrator':<14}{'dt (s)':>8}{'apogee (m)':>13}{'apogee err':>12}{'landing err':>13}{'evals':>9}{'ms':>9}")
+    for row in rows:
+        print(f"{row['integrator']:<14}{row['time_step']:>8g}{row['apogee']:>13.3f}{row['apogee_error']:>12.2e}"
+              f"{row['landing_error']:>13.2e}{row['evaluations']:>9}{row['seconds'] * 1000:>9.1f}")
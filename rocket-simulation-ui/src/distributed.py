@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Distributed sweeps over plain TCP.
+
+A Coordinator holds the parameter points and hands them out in chunks to
+workers on any machine that can reach it; each worker runs its chunk and
+sends back one compact summary record per point. A chunk whose worker
+disconnects or does not answer within chunk_timeout goes back on the queue,
+up to max_requeues times; after that its points are reported as errors.
+
+Messages are newline-delimited JSON (no pickle crosses the network, but there
+is no authentication either: use on a trusted network only).
+    worker -> coordinator  {"type": "hello", "name": ...}
+    coordinator -> worker  {"type": "base", "params": {...}}
+    coordinator -> worker  {"type": "chunk", "id": k, "points": [...]}
+    worker -> coordinator  {"type": "result", "id": k, "records": [[...] | {"error": ...}, ...]}
+    coordinator -> worker  {"type": "stop"}
+
+Start workers with:  python distributed.py worker HOST PORT [--processes N]
+"""
+
+import argparse
+import json
+import os
+import queue
+import socket
+import threading
+import time
+from itertools import product
+
+import numpy as np
+
+from simulation import list_thrust_curves, spawn_seeds
+from monte_carlo import run_point, OUTCOME_KEYS
+from sweep import SweepResults
+
+
+def _send(sock, message):
+    sock.sendall(json.dumps(message).encode('utf-8') + b'\n')
+
+
+def _receive(reader):
+    line = reader.readline()
+    if not line:
+        raise ConnectionError("Connection closed.")
+    return json.loads(line)
+
+
+def _encode_point(point):
+    # Seeds travel as (entropy, spawn_key) so the worker rebuilds the exact SeedSequence child
+    if isinstance(point.get('seed'), np.random.SeedSequence):
+        seed = point['seed']
+        point = {**point, 'seed': {'entropy': seed.entropy, 'spawn_key': list(seed.spawn_key)}}
+    return point
+
+
+def _decode_point(point):
+    if isinstance(point.get('seed'), dict):
+        seed = point['seed']
+        point = {**point, 'seed': np.random.SeedSequence(seed['entropy'], spawn_key=tuple(seed['spawn_key']))}
+    return point
+
+
+class Coordinator:
+    """
+    Serve a list of points to TCP workers and collect their summaries.
+
+    base_params: Keywords shared by every point (JSON-serializable; thrust curve
+        paths are resolved on each worker, falling back to its own library by file name)
+    points: List of point dicts as used by monte_carlo.run_point, also
+        JSON-serializable apart from SeedSequence seeds; ValueError otherwise
+    chunk_size: Points per chunk handed to a worker
+    chunk_timeout: Seconds a worker may take for one chunk before it is re-queued
+    max_requeues: Times one chunk may be re-queued before its points are
+        given up as errors (a chunk that keeps killing workers cannot stall the run)
+    progress: Called as progress(done, total) as chunks come back
+
+    Call start(), point workers at .address, then join() for the summaries
+    (one dict per point, {'error': ...} for failed points).
+    """
+
+    def __init__(self, base_params, points, host='0.0.0.0', port=0, chunk_size=16, chunk_timeout=60.0, progress=None,
+                 max_requeues=3):
+        self.base_params = dict(base_params)
+        self.points = [_encode_point(point) for point in points]
+        # Fail here rather than in a worker thread, where the chunk would only be re-queued
+        for label, value in [('base_params', self.base_params)] + [(f"point {i}", point)
+                                                                    for i, point in enumerate(self.points)]:
+            try:
+                json.dumps(value)
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"{label} cannot be sent to workers as JSON ({e}); use thrust curve paths "
+                                 f"and plain Python numbers.") from None
+        self.chunk_size = chunk_size
+        self.chunk_timeout = chunk_timeout
+        self.max_requeues = max_requeues
+        self.progress = progress
+        self.summaries = [None] * len(self.points)
+        self.requeued = 0
+        self._starts = list(range(0, len(self.points), chunk_size))
+        self._pending = queue.Queue()
+        for k in range(len(self._starts)):
+            self._pending.put(k)
+        self._finished = set()
+        self._failures = {}
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        if not self._starts:
+            self._done.set()
+        self._server = socket.create_server((host, port))
+        self._server.settimeout(0.2)
+        self.address = self._server.getsockname()[:2]
+
+    def start(self):
+        """Start accepting workers in a background thread."""
+        threading.Thread(target=self._accept, daemon=True).start()
+        return self
+
+    def join(self, timeout=None):
+        """Wait until every chunk is back; returns the summaries in point order."""
+        if not self._done.wait(timeout):
+            raise TimeoutError(f"{len(self._finished)} of {len(self._starts)} chunks finished.")
+        self.close()
+        return self.summaries
+
+    def close(self):
+        self._done.set()
+        self._server.close()
+
+    def _accept(self):
+        while not self._done.is_set():
+            try:
+                conn, _ = self._server.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn):
+        chunk = None
+        try:
+            conn.settimeout(self.chunk_timeout)
+            reader = conn.makefile('r', encoding='utf-8')
+            if _receive(reader).get('type') != 'hello':
+                return
+            _send(conn, {'type': 'base', 'params': self.base_params})
+            while not self._done.is_set():
+                try:
+                    chunk = self._pending.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                start = self._starts[chunk]
+                _send(conn, {'type': 'chunk', 'id': chunk, 'points': self.points[start:start + self.chunk_size]})
+                message = _receive(reader)
+                if message.get('type') != 'result' or message.get('id') != chunk:
+                    raise ValueError("Unexpected reply from worker.")
+                self._record(chunk, message['records'])
+                chunk = None
+            _send(conn, {'type': 'stop'})
+        except (OSError, ValueError, ConnectionError):
+            pass
+        finally:
+            if chunk is not None:
+                self._requeue(chunk)
+            conn.close()
+
+    def _requeue(self, chunk):
+        """A worker timed out or disconnected mid-chunk: hand the chunk to someone else, or give up on it."""
+        with self._lock:
+            failures = self._failures[chunk] = self._failures.get(chunk, 0) + 1
+            give_up = failures > self.max_requeues
+            if not give_up:
+                self.requeued += 1
+        if give_up:
+            size = min(self.chunk_size, len(self.points) - self._starts[chunk])
+            message = f"Chunk abandoned after {failures} failed or timed-out workers."
+            self._record(chunk, [{'error': message}] * size)
+        else:
+            self._pending.put(chunk)
+
+    def _record(self, chunk, records):
+        start = self._starts[chunk]
+        with self._lock:
+            if chunk in self._finished:
+                return
+            for i, record in enumerate(records):
+                self.summaries[start + i] = record if isinstance(record, dict) else dict(zip(OUTCOME_KEYS, record))
+            self._finished.add(chunk)
+            done = sum(min(self.chunk_size, len(self.points) - self._starts[k]) for k in self._finished)
+            if len(self._finished) == len(self._starts):
+                self._done.set()
+        if self.progress:
+            self.progress(done, len(self.points))
+
+
+def _resolve_motor(path, library):
+    """Use a thrust curve path as given if it exists here, else the library file with the same name."""
+    if not path or os.path.exists(path):
+        return path
+    return library.get(os.path.basename(path), path)
+
+
+def run_worker(host, port, connect_timeout=10.0, name=None):
+    """
+    Connect to a Coordinator and run chunks until told to stop.
+    Returns the number of points run.
+    """
+    library = {os.path.basename(p): p for p in list_thrust_curves()}
+    deadline = time.monotonic() + connect_timeout
+    while True:
+        try:
+            sock = socket.create_connection((host, port), timeout=connect_timeout)
+            break
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+    sock.settimeout(None)
+    count = 0
+    with sock, sock.makefile('r', encoding='utf-8') as reader:
+        _send(sock, {'type': 'hello', 'name': name or f"{socket.gethostname()}:{os.getpid()}"})
+        base = None
+        while True:
+            try:
+                message = _receive(reader)
+            except ConnectionError:
+                return count
+            if message['type'] == 'base':
+                base = message['params']
+                for key in ('thrust_curve_path', 'motor'):
+                    if isinstance(base.get(key), str):
+                        base[key] = _resolve_motor(base[key], library)
+            elif message['type'] == 'chunk':
+                records = []
+                for point in message['points']:
+                    point = _decode_point(point)
+                    if isinstance(point.get('motor'), str):
+                        point['motor'] = _resolve_motor(point['motor'], library)
+                    try:
+                        summary = run_point(base, point)
+                    except Exception as e:  # one bad point must not take the worker (and its chunk) down
+                        summary = {'error': f"{type(e).__name__}: {e}"}
+                    records.append(summary if 'error' in summary else [summary[key] for key in OUTCOME_KEYS])
+                count += len(records)
+                _send(sock, {'type': 'result', 'id': message['id'], 'records': records})
+            elif message['type'] == 'stop':
+                return count
+
+
+def distributed_sweep(axes, base_params=None, host='0.0.0.0', port=0, chunk_size=16, chunk_timeout=60.0, seed=None,
+                      progress=None, on_listening=None, timeout=None, max_requeues=3):
+    """
+    sweep() with the points run by TCP workers instead of local processes.
+
+    Same axes, base_params and seed handling as sweep (with the same seed the
+    cube is identical). on_listening(address) is called once the coordinator
+    is accepting, e.g. to launch workers. Points that fail, including chunks
+    given up after max_requeues, are listed in SweepResults.errors.
+    Returns SweepResults.
+    """
+    axes = {name: list(values) for name, values in axes.items()}
+    base_params = dict(base_params or {})
+    points = [dict(zip(axes, values)) for values in product(*axes.values())]
+    if base_params.get('deploy_period') is None and 'deploy_period' not in axes:
+        for point, child in zip(points, spawn_seeds(seed, len(points))):
+            point['seed'] = child
+    coordinator = Coordinator(base_params, points, host, port, chunk_size, chunk_timeout, progress,
+                              max_requeues).start()
+    if on_listening:
+        on_listening(coordinator.address)
+    summaries = coordinator.join(timeout)
+
+    shape = tuple(len(values) for values in axes.values())
+    metrics = {key: np.full(len(points), np.nan) for key in OUTCOME_KEYS}
+    errors = []
+    for i, summary in enumerate(summaries):
+        if 'error' in summary:
+            errors.append((np.unravel_index(i, shape), summary['error']))
+            continue
+        for key in OUTCOME_KEYS:
+            metrics[key][i] = np.nan if summary[key] is None else summary[key]
+    return SweepResults(axes, {key: values.reshape(shape) for key, values in metrics.items()}, errors)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run simulation chunks for a distributed sweep coordinator.")
+    parser.add_argument('mode', choices=['worker'])
+    parser.add_argument('host')
+    parser.add_argument('port', type=int)
+    parser.add_argument('--processes', type=int, default=1, help="worker processes to start on this machine")
+    args = parser.parse_args()
+    if args.processes == 1:
+        print(f"Ran {run_worker(args.host, args.port)} points.")
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(args.processes) as pool:
+            counts = list(pool.map(run_worker, [args.host] * args.processes, [args.port] * args.processes))
+        print(f"Ran {sum(counts)} points on {args.processes} processes.")
@@ -0,0 +1,173 @@
+"""
+Ejection delay selection: burnout-to-apogee coast time for every motor and mass.
+
+The motor's delay grain should burn for the coast from burnout (the end of
+the thrust curve) to apogee. In this model both ends are exact events:
+
+    powered flight: one vectorized RK4 pass over every (motor, mass) pair,
+        each taking the same number of steps so its last one ends exactly at
+        its own burnout
+    coast: after burnout the mass, air density and Cd·A are constant, so the
+        climb under gravity and quadratic drag has a closed form,
+            k = ½·rho·Cd·A,  v∞ = sqrt(m·g / k)
+            coast = (v∞ / g) · atan(v_burnout / v∞)
+            climb = (m / 2k) · ln(1 + v_burnout² / v∞²)
+
+so a whole library × mass grid costs a few thousand array operations.
+"""
+
+import numpy as np
+
+from simulation import FlightModel, list_thrust_curves, load_thrust_curve, THRUST_CURVE_DIR
+
+# Factory delays (s) a motor is usually drilled down from; pass your own list for adjustable closures
+DEFAULT_DELAYS = (4, 6, 8, 10, 12, 14, 16, 18)
+
+
+class DelayTable:
+    """
+    Output of ejection_delays: arrays of shape (motors, masses).
+
+    motors: Curve names; paths: their files
+    masses: Lift-off masses (kg)
+    burnout_time, burnout_velocity, burnout_altitude: State at the end of the curve
+    coast_time: Burnout to apogee (s); NaN where the rocket does not leave the
+        pad or is already falling at burnout
+    apogee, apogee_time: m, s
+    recommended: Nearest of `delays` to coast_time (NaN where coast_time is)
+    errors: (path, message) for curves that could not be loaded
+    """
+
+    def __init__(self, motors, paths, masses, delays, errors=None, **arrays):
+        self.motors = motors
+        self.paths = paths
+        self.masses = masses
+        self.delays = delays
+        self.errors = errors or []
+        for key, values in arrays.items():
+            setattr(self, key, values)
+
+    def sel(self, key, motor, m):
+        """One value by motor name (or path) and mass."""
+        i = self.motors.index(motor) if motor in self.motors else self.paths.index(motor)
+        j = int(np.flatnonzero(np.isclose(self.masses, m))[0])
+        return float(getattr(self, key)[i, j])
+
+    def as_columns(self):
+        """Long format, one entry per (motor, mass), e.g. for pandas.DataFrame."""
+        shape = (len(self.motors), len(self.masses))
+        columns = {'motor': np.repeat(self.motors, shape[1]).tolist(), 'm': np.tile(self.masses, shape[0])}
+        for key in ('burnout_time', 'burnout_velocity', 'burnout_altitude', 'coast_time', 'apogee',
+                    'apogee_time', 'recommended'):
+            columns[key] = getattr(self, key).ravel()
+        return columns
+
+    def __repr__(self):
+        return f"DelayTable({len(self.motors)} motors x {len(self.masses)} masses)"
+
+
+def _powered_ascent(curves, index, mass, Cd, A, rho, steps):
+    """
+    RK4 through the burn for every member (curve index[i], lift-off mass[i]).
+    Returns (altitude, velocity, mass, left_pad) at each member's burnout.
+    """
+    g = FlightModel.g
+    burn = np.array([curve.burn_time for curve in curves])[index]
+    first = np.array([curve.times[0] for curve in curves])[index]
+    impulse = np.array([curve.total_impulse for curve in curves])[index]
+    # All curves in one table, each shifted clear of the others, so one np.interp serves every member
+    span = max(curve.times[-1] for curve in curves) + 1.0
+    offsets = span * np.arange(len(curves))
+    table_t = np.concatenate([curve.times + offset for curve, offset in zip(curves, offsets)])
+    table_F = np.concatenate([curve.thrusts for curve in curves])
+    offset = offsets[index]
+    k = 0.5 * rho * Cd * A
+
+    def derivatives(t, v, m):
+        F = np.interp(np.clip(t, first, burn) + offset, table_t, table_F)
+        a = (F - np.sign(v) * k * v * v) / m - g
+        return v, a, -F / impulse  # mdot as in FlightModel: F / (Isp·g0) = F / total impulse
+
+    dt = burn / steps
+    h = np.zeros(len(index))
+    v = np.zeros(len(index))
+    m = np.asarray(mass, dtype=float).copy()
+    t = np.zeros(len(index))
+    left_pad = np.ones(len(index), dtype=bool)
+    # A curve the engine cannot fly (it overflows) ends up NaN here, which fails left_pad
+    with np.errstate(over='ignore', invalid='ignore'):
+        for _ in range(steps):
+            k1 = derivatives(t, v, m)
+            k2 = derivatives(t + dt / 2, v + dt / 2 * k1[1], m + dt / 2 * k1[2])
+            k3 = derivatives(t + dt / 2, v + dt / 2 * k2[1], m + dt / 2 * k2[2])
+            k4 = derivatives(t + dt, v + dt * k3[1], m + dt * k3[2])
+            h = h + dt / 6 * (k1[0] + 2 * k2[0] + 2 * k3[0] + k4[0])
+            v = v + dt / 6 * (k1[1] + 2 * k2[1] + 2 * k3[1] + k4[1])
+            m = m + dt / 6 * (k1[2] + 2 * k2[2] + 2 * k3[2] + k4[2])
+            t = t + dt
+            # The engine ends the flight as soon as the rocket is below the pad
+            left_pad &= h >= 0
+    return h, v, m, left_pad
+
+
+def _coast(v, m, k):
+    """Closed-form time and height from burnout velocity v > 0 to apogee."""
+    g = FlightModel.g
+    with np.errstate(divide='ignore', invalid='ignore'):
+        v_terminal = np.sqrt(m * g / k)
+        time = np.where(k > 0, v_terminal / g * np.arctan(v / v_terminal), v / g)
+        climb = np.where(k > 0, m / (2 * k) * np.log1p((v / v_terminal) ** 2), v * v / (2 * g))
+    return time, climb
+
+
+def ejection_delays(base_params, masses, curve_paths=None, delays=DEFAULT_DELAYS, directory=THRUST_CURVE_DIR,
+                    steps=2000):
+    """
+    Coast time and recommended ejection delay for every motor at every mass.
+
+    base_params: Airframe keywords; Cd, A and rho are used (m is replaced by masses)
+    masses: Lift-off masses to tabulate (kg)
+    curve_paths: Motors to include (default: every curve under directory)
+    delays: Available delays (s); the nearest one to the coast time is recommended
+    steps: RK4 steps through each burn
+
+    Returns a DelayTable.
+    """
+    paths = list_thrust_curves(directory) if curve_paths is None else list(curve_paths)
+    curves, used, errors = [], [], []
+    for path in paths:
+        try:
+            curve = load_thrust_curve(path)
+        except (OSError, ValueError) as e:
+            errors.append((path, str(e)))
+            continue
+        if curve is None:
+            errors.append((path, "Thrust curve file is empty or invalid."))
+        else:
+            curves.append(curve)
+            used.append(path)
+    masses = np.atleast_1d(np.asarray(masses, dtype=float))
+    shape = (len(curves), len(masses))
+    index = np.repeat(np.arange(len(curves)), len(masses))
+    mass = np.tile(masses, len(curves))
+    arrays = {key: np.full(shape, np.nan) for key in
+              ('burnout_time', 'burnout_velocity', 'burnout_altitude', 'coast_time', 'apogee', 'apogee_time',
+               'recommended')}
+    if curves:
+        Cd, A, rho = base_params['Cd'], base_params['A'], base_params['rho']
+        h, v, m, left_pad = _powered_ascent(curves, index, mass, Cd, A, rho, steps)
+        burn = np.array([curve.burn_time for curve in curves])[index]
+        coast, climb = _coast(v, m, 0.5 * rho * Cd * A)
+        climbing = left_pad & (v > 0)
+        coast = np.where(climbing, coast, np.nan)
+        available = np.sort(np.asarray(delays, dtype=float))
+        nearest = available[np.argmin(np.abs(coast[:, None] - available[None, :]), axis=1)]
+        arrays.update(
+            burnout_time=burn.reshape(shape),
+            burnout_velocity=np.where(left_pad, v, np.nan).reshape(shape),
+            burnout_altitude=np.where(left_pad, h, np.nan).reshape(shape),
+            coast_time=coast.reshape(shape),
+            apogee=np.where(climbing, h + climb, np.nan).reshape(shape),
+            apogee_time=(burn + coast).reshape(shape),
+            recommended=np.where(climbing, nearest, np.nan).reshape(shape))
+    return DelayTable([curve.name for curve in curves], used, masses, tuple(delays), errors, **arrays)
@@ -0,0 +1,150 @@
+"""
+Append-only journal of finished batch points, so a killed sweep or Monte
+Carlo job can resume where it stopped.
+
+The file is JSON Lines: a header naming the outcome keys, then one record per
+finished point keyed by a hash of its full parameter set:
+    {"journal": 1, "keys": ["apogee", ...]}
+    {"k": "<point hash>", "o": [3939.7, ...]}
+    {"k": "<point hash>", "e": "error message"}
+Records are buffered, flushed every flush_every records and fsynced at most
+every fsync_interval seconds (and on close). A crash loses at most the
+unflushed tail, which is simply recomputed. On reopening, a torn last line
+is cut off before anything new is appended, and any other unreadable line
+is skipped.
+"""
+
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+
+from simulation import ThrustCurve
+
+
+def _canonical(value):
+    """JSON-ready form of a parameter value that is stable across processes and runs."""
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, np.random.SeedSequence):
+        return {'entropy': value.entropy, 'spawn_key': list(value.spawn_key)}
+    if isinstance(value, ThrustCurve):
+        return {'curve': value.data}
+    if isinstance(value, np.generic):
+        return value.item()
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    raise TypeError(f"Cannot journal a parameter of type {type(value).__name__}.")
+
+
+def point_key(base_params, point):
+    """Hash of everything that defines one run (base parameters overridden by the point)."""
+    text = json.dumps(_canonical({**base_params, **point}), sort_keys=True)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:32]
+
+
+class Journal:
+    """
+    Finished points of a batch job, loaded from and appended to `path`.
+
+    keys: Names of the outcome values stored per point; reopening a journal
+        written with other keys raises ValueError
+    """
+
+    def __init__(self, path, keys, flush_every=64, fsync_interval=2.0):
+        self.path = path
+        self.keys = list(keys)
+        self.flush_every = flush_every
+        self.fsync_interval = fsync_interval
+        self.records = {}
+        self._pending = []
+        self._last_sync = time.monotonic()
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        if exists:
+            exists = self._load()
+        self._file = open(path, 'a', encoding='utf-8')
+        if not exists:
+            self._file.write(json.dumps({'journal': 1, 'keys': self.keys}) + '\n')
+            self.flush(fsync=True)
+
+    def _load(self):
+        """
+        Read the records and truncate the file after its last complete line, so
+        appends never continue a line torn by a crash. Returns False when not
+        even the header survived (the file is then emptied).
+        """
+        with open(self.path, 'rb') as f:
+            lines = f.read().split(b'\n')
+        # The piece after the last newline is empty, or a torn write
+        complete = lines[:-1]
+        end = sum(len(line) + 1 for line in complete)
+        if end < os.path.getsize(self.path):
+            with open(self.path, 'r+b') as f:
+                f.truncate(end)
+        if not complete:
+            return False
+        header = json.loads(complete[0])
+        if header.get('keys') != self.keys:
+            raise ValueError(f"{self.path} was written with different outcome keys.")
+        for line in complete[1:]:
+            try:
+                record = json.loads(line)
+                self.records[record['k']] = {'error': record['e']} if 'e' in record else record['o']
+            except (ValueError, KeyError, TypeError):
+                continue  # damaged line; its point is simply run again
+        return True
+
+    def __contains__(self, key):
+        return key in self.records
+
+    def __len__(self):
+        return len(self.records)
+
+    def get(self, key):
+        """The stored outcome list for a point, {'error': message}, or None."""
+        return self.records.get(key)
+
+    def record(self, key, outcomes=None, error=None):
+        """Append one finished point (outcome values in `keys` order, or an error message)."""
+        if error is not None:
+            self.records[key] = {'error': error}
+            self._pending.append(json.dumps({'k': key, 'e': error}))
+        else:
+            outcomes = [float(v) for v in outcomes]
+            self.records[key] = outcomes
+            self._pending.append(json.dumps({'k': key, 'o': outcomes}))
+        if len(self._pending) >= self.flush_every:
+            self.flush()
+
+    def flush(self, fsync=None):
+        """
+        Write buffered records. fsync defaults to "if fsync_interval has passed",
+        so bursts of flushes cost one disk sync per interval.
+        """
+        if self._pending:
+            self._file.write('\n'.join(self._pending) + '\n')
+            self._pending = []
+        self._file.flush()
+        if fsync is None:
+            fsync = time.monotonic() - self._last_sync >= self.fsync_interval
+        if fsync:
+            os.fsync(self._file.fileno())
+            self._last_sync = time.monotonic()
+
+    def close(self):
+        if not self._file.closed:
+            self.flush(fsync=True)
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __repr__(self):
+        return f"Journal({self.path!r}, {len(self.records)} points)"
@@ -4,14 +4,15 @@ import math
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
-from simulation import run_simulation
+from simulation import iter_simulation, SimulationResults, load_thrust_curve, INTEGRATORS
+from target_solver import solve_for_target
+from motor_finder import MotorFinder
+from pareto import pareto_search
+from sensitivity import sobol_indices, default_dispersions
 import os
 import json
 import numpy as np
-import random
 import traceback
-import csv
-from scipy.interpolate import interp1d
 import matplotlib.patches as mpatches
 from live_code_viewer import LiveCodeViewer  # Import our live code viewer
 
@@ -39,6 +40,233 @@ class CrashImageDialog(QtWidgets.QDialog):
         layout.addWidget(error_box)
         self.setLayout(layout)
 
+class MotorFinderDialog(QtWidgets.QDialog):
+    """Sortable, filterable ranking of the motor library; Use Selected Motor accepts with selected_path set."""
+
+    headers = [('Motor', 'motor', None), ('Apogee (m)', 'apogee', 1), ('Max Velocity (m/s)', 'max_velocity', 1),
+               ('Max Mach', 'max_mach', 3), ('Max Accel (m/s²)', 'max_acceleration', 1),
+               ('Off-pad T/W', 'thrust_to_weight', 2), ('Impulse (N·s)', 'total_impulse', 1),
+               ('Burn (s)', 'burn_time', 2)]
+
+    def __init__(self, finder, get_params, parent=None):
+        super().__init__(parent)
+        self.finder = finder
+        self.get_params = get_params
+        self.selected_path = None
+        self.setWindowTitle('Motor Finder')
+        self.resize(900, 420)
+        layout = QtWidgets.QVBoxLayout(self)
+        filter_row = QtWidgets.QHBoxLayout()
+        self.min_input = QtWidgets.QLineEdit(); self.min_input.setPlaceholderText("min apogee (m)")
+        self.max_input = QtWidgets.QLineEdit(); self.max_input.setPlaceholderText("max apogee (m)")
+        rank_button = QtWidgets.QPushButton('Rank')
+        rank_button.clicked.connect(self.refresh)
+        for widget in (QtWidgets.QLabel("Target apogee range:"), self.min_input, self.max_input, rank_button):
+            filter_row.addWidget(widget)
+        layout.addLayout(filter_row)
+        self.table = QtWidgets.QTableWidget(0, len(self.headers))
+        self.table.setHorizontalHeaderLabels([title for title, _, _ in self.headers])
+        self.table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.table.doubleClicked.connect(self.use_selected)
+        layout.addWidget(self.table)
+        self.status_label = QtWidgets.QLabel("")
+        layout.addWidget(self.status_label)
+        use_button = QtWidgets.QPushButton('Use Selected Motor')
+        use_button.clicked.connect(self.use_selected)
+        layout.addWidget(use_button)
+        self.refresh()
+
+    def _bound(self, widget):
+        try:
+            return float(widget.text())
+        except ValueError:
+            return None
+
+    def refresh(self):
+        """Rank for the parent's current inputs (cached runs are reused) and fill the table."""
+        try:
+            params = self.get_params()
+        except ValueError as e:
+            self.status_label.setText(str(e))
+            return
+        QtWidgets.QApplication.setOverrideCursor(QtCore.Qt.WaitCursor)
+        try:
+            table = self.finder.rank(params, (self._bound(self.min_input), self._bound(self.max_input)))
+        finally:
+            QtWidgets.QApplication.restoreOverrideCursor()
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(len(table))
+        for row, motor in enumerate(table):
+            for col, (_, key, decimals) in enumerate(self.headers):
+                item = QtWidgets.QTableWidgetItem()
+                if decimals is None:
+                    item.setText(motor[key])
+                else:
+                    item.setData(QtCore.Qt.DisplayRole, round(float(motor[key]), decimals))
+                item.setData(QtCore.Qt.UserRole, motor['path'])
+                self.table.setItem(row, col, item)
+        self.table.setSortingEnabled(True)
+        self.table.resizeColumnsToContents()
+        status = f"{len(table)} motors"
+        if table.errors:
+            status += "; skipped " + ", ".join(os.path.basename(path) for path, _ in table.errors)
+        self.status_label.setText(status)
+
+    def use_selected(self, *args):
+        items = self.table.selectedItems()
+        if items:
+            self.selected_path = items[0].data(QtCore.Qt.UserRole)
+            self.accept()
+
+class ParetoDialog(QtWidgets.QDialog):
+    """NSGA-II search over mass, chute and motor: Pareto front table plus a scatter plot."""
+
+    columns = [('Motor', 'motor', None), ('Mass (kg)', 'm', 2), ('Chute (m²)', 'chute_size', 2),
+               ('Chute Cd', 'chute_cd', 2), ('Deploy Height (m)', 'chute_height', 0),
+               ('Apogee Error (m)', 'apogee_error', 1), ('Landing (m/s)', 'descent_rate', 2),
+               ('Drift (m)', 'drift', 1), ('Max Accel (m/s²)', 'max_acceleration', 1)]
+
+    def __init__(self, get_params, parent=None):
+        super().__init__(parent)
+        self.get_params = get_params
+        self.selected = None
+        self.rows = []
+        self.setWindowTitle('Pareto Design Search')
+        self.resize(1000, 700)
+        layout = QtWidgets.QVBoxLayout(self)
+        form = QtWidgets.QHBoxLayout()
+        self.target_input = QtWidgets.QLineEdit("3000")
+        self.wind_input = QtWidgets.QLineEdit("5")
+        self.population_input = QtWidgets.QSpinBox(); self.population_input.setRange(8, 500); self.population_input.setValue(48)
+        self.generations_input = QtWidgets.QSpinBox(); self.generations_input.setRange(1, 500); self.generations_input.setValue(30)
+        for label, widget in (("Target apogee (m):", self.target_input), ("Wind (m/s):", self.wind_input),
+                              ("Population:", self.population_input), ("Generations:", self.generations_input)):
+            form.addWidget(QtWidgets.QLabel(label))
+            form.addWidget(widget)
+        run_button = QtWidgets.QPushButton('Run Search')
+        run_button.clicked.connect(self.run_search)
+        form.addWidget(run_button)
+        layout.addLayout(form)
+        self.figure = plt.Figure(figsize=(6, 3))
+        self.canvas = FigureCanvas(self.figure)
+        layout.addWidget(self.canvas)
+        self.table = QtWidgets.QTableWidget(0, len(self.columns))
+        self.table.setHorizontalHeaderLabels([title for title, _, _ in self.columns])
+        self.table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        layout.addWidget(self.table)
+        self.status_label = QtWidgets.QLabel("")
+        layout.addWidget(self.status_label)
+        apply_button = QtWidgets.QPushButton('Apply Selected Design')
+        apply_button.clicked.connect(self.apply_selected)
+        layout.addWidget(apply_button)
+
+    def run_search(self):
+        try:
+            target = float(self.target_input.text())
+            wind = float(self.wind_input.text())
+        except ValueError:
+            self.status_label.setText("Target apogee and wind must be numbers.")
+            return
+        try:
+            params = self.get_params()
+        except ValueError as e:
+            self.status_label.setText(str(e))
+            return
+        def progress(generation, generations, front_size):
+            self.status_label.setText(f"Generation {generation}/{generations}: {front_size} designs on the front")
+            QtWidgets.QApplication.processEvents()
+        QtWidgets.QApplication.setOverrideCursor(QtCore.Qt.WaitCursor)
+        try:
+            results = pareto_search(dict(params, wind_speed=wind), target,
+                                    population=self.population_input.value(),
+                                    generations=self.generations_input.value(), progress=progress)
+        finally:
+            QtWidgets.QApplication.restoreOverrideCursor()
+        self.rows = results.front()
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(len(self.rows))
+        for row, design in enumerate(self.rows):
+            for col, (_, key, decimals) in enumerate(self.columns):
+                item = QtWidgets.QTableWidgetItem()
+                if decimals is None:
+                    item.setText(os.path.splitext(os.path.basename(design[key]))[0])
+                else:
+                    item.setData(QtCore.Qt.DisplayRole, round(design[key], decimals))
+                item.setData(QtCore.Qt.UserRole, row)
+                self.table.setItem(row, col, item)
+        self.table.setSortingEnabled(True)
+        self.table.resizeColumnsToContents()
+        self.figure.clear()
+        ax = self.figure.add_subplot(111)
+        points = results.plot(ax)
+        self.figure.colorbar(points, ax=ax, label='drift (m)')
+        self.canvas.draw()
+        self.status_label.setText(f"{len(self.rows)} Pareto-optimal designs from {results.evaluations} runs")
+
+    def apply_selected(self):
+        items = self.table.selectedItems()
+        if items:
+            self.selected = self.rows[items[0].data(QtCore.Qt.UserRole)]
+            self.accept()
+
+class SensitivityDialog(QtWidgets.QDialog):
+    """Sobol sensitivity of apogee, landing time and descent rate to the airframe inputs, as bar charts."""
+
+    def __init__(self, get_params, parent=None):
+        super().__init__(parent)
+        self.get_params = get_params
+        self.setWindowTitle('Sensitivity Analysis (Sobol Indices)')
+        self.resize(1100, 550)
+        layout = QtWidgets.QVBoxLayout(self)
+        form = QtWidgets.QHBoxLayout()
+        self.n_combo = QtWidgets.QComboBox()
+        self.n_combo.addItems(["128", "256", "512", "1024", "2048"])
+        self.n_combo.setCurrentText("512")
+        self.spread_input = QtWidgets.QLineEdit("10")
+        for label, widget in (("Base samples:", self.n_combo), ("Input spread (±%):", self.spread_input)):
+            form.addWidget(QtWidgets.QLabel(label))
+            form.addWidget(widget)
+        run_button = QtWidgets.QPushButton('Run Analysis')
+        run_button.clicked.connect(self.run_analysis)
+        form.addWidget(run_button)
+        layout.addLayout(form)
+        self.figure = plt.Figure(figsize=(11, 4))
+        self.canvas = FigureCanvas(self.figure)
+        layout.addWidget(self.canvas)
+        self.status_label = QtWidgets.QLabel("")
+        layout.addWidget(self.status_label)
+
+    def run_analysis(self):
+        try:
+            spread = float(self.spread_input.text()) / 100
+        except ValueError:
+            self.status_label.setText("Spread must be a number.")
+            return
+        try:
+            base = self.get_params()
+        except ValueError as e:
+            self.status_label.setText(str(e))
+            return
+        dispersions = default_dispersions(base, spread=spread)
+        n = int(self.n_combo.currentText())
+        def progress(done, total):
+            self.status_label.setText(f"Ran {done}/{total} simulations")
+            QtWidgets.QApplication.processEvents()
+        QtWidgets.QApplication.setOverrideCursor(QtCore.Qt.WaitCursor)
+        try:
+            results = sobol_indices(base, dispersions, n=n, progress=progress)
+        finally:
+            QtWidgets.QApplication.restoreOverrideCursor()
+        self.figure.clear()
+        for k, output in enumerate(results.outputs):
+            results.plot(self.figure.add_subplot(1, len(results.outputs), k + 1), output)
+        self.figure.tight_layout()
+        self.canvas.draw()
+        failed = f", {len(results.errors)} failed" if results.errors else ""
+        self.status_label.setText(f"{results.evaluations} simulations ({n} base samples × {len(results.inputs) + 2}){failed}")
+
 class RocketSimulationUI(QtWidgets.QWidget):
     def __init__(self):
         super().__init__()
@@ -1209,6 +1437,31 @@ class RocketSimulationUI(QtWidgets.QWidget):
         self.start_button.clicked.connect(self.start_simulation)
         left_layout.addWidget(self.start_button)
 
+        self.motor_finder = None
+        self.motor_finder_button = QtWidgets.QPushButton('Motor Finder...')
+        self.motor_finder_button.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed)
+        self.motor_finder_button.setToolTip('Rank every motor in the thrust curve library for this airframe')
+        self.motor_finder_button.clicked.connect(self.show_motor_finder)
+        left_layout.addWidget(self.motor_finder_button)
+
+        self.pareto_button = QtWidgets.QPushButton('Pareto Design Search...')
+        self.pareto_button.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed)
+        self.pareto_button.setToolTip('Trade off apogee error, landing speed, drift and peak acceleration over mass, chute and motor')
+        self.pareto_button.clicked.connect(self.show_pareto_search)
+        left_layout.addWidget(self.pareto_button)
+
+        self.sensitivity_button = QtWidgets.QPushButton('Sensitivity Analysis...')
+        self.sensitivity_button.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed)
+        self.sensitivity_button.setToolTip('Sobol indices: which inputs drive apogee, landing time and descent rate')
+        self.sensitivity_button.clicked.connect(self.show_sensitivity)
+        left_layout.addWidget(self.sensitivity_button)
+
+        self.solve_button = QtWidgets.QPushButton('Solve for Target...')
+        self.solve_button.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed)
+        self.solve_button.setToolTip('Find the mass or drag coefficient that reaches a target apogee, or the chute size for a target descent rate')
+        self.solve_button.clicked.connect(self.solve_for_target)
+        left_layout.addWidget(self.solve_button)
+
         # Live Code Viewer button for presentations
         self.live_code_button = QtWidgets.QPushButton('🔴 Live Code Viewer')
         self.live_code_button.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed)
@@ -1338,6 +1591,51 @@ class RocketSimulationUI(QtWidgets.QWidget):
         units_layout.addWidget(self.unit_select)
         
         settings_layout.addWidget(units_group)
+
+        # Solver selection section
+        solver_group = QtWidgets.QGroupBox("Solver")
+        solver_layout = QtWidgets.QFormLayout(solver_group)
+
+        self.integrator_combo = QtWidgets.QComboBox()
+        self.integrator_combo.addItems(INTEGRATORS)
+        self.integrator_combo.setCurrentText('semi_implicit')
+        self.integrator_combo.setToolTip("Fixed-step scheme: semi_implicit is the original update, rk4 is far more accurate at the same step size")
+        solver_layout.addRow("Integrator:", self.integrator_combo)
+
+        self.adaptive_checkbox = QtWidgets.QCheckBox("Adaptive step size (Dormand–Prince RK45)")
+        self.adaptive_checkbox.setToolTip("Take small steps only through boost and chute opening. The Time Step field becomes the first trial step.")
+        solver_layout.addRow(self.adaptive_checkbox)
+
+        self.rtol_input = QtWidgets.QLineEdit("1e-6")
+        self.rtol_input.setToolTip("Relative tolerance for adaptive stepping")
+        solver_layout.addRow("Relative Tolerance:", self.rtol_input)
+
+        self.atol_input = QtWidgets.QLineEdit("1e-6")
+        self.atol_input.setToolTip("Absolute tolerance for adaptive stepping")
+        solver_layout.addRow("Absolute Tolerance:", self.atol_input)
+
+        def update_tolerance_inputs(checked):
+            self.rtol_input.setEnabled(checked)
+            self.atol_input.setEnabled(checked)
+            self.integrator_combo.setEnabled(not checked)
+        self.adaptive_checkbox.toggled.connect(update_tolerance_inputs)
+        update_tolerance_inputs(False)
+
+        self.output_dt_input = QtWidgets.QLineEdit("")
+        self.output_dt_input.setPlaceholderText("every step")
+        self.output_dt_input.setToolTip("Seconds between stored rows in the table and plots. The solver still uses the Time Step; event points are always kept.")
+        solver_layout.addRow("Output Interval (s):", self.output_dt_input)
+
+        self.seed_input = QtWidgets.QLineEdit("")
+        self.seed_input.setPlaceholderText("random")
+        self.seed_input.setToolTip("Integer seed for the random chute opening time and launch animation noise. Leave blank for a new draw each run.")
+        solver_layout.addRow("Random Seed:", self.seed_input)
+
+        self.fast_descent_checkbox = QtWidgets.QCheckBox("Fast-forward steady chute descent")
+        self.fast_descent_checkbox.setToolTip("Once the chute is fully open and the rocket is near terminal velocity, solve the rest of the fall in closed form (one plotted point per second).")
+        solver_layout.addRow(self.fast_descent_checkbox)
+
+        settings_layout.addWidget(solver_group)
         settings_layout.addStretch()
         self.tabs.addTab(settings_widget, "Settings")
 
@@ -1583,7 +1881,7 @@ class RocketSimulationUI(QtWidgets.QWidget):
             color = '#2E8B57' if stable else '#E94F37'
             
             # Load thrust curve data using shared method
-            times_thrust, thrusts, thrust_func, burn_time = self.load_thrust_curve_data()
+            thrust_curve = self.load_thrust_curve_data()
             
             # Simulate trajectory preview using real physics
             g = 9.81
@@ -1612,7 +1910,7 @@ class RocketSimulationUI(QtWidgets.QWidget):
                 y_traj.append(altitude)
                 
                 # Get thrust at current time
-                current_thrust = float(thrust_func(t)) if t <= burn_time else 0.0
+                current_thrust = thrust_curve(t)
                 
                 # Calculate drag force
                 drag_force = 0.5 * rho * (velocity ** 2) * Cd * A if velocity > 0 else 0
@@ -1733,130 +2031,19 @@ class RocketSimulationUI(QtWidgets.QWidget):
         self.chute_size_unit.currentIndexChanged.connect(lambda: self.update_conversions('chute_size'))
 
     def load_thrust_curve_data(self):
-        """Load thrust curve data from file or use default. Returns (times, thrusts, thrust_func, burn_time)"""
-        thrust_data = []
+        """Return the ThrustCurve for the selected file, or the default curve. Curves are cached, so this is cheap per frame."""
+        curve = None
         if hasattr(self, 'thrust_curve_path') and self.thrust_curve_path:
-            path = self.thrust_curve_path
-            _, ext = os.path.splitext(path.lower())
             try:
-                if ext == '.csv':
-                    thrust_data = self.parse_csv_thrust(path)
-                elif ext in ('.eng', '.rasp'):
-                    thrust_data = self.parse_rasp_eng_thrust(path)
-                else:
-                    # Try CSV as a fallback
-                    thrust_data = self.parse_csv_thrust(path)
+                curve = load_thrust_curve(self.thrust_curve_path)
             except Exception:
-                thrust_data = []
-        
-        if not thrust_data or len(thrust_data) < 2:
+                curve = None
+            if curve is not None and len(curve.times) < 2:
+                curve = None
+        if curve is None:
             # Default thrust curve
-            thrust_data = [
-                (0.124, 816.849), (0.375, 796.043), (0.626, 781.861), (0.877, 767.440),
-                (1.129, 759.627), (1.380, 735.948), (1.631, 714.454), (1.883, 701.582),
-                (2.134, 674.667), (2.385, 656.493), (2.637, 636.076), (2.889, 612.409),
-                (3.140, 587.801), (3.391, 567.170), (3.642, 559.971), (3.894, 534.157),
-                (4.145, 444.562), (4.396, 280.510), (4.648, 216.702), (4.899, 163.136),
-                (5.150, 120.571), (5.402, 86.544), (5.653, 59.990), (5.904, 39.527),
-                (6.156, 25.914), (6.408, 0.000)
-            ]
-        
-        # Deduplicate exact or near-equal times to ensure strictly increasing for interp1d
-        deduped = []
-        last_t = None
-        for t, y in sorted(thrust_data, key=lambda p: p[0]):
-            if last_t is None or t > last_t + 1e-9:
-                deduped.append((t, y))
-                last_t = t
-            else:
-                # Replace previous with latest value at same timestamp
-                deduped[-1] = (t, y)
-                last_t = t
-        times_thrust, thrusts = zip(*deduped)
-        thrust_func = interp1d(times_thrust, thrusts, bounds_error=False, fill_value=0.0)
-        burn_time = times_thrust[-1]
-        return times_thrust, thrusts, thrust_func, burn_time
-
-    def parse_csv_thrust(self, path):
-        data = []
-        with open(path, 'r', newline='') as f:
-            reader = csv.reader(f)
-            for row in reader:
-                if not row:
-                    continue
-                # skip commented/header lines starting with a non-numeric token
-                first = row[0].strip()
-                if not first:
-                    continue
-                if first.startswith('#') or first.startswith(';'):
-                    continue
-                try:
-                    t = float(first)
-                    thrust = float(row[1]) if len(row) > 1 else None
-                    if thrust is None:
-                        continue
-                    data.append((t, thrust))
-                except Exception:
-                    # header line like "time,thrust" -> skip
-                    continue
-        # ensure sorted and unique by time (keep last occurrence on duplicates)
-        data.sort(key=lambda x: x[0])
-        deduped = []
-        last_t = None
-        for t, y in data:
-            if last_t is None or t > last_t + 1e-9:
-                deduped.append((t, y))
-                last_t = t
-            else:
-                deduped[-1] = (t, y)
-                last_t = t
-        return deduped
-
-    def parse_rasp_eng_thrust(self, path):
-        """Parse a simple RASP/ENG motor file. We read the first motor block's time/thrust pairs.
-        Lines starting with ';' or '#' are comments. The first non-comment line is header. Following lines until a blank/comment are time thrust pairs."""
-        data = []
-        with open(path, 'r') as f:
-            lines = f.readlines()
-        # strip whitespace
-        lines = [ln.strip() for ln in lines]
-        # skip initial comments
-        i = 0
-        while i < len(lines) and (not lines[i] or lines[i].startswith(';') or lines[i].startswith('#')):
-            i += 1
-        if i >= len(lines):
-            return data
-        # header line (ignored for now)
-        i += 1
-        # read pairs
-        while i < len(lines):
-            ln = lines[i]
-            if not ln or ln.startswith(';') or ln.startswith('#'):
-                # stop at blank/comment -> end of first motor block
-                break
-            parts = ln.split()
-            if len(parts) < 2:
-                break
-            try:
-                t = float(parts[0])
-                thrust = float(parts[1])
-                data.append((t, thrust))
-            except Exception:
-                # stop on parse failure for safety
-                break
-            i += 1
-        data.sort(key=lambda x: x[0])
-        # dedup
-        deduped = []
-        last_t = None
-        for t, y in data:
-            if last_t is None or t > last_t + 1e-9:
-                deduped.append((t, y))
-                last_t = t
-            else:
-                deduped[-1] = (t, y)
-                last_t = t
-        return deduped
+            curve = load_thrust_curve(None)
+        return curve
 
     def create_telemetry_dashboard(self, layout):
         """Create a professional mission control-style telemetry dashboard"""
@@ -2605,8 +2792,7 @@ class RocketSimulationUI(QtWidgets.QWidget):
                 
                 # Get thrust from thrust curve
                 try:
-                    times_thrust, thrusts, thrust_func, burn_time = self.load_thrust_curve_data()
-                    current_thrust = float(thrust_func(time)) if time <= burn_time else 0.0
+                    current_thrust = self.load_thrust_curve_data()(time)
                 except:
                     current_thrust = 0.0
                 
@@ -2679,8 +2865,7 @@ class RocketSimulationUI(QtWidgets.QWidget):
                 time = getattr(self, 'launch_time', 0.0)
                 
                 # Get thrust from thrust curve
-                times_thrust, thrusts, thrust_func, burn_time = self.load_thrust_curve_data()
-                thrust_force = float(thrust_func(time)) if time <= burn_time else 0.0
+                thrust_force = self.load_thrust_curve_data()(time)
                 
                 # Calculate drag force
                 drag_force = 0.5 * rho * (velocity ** 2) * Cd * A if velocity != 0 else 0.0
@@ -2907,6 +3092,8 @@ class RocketSimulationUI(QtWidgets.QWidget):
         self.smooth_center_y = 1.5
         self.smooth_zoom = 1.0
         self.smooth_flame_intensity = 0.0
+        # Instability noise comes from its own stream so a seeded launch replays identically
+        self.launch_rng = np.random.default_rng(self.get_seed())
         try:
             m, _, _, _, _, _, _, _, _, _, _, _ = self.get_inputs_for_simulation()
             self.launch_mass = m
@@ -2965,13 +3152,13 @@ class RocketSimulationUI(QtWidgets.QWidget):
         color = '#2E8B57' if stable else '#E94F37'
         
         # Load thrust curve data using shared method
-        times_thrust, thrusts, thrust_func, burn_time = self.load_thrust_curve_data()
+        thrust_curve = self.load_thrust_curve_data()
         
         # Current simulation time
         t = self.launch_time
         
         # Get thrust at current time
-        current_thrust = float(thrust_func(t)) if t <= burn_time else 0.0
+        current_thrust = thrust_curve(t)
         
         # Physics simulation with real parameters
         g = 9.81
@@ -3022,7 +3209,7 @@ class RocketSimulationUI(QtWidgets.QWidget):
         for step_idx in range(2):  # 2 steps of 25ms each = 50ms total
             # Sample thrust per substep for smoother burn dynamics
             t_sub = t + step_idx * dt
-            current_thrust_step = float(thrust_func(t_sub)) if t_sub <= burn_time else 0.0
+            current_thrust_step = thrust_curve(t_sub)
 
             # --- Angular dynamics (spin) ---
             # Dynamic pressure based on total speed
@@ -3038,7 +3225,7 @@ class RocketSimulationUI(QtWidgets.QWidget):
                 torque += -k_stable * q_dyn * self.launch_angle
             else:
                 torque += k_unstable * q_dyn * instability_gain * self.launch_angle
-                torque += 0.4 * q_dyn * instability_gain * (random.random() - 0.5)
+                torque += 0.4 * q_dyn * instability_gain * (self.launch_rng.random() - 0.5)
             # Damping always opposes angular velocity
             torque += -k_damp * self.launch_angular_velocity
             # Convert torque to angular acceleration via an arbitrary inertia constant
@@ -3087,7 +3274,7 @@ class RocketSimulationUI(QtWidgets.QWidget):
                 # Lateral acceleration from thrust tilt and wobble
                 a_x = thrust_x / self.launch_mass
                 a_x += (0.8 * instability_gain) * math.sin(t_sub * (6.0 + 1.5 * instability_gain))
-                a_x += (0.4 * instability_gain) * (random.random() - 0.5)  # small noise for non-periodic motion
+                a_x += (0.4 * instability_gain) * (self.launch_rng.random() - 0.5)  # small noise for non-periodic motion
                 # Horizontal drag opposes lateral velocity to avoid runaway drift
                 if self.launch_x_vel != 0:
                     drag_x_mag = 0.5 * rho * (self.launch_x_vel ** 2) * drag_area_eff
@@ -3225,7 +3412,7 @@ class RocketSimulationUI(QtWidgets.QWidget):
             # Add thrust flame based on actual thrust with smoothing
             if not hasattr(self, 'smooth_flame_intensity'):
                 self.smooth_flame_intensity = 0.0
-            max_thrust = max(thrusts) if thrusts else 1000  # Normalize flame size
+            max_thrust = thrust_curve.peak_thrust  # Normalize flame size
             target_flame_intensity = current_thrust / max_thrust if max_thrust > 0 else 0
             # Smooth flame intensity changes
             flame_smoothing = 0.2
@@ -3269,7 +3456,7 @@ class RocketSimulationUI(QtWidgets.QWidget):
 
             # FBD arrows (thrust, drag, gravity) near rocket
             # Thrust
-            max_thrust = max(thrusts) if thrusts else 1000
+            max_thrust = thrust_curve.peak_thrust
             t_scale = 0.4 * (current_thrust / max_thrust) if max_thrust > 0 else 0
             ax.arrow(x_pos, y_pos, u_forward[0]*t_scale, u_forward[1]*t_scale, head_width=0.06, head_length=0.08, fc='green', ec='green', alpha=0.8, zorder=7)
             # Drag opposite velocity
@@ -3443,25 +3630,35 @@ class RocketSimulationUI(QtWidgets.QWidget):
                 chute_size = float(self.chute_size_input.text()) if self.chute_size_input.text() else None
             except Exception:
                 chute_height = chute_size = None
-            # Get time step from UI
             try:
-                time_step = float(self.timestep_input.text())
-            except Exception:
-                time_step = 0.1
+                solver_kwargs = self.get_solver_settings()
+            except ValueError as e:
+                self.error_label.setText(str(e))
+                return
             sim_kwargs = {
                 'thrust_curve_path': self.thrust_curve_path,
                 'chute_height': chute_height,
                 'chute_size': chute_size,
-                'time_step': time_step,
                 'chute_deploy_start': chute_deploy_time,
-                'chute_cd': chute_cd
+                'chute_cd': chute_cd,
+                **solver_kwargs
             }
-            results = run_simulation(m, Cd, A, rho, **sim_kwargs)
-            # Error handling for simulation results
-            if isinstance(results, dict) and 'error' in results:
-                self.error_label.setText(results['error'])
-                return
-            if not isinstance(results, list):
+            if self.output_dt_input.text().strip():
+                try:
+                    sim_kwargs['output_dt'] = float(self.output_dt_input.text())
+                except ValueError:
+                    self.error_label.setText("Output interval must be a number of seconds.")
+                    return
+            # Stream the run in chunks so the window keeps repainting on long flights
+            results = SimulationResults()
+            for chunk in iter_simulation(m, Cd, A, rho, chunk_size=2000, **sim_kwargs):
+                # Error handling for simulation results
+                if isinstance(chunk, dict) and 'error' in chunk:
+                    self.error_label.setText(chunk['error'])
+                    return
+                results.extend(chunk)
+                QtWidgets.QApplication.processEvents()
+            if not len(results):
                 self.error_label.setText("Simulation returned unexpected data.")
                 return
             self.display_results(results)
@@ -3470,6 +3667,119 @@ class RocketSimulationUI(QtWidgets.QWidget):
         except ValueError:
             self.error_label.setText("Please enter valid numbers.")
 
+    def get_solver_settings(self):
+        """
+        Time step, integrator, adaptive tolerances, fast descent and seed from the
+        Settings tab, as run_simulation keywords. Raises ValueError with a message
+        for the user when the tolerances are not numbers.
+        """
+        # Get time step from UI
+        try:
+            time_step = float(self.timestep_input.text())
+        except Exception:
+            time_step = 0.1
+        settings = {'time_step': time_step, 'integrator': self.integrator_combo.currentText()}
+        if self.adaptive_checkbox.isChecked():
+            try:
+                settings['rtol'] = float(self.rtol_input.text())
+                settings['atol'] = float(self.atol_input.text())
+            except ValueError:
+                raise ValueError("Tolerances must be numbers, e.g. 1e-6.") from None
+            settings['adaptive'] = True
+        if self.fast_descent_checkbox.isChecked():
+            settings['fast_descent'] = True
+        settings['seed'] = self.get_seed()
+        return settings
+
+    def get_design_params(self):
+        """
+        Airframe and solver settings for the design tools (no motor), read the same
+        way Start Simulation reads them, so they simulate the same model.
+        """
+        m, Cd, A, rho, _, _, _, _, _, _, _, chute_cd = self.get_inputs_for_simulation()
+        try:
+            chute_height = float(self.chute_height_input.text()) if self.chute_height_input.text() else None
+            chute_size = float(self.chute_size_input.text()) if self.chute_size_input.text() else None
+        except ValueError:
+            chute_height = chute_size = None
+        return dict(m=m, Cd=Cd, A=A, rho=rho, chute_height=chute_height, chute_size=chute_size, chute_cd=chute_cd,
+                    **self.get_solver_settings())
+
+    def show_motor_finder(self):
+        """Open the motor finder, ranking the library for the current airframe."""
+        if self.motor_finder is None:
+            self.motor_finder = MotorFinder()
+        dialog = MotorFinderDialog(self.motor_finder, self.get_design_params, self)
+        if dialog.exec_() == QtWidgets.QDialog.Accepted and dialog.selected_path:
+            self.thrust_curve_path = dialog.selected_path
+            self.result_label.setText(f"Selected thrust curve: {dialog.selected_path}")
+
+    def show_pareto_search(self):
+        """Open the Pareto design search; an applied design fills in the inputs and motor."""
+        dialog = ParetoDialog(self.get_design_params, self)
+        if dialog.exec_() != QtWidgets.QDialog.Accepted or dialog.selected is None:
+            return
+        design = dialog.selected
+        self.mass_input.setText(f"{design['m'] / [1, 0.001, 0.453592][self.mass_unit.currentIndex()]:.4g}")
+        # Start Simulation reads the chute fields as entered
+        self.chute_size_input.setText(f"{design['chute_size']:.3g}")
+        self.chute_height_input.setText(f"{design['chute_height']:.0f}")
+        self.chute_cd_input.setText(f"{design['chute_cd']:.3g}")
+        self.thrust_curve_path = design['motor']
+        self.result_label.setText(f"Applied Pareto design with motor {os.path.basename(design['motor'])}")
+
+    def show_sensitivity(self):
+        """Open the Sobol sensitivity analysis for the current design and motor."""
+        self.save_inputs()
+        dialog = SensitivityDialog(lambda: dict(self.get_design_params(), thrust_curve_path=self.thrust_curve_path), self)
+        dialog.exec_()
+
+    def solve_for_target(self):
+        """Ask for a target and solve the mass, Cd or chute size that reaches it, then fill in the field."""
+        choices = {
+            "Mass for a target apogee": ('m', 'apogee', "Target apogee (m):", 3000.0),
+            "Drag coefficient for a target apogee": ('Cd', 'apogee', "Target apogee (m):", 3000.0),
+            "Parachute size for a target descent rate": ('chute_size', 'descent_rate', "Target descent rate (m/s):", 5.0),
+        }
+        choice, ok = QtWidgets.QInputDialog.getItem(self, "Solve for Target", "Solve for:", list(choices), 0, False)
+        if not ok:
+            return
+        param, metric, prompt, default = choices[choice]
+        target, ok = QtWidgets.QInputDialog.getDouble(self, "Solve for Target", prompt, default, 0.0, 1e6, 2)
+        if not ok:
+            return
+        self.save_inputs()
+        try:
+            base = dict(self.get_design_params(), thrust_curve_path=self.thrust_curve_path)
+        except ValueError as e:
+            self.error_label.setText(str(e))
+            return
+        QtWidgets.QApplication.setOverrideCursor(QtCore.Qt.WaitCursor)
+        try:
+            solution = solve_for_target(param, target, base, metric=metric)
+        finally:
+            QtWidgets.QApplication.restoreOverrideCursor()
+        if 'error' in solution:
+            self.error_label.setText(solution['error'])
+            return
+        self.error_label.setText("")
+        value = solution['value']
+        if param == 'm':
+            self.mass_input.setText(f"{value / [1, 0.001, 0.453592][self.mass_unit.currentIndex()]:.4g}")
+        elif param == 'Cd':
+            self.cd_input.setText(f"{value:.4g}")
+        else:
+            self.chute_size_input.setText(f"{value:.4g}")
+        self.result_label.setText(f"<b>{choice}</b><br>{param} = {value:.6g} gives {metric.replace('_', ' ')} "
+                                  f"{solution['achieved']:.2f} (target {target:g}) after {solution['evaluations']} runs.")
+
+    def get_seed(self):
+        """Seed from the Settings tab, or None for fresh randomness."""
+        try:
+            return int(self.seed_input.text())
+        except ValueError:
+            return None
+
     def get_local_speed_of_sound(self):
         try:
             temp_c = float(self.temperature_input.text())
@@ -3485,6 +3795,12 @@ class RocketSimulationUI(QtWidgets.QWidget):
         except Exception:
             return 343.0
 
+    def _result_series(self, results, key):
+        """Return one result column as an array, reading SimulationResults columns directly."""
+        if isinstance(results, SimulationResults):
+            return results.column(key)
+        return np.array([r.get(key, 0) for r in results], dtype=float)
+
     def display_results(self, results):
         if results:
          # --- Populate spreadsheet table ---
@@ -3500,33 +3816,45 @@ class RocketSimulationUI(QtWidgets.QWidget):
                         val = f"{val:.4f}"
                     self.spreadsheet_table.setItem(row_idx, col_idx, QtWidgets.QTableWidgetItem(str(val)))
             self.spreadsheet_table.resizeColumnsToContents()
-            # Find max values and their times
-            max_alt = max(r['altitude'] for r in results)
-            max_alt_idx = next(i for i, r in enumerate(results) if r['altitude'] == max_alt)
-            max_alt_time = results[max_alt_idx]['time']
-
-            max_vel = max(r['velocity'] for r in results)
-            max_vel_idx = next(i for i, r in enumerate(results) if r['velocity'] == max_vel)
-            max_vel_time = results[max_vel_idx]['time']
-
-            max_thrust = max(r['thrust'] for r in results)
-            max_thrust_idx = next(i for i, r in enumerate(results) if r['thrust'] == max_thrust)
-            max_thrust_time = results[max_thrust_idx]['time']
-
-            max_drag = max(r['drag'] for r in results)
-            max_drag_idx = next(i for i, r in enumerate(results) if r['drag'] == max_drag)
-            max_drag_time = results[max_drag_idx]['time']
-
-            max_mass = max(r['mass'] for r in results)
-            max_mass_idx = next(i for i, r in enumerate(results) if r['mass'] == max_mass)
-            max_mass_time = results[max_mass_idx]['time']
+            # Find max values and their times (argmax returns the first occurrence)
+            times = self._result_series(results, 'time')
+            altitudes = self._result_series(results, 'altitude')
+            velocities = self._result_series(results, 'velocity')
+            thrust_values = self._result_series(results, 'thrust')
+            drag_values = self._result_series(results, 'drag')
+            mass_values = self._result_series(results, 'mass')
+
+            max_alt_idx = int(np.argmax(altitudes))
+            max_alt = float(altitudes[max_alt_idx])
+            max_alt_time = float(times[max_alt_idx])
+            # Prefer the located apogee event over the highest stored step
+            apogee_event = results.event('apogee') if isinstance(results, SimulationResults) else None
+            if apogee_event:
+                max_alt = apogee_event['altitude']
+                max_alt_time = apogee_event['time']
+
+            max_vel_idx = int(np.argmax(velocities))
+            max_vel = float(velocities[max_vel_idx])
+            max_vel_time = float(times[max_vel_idx])
+
+            max_thrust_idx = int(np.argmax(thrust_values))
+            max_thrust = float(thrust_values[max_thrust_idx])
+            max_thrust_time = float(times[max_thrust_idx])
+
+            max_drag_idx = int(np.argmax(drag_values))
+            max_drag = float(drag_values[max_drag_idx])
+            max_drag_time = float(times[max_drag_idx])
+
+            max_mass_idx = int(np.argmax(mass_values))
+            max_mass = float(mass_values[max_mass_idx])
+            max_mass_time = float(times[max_mass_idx])
 
             # Mach calculation using local speed of sound
             local_a = self.get_local_speed_of_sound()
-            machs = [r['velocity']/local_a if local_a else 0 for r in results]
-            max_mach = max(machs)
-            max_mach_idx = machs.index(max_mach)
-            max_mach_time = results[max_mach_idx]['time']
+            machs = velocities / local_a if local_a else np.zeros_like(velocities)
+            max_mach_idx = int(np.argmax(machs))
+            max_mach = float(machs[max_mach_idx])
+            max_mach_time = float(times[max_mach_idx])
 
             vel_unit = 'm/s'
             alt_unit = 'm'
@@ -3556,6 +3884,15 @@ class RocketSimulationUI(QtWidgets.QWidget):
                 f"[Max Times] Apogee: {max_alt_time:.2f}s | Velocity: {max_vel_time:.2f}s | Mach: {max_mach_time:.2f}s | Thrust: {max_thrust_time:.2f}s | Drag: {max_drag_time:.2f}s | Mass: {max_mass_time:.2f}s"
             )
 
+            # Integrator bookkeeping (steps taken / rejected)
+            stats = getattr(results, 'stats', None) or {}
+            solver_row = ""
+            landing_event = results.event('landing') if isinstance(results, SimulationResults) else None
+            if landing_event:
+                solver_row += f"\n        <tr><td style='padding:2px 8px;'>Landing Time</td><td style='padding:2px 8px;text-align:right;'>{landing_event['time']:.2f} S</td></tr>"
+            if stats:
+                solver_row += f"\n        <tr><td style='padding:2px 8px;'>Steps (Rejected)</td><td style='padding:2px 8px;text-align:right;'>{stats['steps']} ({stats['rejected']})</td></tr>"
+
             # Nicely formatted compact HTML summary table (final stats)
             summary_html = f"""
 <div style='font-family:Consolas, Courier New, monospace; font-size:12px; line-height:1.25;'>
@@ -3567,7 +3904,7 @@ class RocketSimulationUI(QtWidgets.QWidget):
         <tr><td style='padding:2px 8px;'>Max Mach</td><td style='padding:2px 8px;text-align:right;'>{max_mach:.2f}</td></tr>
         <tr><td style='padding:2px 8px;'>Max Thrust</td><td style='padding:2px 8px;text-align:right;'>{max_thrust_disp:.2f} {thrust_unit.upper()}</td></tr>
         <tr><td style='padding:2px 8px;'>Max Drag</td><td style='padding:2px 8px;text-align:right;'>{max_drag_disp:.2f} {drag_unit.upper()}</td></tr>
-        <tr><td style='padding:2px 8px;'>Final Mass</td><td style='padding:2px 8px;text-align:right;'>{max_mass_disp:.2f} {mass_unit.upper()}</td></tr>
+        <tr><td style='padding:2px 8px;'>Final Mass</td><td style='padding:2px 8px;text-align:right;'>{max_mass_disp:.2f} {mass_unit.upper()}</td></tr>{solver_row}
     </table>
 </div>
 """
@@ -3585,7 +3922,7 @@ class RocketSimulationUI(QtWidgets.QWidget):
         # Apply theme-aware styling
         self.style_axes(ax)
 
-        times = [r['time'] for r in results]
+        times = self._result_series(results, 'time')
         # Pick series colors based on theme
         if self.current_theme == "retro":
             series_colors = ["#E94F37", "#1C77C3", "#FFD447", "#3C2F1E", "#A7C7E7", "#A259F7"]
@@ -3596,10 +3933,10 @@ class RocketSimulationUI(QtWidgets.QWidget):
         # Plot selected variable(s), but default to altitude for tooltip
         plotted = False
         tooltip_label = 'Altitude'
-        tooltip_values = [r['altitude'] for r in results]
+        tooltip_values = self._result_series(results, 'altitude')
         for i, (label, key) in enumerate(zip(labels, keys)):
             if self.graph_vars[label].isChecked():
-                values = [r.get(key, 0) for r in results]
+                values = self._result_series(results, key)
                 ax.plot(times, values, label=label, color=series_colors[i % len(series_colors)])
                 if not plotted:
                     tooltip_label = label
@@ -3627,8 +3964,7 @@ class RocketSimulationUI(QtWidgets.QWidget):
         self._fbd_artists = []
 
         # Get time and altitude arrays
-        times = [r['time'] for r in results]
-        altitudes = [r['altitude'] for r in results]
+        altitudes = self._result_series(results, 'altitude')
 
         # Fixed rocket size in data units (e.g., 2 seconds wide, 10 meters tall)
         rocket_width = 2.0  # seconds (x-axis units)
@@ -3665,8 +4001,10 @@ class RocketSimulationUI(QtWidgets.QWidget):
         self._fbd_artists = [rocket_artist, thrust_line, drag_line, gravity_line]
 
         # Precompute max values for normalization
-        max_thrust = max((r['thrust'] for r in results if r['thrust'] > 0), default=1)
-        max_drag = max((r['drag'] for r in results if r['drag'] > 0), default=1)
+        thrust_values = self._result_series(results, 'thrust')
+        drag_values = self._result_series(results, 'drag')
+        max_thrust = float(thrust_values.max()) if (thrust_values > 0).any() else 1
+        max_drag = float(drag_values.max()) if (drag_values > 0).any() else 1
 
         # Animation state
         self._fbd_frame = 0
@@ -3860,7 +4198,7 @@ class RocketSimulationUI(QtWidgets.QWidget):
                 if xdata is None or ydata is None:
                     self.canvas.setToolTip("")
                     return
-                idx = min(range(len(times)), key=lambda i: abs(times[i] - xdata))
+                idx = int(np.argmin(np.abs(times - xdata)))
                 xval = times[idx]
                 yval = tooltip_values[idx]
                 # Unit conversion for tooltip
@@ -3930,6 +4268,13 @@ class RocketSimulationUI(QtWidgets.QWidget):
             'start_altitude': self.start_altitude_input.text(),
             'temperature': self.temperature_input.text(),
             'humidity': self.humidity_input.text(),
+            'adaptive': self.adaptive_checkbox.isChecked(),
+            'rtol': self.rtol_input.text(),
+            'atol': self.atol_input.text(),
+            'fast_descent': self.fast_descent_checkbox.isChecked(),
+            'integrator': self.integrator_combo.currentText(),
+            'output_dt': self.output_dt_input.text(),
+            'seed': self.seed_input.text(),
         }
         try:
             with open(os.path.join(os.path.dirname(__file__), 'user_settings.json'), 'w') as f:
@@ -3965,6 +4310,13 @@ class RocketSimulationUI(QtWidgets.QWidget):
             self.start_altitude_input.setText(str(data.get('start_altitude', '0')))
             self.temperature_input.setText(str(data.get('temperature', '15')))
             self.humidity_input.setText(str(data.get('humidity', '50')))
+            self.adaptive_checkbox.setChecked(bool(data.get('adaptive', False)))
+            self.rtol_input.setText(str(data.get('rtol', '1e-6')))
+            self.atol_input.setText(str(data.get('atol', '1e-6')))
+            self.fast_descent_checkbox.setChecked(bool(data.get('fast_descent', False)))
+            self.integrator_combo.setCurrentText(str(data.get('integrator', 'semi_implicit')))
+            self.output_dt_input.setText(str(data.get('output_dt', '')))
+            self.seed_input.setText(str(data.get('seed', '')))
             # graph_select state no longer loaded (dropdown removed)
         except Exception:
             pass
@@ -0,0 +1,589 @@
+"""
+Monte Carlo dispersion runs for range-safety estimates.
+
+Inputs are perturbed around a base configuration, every run is integrated
+in summary-only mode, and runs are fanned out across processes in chunks.
+"""
+
+import io
+import math
+import os
+from concurrent.futures import as_completed
+from contextlib import redirect_stdout
+from statistics import NormalDist
+
+import numpy as np
+from scipy.special import ndtri
+from scipy.stats import qmc
+
+from simulation import (run_simulation, simulate_summary, summarize_results, load_thrust_curve, spawn_generators,
+                        ThrustCurve, SUMMARY_KEYS)
+from journal import Journal, point_key
+from shared_results import ResultBuffers, trajectory_from_buffers
+from worker_pool import get_pool, running_pool
+
+# Parameters that can be dispersed. thrust_scale multiplies the whole thrust
+# curve; wind_speed (m/s, signed) only feeds the drift estimate since the
+# simulation is vertical.
+DISPERSIBLE = ('m', 'Cd', 'A', 'rho', 'thrust_scale', 'chute_cd', 'chute_size', 'chute_height',
+               'deploy_period', 'wind_speed')
+OUTCOME_KEYS = SUMMARY_KEYS + ('drift',)
+PERCENTILES = (1, 5, 25, 50, 75, 95, 99)
+# run_simulation draws the chute opening time from this range when none is given
+DEFAULT_DEPLOY_PERIOD = ('uniform', 0.5, 2.5)
+DISTRIBUTIONS = ('normal', 'uniform', 'triangular')
+# Sampling designs for sample_inputs: independent streams, or space-filling designs
+DESIGNS = ('random', 'sobol', 'halton', 'lhs')
+
+
+class MonteCarloResults:
+    """
+    Output of run_monte_carlo.
+
+    inputs: Sampled value of every dispersed parameter, one array per name (length n)
+    outcomes: Per-run arrays for OUTCOME_KEYS (NaN where a run failed)
+    errors: List of (run index, message) for failed runs
+    trajectories, lengths: Stored trajectories when trajectory_rows was given;
+        use trajectory(i)
+
+    drift is wind_speed times the time from apogee to landing, i.e. the
+    rocket drifting with the wind under the chute.
+    """
+
+    def __init__(self, inputs, outcomes, errors=None, trajectories=None, lengths=None):
+        self.inputs = inputs
+        self.outcomes = outcomes
+        self.errors = errors or []
+        self.trajectories = trajectories
+        self.lengths = lengths
+        self.n = len(next(iter(outcomes.values())))
+        # Set by run_adaptive_monte_carlo
+        self.estimates = None
+        self.converged = None
+        self.rounds = None
+
+    def __len__(self):
+        return self.n
+
+    def trajectory(self, i):
+        """Run i's stored (thinned) trajectory as a SimulationResults."""
+        metadata = None
+        if not np.isnan(self.outcomes['deployment_time'][i]):
+            metadata = {'deployment_time': float(self.outcomes['deployment_time'][i]),
+                        'force_at_deployment': float(self.outcomes['force_at_deployment'][i])}
+        return trajectory_from_buffers(self.trajectories, self.lengths, i, metadata)
+
+    def as_columns(self):
+        """Inputs and outcomes as one dict of arrays, e.g. for pandas.DataFrame."""
+        return {**self.inputs, **self.outcomes}
+
+    def percentiles(self, q=PERCENTILES, keys=OUTCOME_KEYS):
+        """Return {outcome: {percentile: value}}, ignoring failed runs."""
+        return {key: dict(zip(q, np.nanpercentile(self.outcomes[key], q).tolist())) for key in keys}
+
+    def statistics(self, q=PERCENTILES, keys=OUTCOME_KEYS):
+        """Return {outcome: {'mean', 'std', 'min', 'max', 'p1', 'p5', ...}}, ignoring failed runs."""
+        stats = {}
+        for key in keys:
+            values = self.outcomes[key]
+            row = {'mean': float(np.nanmean(values)), 'std': float(np.nanstd(values)),
+                   'min': float(np.nanmin(values)), 'max': float(np.nanmax(values))}
+            row.update((f'p{p:g}', v) for p, v in zip(q, np.nanpercentile(values, q).tolist()))
+            stats[key] = row
+        return stats
+
+    def report(self):
+        """Text summary of an adaptive study: runs needed and each target's interval."""
+        if self.estimates is None:
+            return f"{self.n} runs, {len(self.errors)} failed."
+        status = "Converged" if self.converged else "Stopped without converging"
+        lines = [f"{status} after {self.n} runs ({self.rounds} rounds, {len(self.errors)} failed)."]
+        for e in self.estimates:
+            mark = "ok" if e['met'] else "not met"
+            lines.append(f"  {e['label']}: {e['estimate']:.6g} ± {e['half_width']:.3g} "
+                         f"(tolerance {e['tolerance']:g}, {mark})")
+        return '\n'.join(lines)
+
+    def __repr__(self):
+        return f"MonteCarloResults({self.n} runs, {len(self.errors)} failed)"
+
+
+class PairedComparison:
+    """
+    Output of compare_designs.
+
+    a, b: MonteCarloResults of each design, sample i of both using the same draws
+    differences: {outcome: b - a per sample} (NaN where either run failed)
+    """
+
+    def __init__(self, a, b):
+        self.a = a
+        self.b = b
+        self.differences = {key: b.outcomes[key] - a.outcomes[key] for key in a.outcomes}
+        self.n = a.n
+
+    def __len__(self):
+        return self.n
+
+    def statistics(self, keys=OUTCOME_KEYS, confidence=0.95):
+        """
+        Return {outcome: {'mean', 'std', 'low', 'high', 'p_b_greater',
+        'variance_reduction'}} for the paired differences b - a.
+
+        low/high bound the mean difference at the given confidence.
+        variance_reduction is var(a) + var(b) over var(b - a): roughly how many
+        times more runs two independent studies would need for the same interval.
+        """
+        stats = {}
+        for key in keys:
+            d = self.differences[key]
+            ok = np.isfinite(d)
+            if ok.sum() < 2:
+                continue
+            e = estimate(d, ('mean', key, math.inf), confidence)
+            var_d = float(np.var(d[ok], ddof=1))
+            independent = float(np.var(self.a.outcomes[key][ok], ddof=1) + np.var(self.b.outcomes[key][ok], ddof=1))
+            stats[key] = {'mean': e['estimate'], 'std': math.sqrt(var_d), 'low': e['low'], 'high': e['high'],
+                          'p_b_greater': float(np.mean(d[ok] > 0)),
+                          'variance_reduction': independent / var_d if var_d > 0 else math.inf}
+        return stats
+
+    def report(self, keys=('apogee', 'max_velocity', 'descent_rate', 'landing_time', 'drift'), confidence=0.95):
+        """Text table of the mean differences b - a with their intervals."""
+        lines = [f"Paired differences (b - a) over {self.n} samples, {confidence:.0%} intervals:"]
+        for key, row in self.statistics(keys, confidence).items():
+            lines.append(f"  {key}: {row['mean']:+.6g} [{row['low']:+.6g}, {row['high']:+.6g}], "
+                         f"b > a in {row['p_b_greater']:.0%}, variance reduced {row['variance_reduction']:.3g}x")
+        return '\n'.join(lines)
+
+    def __repr__(self):
+        return f"PairedComparison({self.n} samples)"
+
+
+def _concatenate(parts):
+    """Join consecutive MonteCarloResults (without trajectories) into one."""
+    inputs = {name: np.concatenate([part.inputs[name] for part in parts]) for name in parts[0].inputs}
+    outcomes = {key: np.concatenate([part.outcomes[key] for part in parts]) for key in parts[0].outcomes}
+    errors, offset = [], 0
+    for part in parts:
+        errors.extend((offset + i, message) for i, message in part.errors)
+        offset += part.n
+    return MonteCarloResults(inputs, outcomes, errors)
+
+
+def _spec(spec, base):
+    """Normalize a dispersion spec to (kind, args), checking what it needs."""
+    if isinstance(spec, (int, float)):
+        spec = ('normal', spec)
+    kind, *args = spec
+    if kind not in DISTRIBUTIONS:
+        raise ValueError(f"Unknown distribution {kind!r}; expected one of {', '.join(DISTRIBUTIONS)}.")
+    if kind == 'normal' and base is None:
+        raise ValueError("A normal dispersion needs a base value.")
+    return kind, args
+
+
+def _draw(spec, base, rng):
+    """
+    Sample one value for a dispersion spec:
+        sd or ('normal', sd): normal around the base value
+        ('uniform', low, high): uniform between absolute bounds
+        ('triangular', low, mode, high): triangular between absolute bounds
+    """
+    kind, args = _spec(spec, base)
+    if kind == 'normal':
+        return rng.normal(base, args[0])
+    if kind == 'uniform':
+        return rng.uniform(args[0], args[1])
+    return rng.triangular(args[0], args[1], args[2])
+
+
+def _quantile(spec, base, u):
+    """Map uniform (0, 1) values onto a dispersion spec through its inverse CDF."""
+    kind, args = _spec(spec, base)
+    if kind == 'normal':
+        return base + args[0] * ndtri(u)
+    if kind == 'uniform':
+        return args[0] + u * (args[1] - args[0])
+    low, mode, high = args
+    split = (mode - low) / (high - low)
+    return np.where(u < split, low + np.sqrt(u * (high - low) * (mode - low)),
+                    high - np.sqrt((1 - u) * (high - low) * (high - mode)))
+
+
+def _unit_design(design, d, n, seed):
+    """n points of a scrambled Sobol, Halton or Latin hypercube design in the open unit cube."""
+    rng = np.random.default_rng(seed)
+    if design == 'sobol':
+        engine = qmc.Sobol(d, rng=rng)
+    elif design == 'halton':
+        engine = qmc.Halton(d, rng=rng)
+    else:
+        engine = qmc.LatinHypercube(d, rng=rng)
+    # Keep clear of 0 and 1, where the normal quantile is infinite
+    return np.clip(engine.random(n), 1e-12, 1 - 1e-12)
+
+
+def sample_inputs(base_params, dispersions, n, seed=None, design='random'):
+    """
+    Draw the dispersed inputs for n runs; returns {name: array}.
+
+    design='random': Run i draws from its own child stream of
+        spawn_generators(seed, n), so its inputs depend only on the seed and
+        i, not on n or on how runs are split.
+    design='sobol', 'halton' or 'lhs': The n runs together form one scrambled
+        low-discrepancy or Latin hypercube design over the dispersed
+        parameters (seeded by seed), mapped onto each parameter's
+        distribution. These fill the input space far more evenly, so means
+        and percentiles settle with fewer runs; Sobol is best balanced when n
+        is a power of two. Run i then depends on n as well.
+    """
+    if design not in DESIGNS:
+        raise ValueError(f"Unknown design {design!r}; expected one of {', '.join(DESIGNS)}.")
+    dispersions = dict(dispersions or {})
+    unknown = set(dispersions) - set(DISPERSIBLE)
+    if unknown:
+        raise ValueError(f"Cannot disperse {', '.join(sorted(unknown))}; choose from {', '.join(DISPERSIBLE)}.")
+    if base_params.get('deploy_period') is None:
+        dispersions.setdefault('deploy_period', DEFAULT_DEPLOY_PERIOD)
+    base = {'thrust_scale': 1.0, 'wind_speed': 0.0, **base_params}
+    names = [name for name in DISPERSIBLE if name in dispersions]
+    values = np.empty((n, len(names)))
+    if design == 'random':
+        for i, rng in enumerate(spawn_generators(seed, n)):
+            values[i] = [_draw(dispersions[name], base.get(name), rng) for name in names]
+    elif names:
+        u = _unit_design(design, len(names), n, seed)
+        for j, name in enumerate(names):
+            values[:, j] = _quantile(dispersions[name], base.get(name), u[:, j])
+    return {name: values[:, j] for j, name in enumerate(names)}
+
+
+def run_point(base_params, point, trajectory=False):
+    """
+    Summary of one run with `point` overriding base_params.
+
+    Besides run_simulation keywords a point may set motor (a thrust curve
+    path, ThrustCurve or None for the default curve), thrust_scale and
+    wind_speed. Returns the summary dict plus drift, or {'error': ...} (also
+    when the thrust curve cannot be loaded). With trajectory=True returns
+    (summary, SimulationResults or None).
+    """
+    try:
+        return _run_point(base_params, point, trajectory)
+    except (OSError, ValueError) as e:
+        summary = {'error': f"{type(e).__name__}: {e}"}
+        return (summary, None) if trajectory else summary
+
+
+def _run_point(base_params, point, trajectory):
+    params = {**base_params, **point}
+    if 'motor' in params:
+        motor = params.pop('motor')
+        if isinstance(motor, ThrustCurve):
+            params['thrust_curve'] = motor
+        else:
+            params['thrust_curve_path'] = motor
+    scale = params.pop('thrust_scale', 1.0)
+    wind_speed = params.pop('wind_speed', 0.0)
+    if scale != 1.0:
+        curve = params.pop('thrust_curve', None) or load_thrust_curve(params.pop('thrust_curve_path', None))
+        params.pop('thrust_curve_path', None)
+        if curve is None:
+            return {'error': "Thrust curve file is empty or invalid."}
+        params['thrust_curve'] = curve.scaled(scale)
+    results = None
+    if trajectory:
+        with redirect_stdout(io.StringIO()):  # run_simulation prints the total impulse every run
+            results = run_simulation(**params)
+        summary = results if isinstance(results, dict) else summarize_results(results, params.get('speed_of_sound', 343.0))
+    else:
+        summary = simulate_summary(**params)
+    if 'error' not in summary:
+        summary['drift'] = wind_speed * (summary['landing_time'] - summary['apogee_time'])
+    if trajectory:
+        return summary, None if isinstance(results, dict) else results
+    return summary
+
+
+def estimate(values, target, confidence=0.95):
+    """
+    Point estimate and two-sided confidence interval for one target statistic
+    over the finite entries of values (failed runs are NaN and left out).
+
+    target: ('mean', key, tolerance), ('percentile', key, q, tolerance) or
+        ('exceedance', key, limit, tolerance), the last being P(value > limit)
+    confidence: Interval coverage, e.g. 0.95
+
+    The mean uses the normal approximation, percentiles the distribution-free
+    order-statistic interval and exceedance probabilities the Wilson score
+    interval. Returns {'label', 'estimate', 'low', 'high', 'half_width',
+    'tolerance', 'met'}; the half width is infinite until there are enough runs.
+    """
+    kind, key, *args = target
+    tolerance = args[-1]
+    x = np.sort(np.asarray(values, dtype=float))
+    x = x[np.isfinite(x)]
+    n = len(x)
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    low = high = np.nan
+    value = np.nan
+    if kind == 'mean':
+        label = f"mean {key}"
+        if n:
+            value = float(x.mean())
+        if n > 1:
+            half = z * float(x.std(ddof=1)) / math.sqrt(n)
+            low, high = value - half, value + half
+    elif kind == 'percentile':
+        q = args[0]
+        label = f"p{q:g} {key}"
+        if n:
+            value = float(np.percentile(x, q))
+            p = q / 100
+            spread = z * math.sqrt(n * p * (1 - p))
+            lo, hi = math.floor(n * p - spread), math.ceil(n * p + spread)
+            if lo >= 0 and hi < n:
+                low, high = float(x[lo]), float(x[hi])
+    elif kind == 'exceedance':
+        limit = args[0]
+        label = f"P({key} > {limit:g})"
+        if n:
+            value = float(np.count_nonzero(x > limit)) / n
+            centre = (value + z * z / (2 * n)) / (1 + z * z / n)
+            half = z * math.sqrt(value * (1 - value) / n + z * z / (4 * n * n)) / (1 + z * z / n)
+            low, high = centre - half, centre + half
+    else:
+        raise ValueError(f"Unknown target {kind!r}; use 'mean', 'percentile' or 'exceedance'.")
+    half_width = (high - low) / 2 if np.isfinite(low) and np.isfinite(high) else math.inf
+    return {'label': label, 'estimate': value, 'low': float(low), 'high': float(high), 'half_width': half_width,
+            'tolerance': tolerance, 'met': half_width <= tolerance}
+
+
+def run_points_into(base_params, points, indices, buffers):
+    """
+    Worker task: run_point for every point of one chunk, writing point j's
+    outcomes (and trajectory, if buffers keep them) at index indices[j] of
+    the ResultBuffers. Returns only the [(index, message)] of failed points.
+    """
+    errors = []
+    keep_trajectories = buffers.trajectory_rows is not None
+    try:
+        for i, point in zip(indices, points):
+            if keep_trajectories:
+                summary, results = run_point(base_params, point, trajectory=True)
+            else:
+                summary, results = run_point(base_params, point), None
+            if 'error' in summary:
+                errors.append((i, summary['error']))
+            else:
+                buffers.write(i, summary, results)
+    finally:
+        buffers.close()
+    return errors
+
+
+def run_points_parallel(base_params, points, workers=None, pool=None, chunk_size=None, trajectory_rows=None,
+                        progress=None, journal=None):
+    """
+    Run every point through run_point, in this process when workers=1 or on
+    the warm pool otherwise, collecting into ResultBuffers.
+
+    chunk_size: Points per submitted task (default: about 4 tasks per worker)
+    progress: Called as progress(done, total) after each chunk finishes
+    journal: journal.Journal or a path to one. Points already in it are not
+        run again (their outcomes come from the journal, their trajectories
+        stay empty); every finished chunk is appended to it.
+
+    Returns (outcomes, trajectories, lengths, errors) where outcomes is a
+    (len(OUTCOME_KEYS), n) array and errors a sorted [(index, message)].
+    """
+    total = len(points)
+    own_journal = journal is not None and not isinstance(journal, Journal)
+    if own_journal:
+        journal = Journal(journal, OUTCOME_KEYS)
+    keys = [point_key(base_params, point) for point in points] if journal is not None else None
+    todo = [i for i in range(total) if keys is None or keys[i] not in journal]
+    # get_pool receives the caller's workers unchanged, so None keeps a running pool of any
+    # size; the resolved count only sizes the chunks
+    running = pool or running_pool()
+    count = workers or (running.workers if running else os.cpu_count() or 1)
+    chunk_size = chunk_size or max(1, -(-len(todo) // (count * 4)))
+    chunks = [todo[k:k + chunk_size] for k in range(0, len(todo), chunk_size)]
+
+    in_process = count == 1 or len(chunks) <= 1
+    buffers = ResultBuffers(OUTCOME_KEYS, total, trajectory_rows, shared=not in_process)
+    errors = []
+
+    def finished_chunks():
+        if in_process:
+            for chunk in chunks:
+                yield chunk, run_points_into(base_params, [points[i] for i in chunk], chunk, buffers)
+        else:
+            futures = {(pool or get_pool(workers)).submit(run_points_into, base_params, [points[i] for i in chunk],
+                                                          chunk, buffers): chunk for chunk in chunks}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+
+    try:
+        if journal is not None:
+            for i in range(total):
+                record = journal.get(keys[i])
+                if isinstance(record, dict):
+                    errors.append((i, record['error']))
+                elif record is not None:
+                    buffers.outcomes[:, i] = record
+        done = total - len(todo)
+        for chunk, chunk_errors in finished_chunks():
+            errors.extend(chunk_errors)
+            if journal is not None:
+                failed = dict(chunk_errors)
+                for i in chunk:
+                    journal.record(keys[i], buffers.outcomes[:, i], failed.get(i))
+                journal.flush()
+            done += len(chunk)
+            if progress:
+                progress(done, total)
+    finally:
+        outcomes, trajectories, lengths = buffers.collect()
+        if own_journal:
+            journal.close()
+        elif journal is not None:
+            journal.flush(fsync=True)
+    return outcomes, trajectories, lengths, sorted(errors)
+
+
+def run_monte_carlo(base_params, dispersions=None, n=1000, workers=None, seed=None, batch_size=None, trajectory_rows=None,
+                    pool=None, progress=None, journal=None, design='random'):
+    """
+    Run n dispersed simulations across worker processes.
+
+    base_params: run_simulation keyword arguments (m, Cd, A, rho, thrust_curve_path,
+        chute_size, ...), plus optional thrust_scale and wind_speed
+    dispersions: {name: spec} for names in DISPERSIBLE; a spec is a standard
+        deviation around the base value, ('normal', sd), ('uniform', low, high)
+        or ('triangular', low, mode, high). deploy_period defaults to uniform
+        0.5–2.5 s like run_simulation.
+    workers: Processes to use (default: all cores); 1 runs in this process
+    pool: WarmPool to run on (default: the shared worker_pool.get_pool(workers))
+    seed: Seed, SeedSequence or Generator; each run gets its own child stream
+    batch_size: Runs per submitted task (default: about 4 tasks per worker)
+    trajectory_rows: Also keep every run's trajectory, thinned to at most this
+        many rows (SimulationResults.decimate) [optional]
+    progress: Called as progress(done, n) after each batch finishes [optional]
+    journal: Path (or journal.Journal) to record finished runs in; rerunning
+        with the same seed and journal only computes the runs still missing
+    design: 'random', or 'sobol', 'halton' or 'lhs' for a space-filling
+        design over the dispersed inputs (see sample_inputs)
+
+    Workers write outcomes and trajectories straight into shared-memory
+    arrays (shared_results.ResultBuffers) and return only error messages.
+    Every run's inputs come from its own SeedSequence child, so the same seed
+    gives bit-identical results whatever the worker count or batch size, and
+    with the random design the first k runs of a larger study match a k-run
+    study. Returns MonteCarloResults.
+    """
+    inputs = sample_inputs(base_params, dispersions, n, seed, design)
+    rows = [{name: float(values[i]) for name, values in inputs.items()} for i in range(n)]
+    outcomes, trajectories, lengths, errors = run_points_parallel(base_params, rows, workers, pool, batch_size,
+                                                                  trajectory_rows, progress, journal)
+    outcomes = {key: outcomes[k] for k, key in enumerate(OUTCOME_KEYS)}
+    return MonteCarloResults(inputs, outcomes, errors, trajectories, lengths)
+
+
+def run_adaptive_monte_carlo(base_params, dispersions, targets, confidence=0.95, round_size=500, max_runs=50000,
+                             seed=None, workers=None, pool=None, journal=None, on_round=None):
+    """
+    Run Monte Carlo rounds until every target's confidence interval is within tolerance.
+
+    targets: List of estimate() targets, e.g. [('mean', 'apogee', 5.0),
+        ('percentile', 'drift', 99, 20.0), ('exceedance', 'descent_rate', 9.0, 0.01)];
+        the tolerance is the largest acceptable interval half width
+    round_size: Runs added per round; intervals are rechecked after each
+    max_runs: Stop here even if some interval is still too wide
+    on_round: Called as on_round(runs so far, estimates) after each round [optional]
+
+    Other arguments are as for run_monte_carlo. Rounds continue the same
+    per-run streams, so a study that stops after k runs is identical to
+    run_monte_carlo(..., n=k, seed=seed). Returns MonteCarloResults with
+    estimates, converged and rounds set; report() says how many runs it took.
+    """
+    if not isinstance(seed, (np.random.SeedSequence, np.random.Generator)):
+        seed = np.random.SeedSequence(seed)  # each round spawns the next children of this one
+    own_journal = journal is not None and not isinstance(journal, Journal)
+    if own_journal:
+        journal = Journal(journal, OUTCOME_KEYS)
+    parts = []
+    try:
+        while True:
+            n = min(round_size, max_runs - sum(part.n for part in parts))
+            parts.append(run_monte_carlo(base_params, dispersions, n, workers, seed, pool=pool, journal=journal))
+            results = _concatenate(parts)
+            estimates = [estimate(results.outcomes[target[1]], target, confidence) for target in targets]
+            if on_round:
+                on_round(results.n, estimates)
+            converged = all(e['met'] for e in estimates)
+            if converged or results.n >= max_runs:
+                break
+    finally:
+        if own_journal:
+            journal.close()
+    results.estimates = estimates
+    results.converged = converged
+    results.rounds = len(parts)
+    return results
+
+
+def _replayable(seed):
+    """A SeedSequence that can be copied to replay the same child streams more than once."""
+    if isinstance(seed, np.random.Generator):
+        return seed.bit_generator.seed_seq.spawn(1)[0]
+    if isinstance(seed, np.random.SeedSequence):
+        return seed
+    return np.random.SeedSequence(seed)
+
+
+def compare_designs(base_params, design_a, design_b, dispersions=None, n=1000, workers=None, seed=None, pool=None,
+                    batch_size=None, progress=None, design='random'):
+    """
+    Compare two designs with common random numbers.
+
+    design_a, design_b: Overrides of base_params for each design, e.g.
+        {'chute_size': 1.2} and {'chute_size': 1.5}; they may also set run_point
+        extras such as motor
+    dispersions, n, design: As for run_monte_carlo
+
+    Sample i of both designs uses the same random draws (wind, deploy delay,
+    thrust scatter, ...), so noise common to both cancels in the paired
+    differences and a small effect shows up with far fewer runs than two
+    independent studies need. A parameter that one design changes and that
+    is dispersed keeps its draw as an offset from the new value: a normal
+    spec is centred on it, and the bounds of a uniform or triangular spec
+    are shifted by the design's change from base_params (which must then
+    give the parameter a value). Both designs run as one batch on the pool.
+    Returns PairedComparison.
+    """
+    root = _replayable(seed)
+    base = {'thrust_scale': 1.0, 'wind_speed': 0.0, **base_params}
+    rows = {}
+    for label, overrides in (('a', design_a), ('b', design_b)):
+        shifted = dict(dispersions or {})
+        for name, spec in shifted.items():
+            kind, args = _spec(spec, base.get(name))
+            if name in overrides and kind != 'normal':
+                if base.get(name) is None:
+                    raise ValueError(f"Design {label} sets {name}, which has {kind} bounds but no base value "
+                                     f"to shift them from.")
+                offset = overrides[name] - base[name]
+                shifted[name] = (kind, *[bound + offset for bound in args])
+        replay = np.random.SeedSequence(root.entropy, spawn_key=root.spawn_key,
+                                        n_children_spawned=root.n_children_spawned)
+        rows[label] = sample_inputs({**base_params, **overrides}, shifted, n, replay, design)
+    points = [{**overrides, **{name: float(values[i]) for name, values in rows[label].items()}}
+              for label, overrides in (('a', design_a), ('b', design_b)) for i in range(n)]
+    outcomes, _, _, errors = run_points_parallel(base_params, points, workers, pool, batch_size, progress=progress)
+    a = MonteCarloResults(rows['a'], {key: outcomes[k, :n] for k, key in enumerate(OUTCOME_KEYS)},
+                          [(i, message) for i, message in errors if i < n])
+    b = MonteCarloResults(rows['b'], {key: outcomes[k, n:] for k, key in enumerate(OUTCOME_KEYS)},
+                          [(i - n, message) for i, message in errors if i >= n])
+    return PairedComparison(a, b)
@@ -0,0 +1,150 @@
+"""
+Motor finder: rank every thrust curve in the library for one airframe.
+
+Each motor is one summary-only run, spread over the warm worker pool (whose
+processes have the library parsed already). Results are cached by the full
+run parameters and each curve file's stamp, so re-ranking after editing one
+input only re-runs what changed, and re-sorting or filtering runs nothing.
+"""
+
+import os
+
+import numpy as np
+
+from simulation import list_thrust_curves, load_thrust_curve, THRUST_CURVE_DIR
+from monte_carlo import run_points_parallel, OUTCOME_KEYS
+from journal import point_key
+
+G = 9.81
+# Off-pad thrust-to-weight uses the average thrust over this first part of the burn (s)
+OFF_PAD_WINDOW = 0.5
+COLUMNS = ('motor', 'apogee', 'max_velocity', 'max_mach', 'max_acceleration', 'thrust_to_weight',
+           'total_impulse', 'burn_time', 'path')
+
+
+class MotorTable:
+    """
+    Ranked motors: rows holds one dict per motor with COLUMNS, errors the
+    (path, message) of motors that could not be loaded or run.
+
+    sorted() and filter() return new tables, so the full ranking can be kept
+    and re-sliced as the user changes the view.
+    """
+
+    def __init__(self, rows, errors=None):
+        self.rows = rows
+        self.errors = errors or []
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __getitem__(self, i):
+        return self.rows[i]
+
+    def sorted(self, by='apogee', descending=True):
+        """Order by a column; NaN values go last either way."""
+        def key(row):
+            value = row[by]
+            if isinstance(value, str):
+                return (0, value.lower())
+            return (np.isnan(value), -value if descending else value)
+        return MotorTable(sorted(self.rows, key=key), self.errors)
+
+    def filter(self, apogee_min=None, apogee_max=None):
+        """Keep motors whose apogee lies in [apogee_min, apogee_max] (either end optional)."""
+        rows = [row for row in self.rows
+                if (apogee_min is None or row['apogee'] >= apogee_min)
+                and (apogee_max is None or row['apogee'] <= apogee_max)]
+        return MotorTable(rows, self.errors)
+
+    def as_columns(self):
+        """One list per column, e.g. for pandas.DataFrame."""
+        return {column: [row[column] for row in self.rows] for column in COLUMNS}
+
+    def __repr__(self):
+        return f"MotorTable({len(self.rows)} motors, {len(self.errors)} failed)"
+
+
+class MotorFinder:
+    """
+    Rank library motors for an airframe, remembering results between calls.
+
+    directory: Library to scan (default: the bundled thrust_curves/)
+    workers, pool: As for sweep (1 runs in this process)
+    """
+
+    def __init__(self, directory=THRUST_CURVE_DIR, workers=None, pool=None):
+        self.directory = directory
+        self.workers = workers
+        self.pool = pool
+        self._results = {}
+
+    def clear(self):
+        self._results.clear()
+
+    def rank(self, base_params, apogee_range=None, sort_by='apogee', descending=True, curve_paths=None):
+        """
+        Run (or recall) every motor with the airframe in base_params (m, Cd, A,
+        rho, chute settings, integrator, ...; any thrust curve in it is
+        replaced). apogee_range=(low, high) keeps motors whose apogee falls
+        inside it; either end may be None. Returns a MotorTable sorted by sort_by.
+        """
+        params = {key: value for key, value in base_params.items()
+                  if key not in ('thrust_curve_path', 'thrust_curve', 'motor')}
+        if params.get('deploy_period') is None and params.get('seed') is None:
+            params['seed'] = 0  # every motor gets the same deploy delay
+        paths = list_thrust_curves(self.directory) if curve_paths is None else list(curve_paths)
+        curves, failed = {}, []
+        for path in paths:
+            try:
+                curve = load_thrust_curve(path)
+            except (OSError, ValueError) as e:
+                curve, message = None, str(e)
+            else:
+                message = "Thrust curve file is empty or invalid."
+            if curve is None:
+                failed.append((path, message))
+            else:
+                curves[path] = curve
+
+        keys = {}
+        for path in curves:
+            stat = os.stat(path)
+            keys[path] = point_key(params, {'motor': path, 'curve_stamp': [stat.st_mtime, stat.st_size]})
+        missing = [path for path in curves if keys[path] not in self._results]
+        if missing:
+            outcomes, _, _, errors = run_points_parallel(params, [{'motor': path} for path in missing],
+                                                         self.workers, self.pool)
+            messages = dict(errors)
+            for i, path in enumerate(missing):
+                if i in messages:
+                    self._results[keys[path]] = {'error': messages[i]}
+                else:
+                    self._results[keys[path]] = dict(zip(OUTCOME_KEYS, outcomes[:, i].tolist()))
+
+        weight = params['m'] * G
+        rows = []
+        for path, curve in curves.items():
+            summary = self._results[keys[path]]
+            if 'error' in summary:
+                failed.append((path, summary['error']))
+                continue
+            t0 = curve.times[0]
+            off_pad_thrust = float(curve.impulse_until(t0 + OFF_PAD_WINDOW)) / OFF_PAD_WINDOW
+            rows.append({'motor': curve.name, 'apogee': summary['apogee'], 'max_velocity': summary['max_velocity'],
+                         'max_mach': summary['max_mach'], 'max_acceleration': summary['max_acceleration'],
+                         'thrust_to_weight': off_pad_thrust / weight, 'total_impulse': curve.total_impulse,
+                         'burn_time': curve.burn_time, 'path': path})
+        table = MotorTable(rows, failed)
+        if apogee_range is not None:
+            table = table.filter(*apogee_range)
+        return table.sorted(sort_by, descending)
+
+
+def rank_motors(base_params, apogee_range=None, sort_by='apogee', descending=True, directory=THRUST_CURVE_DIR,
+                workers=None, pool=None):
+    """One-off MotorFinder(directory, workers, pool).rank(...); keep a MotorFinder to reuse results."""
+    return MotorFinder(directory, workers, pool).rank(base_params, apogee_range, sort_by, descending)
@@ -0,0 +1,219 @@
+"""
+Multi-objective design search (NSGA-II).
+
+A population of designs (mass, chute size, chute Cd, deploy height and
+motor) evolves toward the Pareto front of competing objectives, e.g. hitting
+a target apogee against landing speed, drift and peak acceleration. Every
+generation is evaluated as one batch on the warm worker pool
+(monte_carlo.run_points_parallel) instead of one call per candidate.
+"""
+
+import numpy as np
+
+from simulation import list_thrust_curves, THRUST_CURVE_DIR
+from monte_carlo import run_points_parallel, OUTCOME_KEYS
+
+# Continuous design variables and their default (low, high) bounds in SI units
+DEFAULT_BOUNDS = {
+    'm': (3.0, 12.0),
+    'chute_size': (0.3, 3.0),
+    'chute_cd': (0.8, 2.5),
+    'chute_height': (100.0, 600.0),
+}
+# Minimized objectives: apogee_error is |apogee - target_apogee|, drift is its magnitude
+OBJECTIVES = ('apogee_error', 'descent_rate', 'drift', 'max_acceleration')
+
+
+class ParetoResults:
+    """
+    Output of pareto_search.
+
+    variables: {name: array} for the final population (motor holds paths)
+    objectives: {objective: array} for the final population (inf where a run failed)
+    rank: Non-domination rank of each member (0 = Pareto front)
+    generations, evaluations: Work done
+    """
+
+    def __init__(self, variables, objectives, rank, generations, evaluations):
+        self.variables = variables
+        self.objectives = objectives
+        self.rank = rank
+        self.generations = generations
+        self.evaluations = evaluations
+
+    def front(self, sort_by=OBJECTIVES[0]):
+        """The non-dominated designs as a list of dicts (variables and objectives), sorted by one objective."""
+        members = np.flatnonzero(self.rank == 0)
+        members = members[np.argsort(self.objectives[sort_by][members], kind='stable')]
+        rows = []
+        for i in members:
+            row = {name: values[i] if name == 'motor' else float(values[i])
+                   for name, values in self.variables.items()}
+            row.update((name, float(values[i])) for name, values in self.objectives.items())
+            rows.append(row)
+        return rows
+
+    def as_columns(self, front_only=True):
+        """Variables and objectives as one dict of arrays, e.g. for pandas.DataFrame."""
+        keep = self.rank == 0 if front_only else slice(None)
+        columns = {name: np.asarray(values)[keep] for name, values in self.variables.items()}
+        columns.update((name, values[keep]) for name, values in self.objectives.items())
+        return columns
+
+    def plot(self, ax, x=OBJECTIVES[0], y=OBJECTIVES[1], color=OBJECTIVES[2]):
+        """Scatter the population on a matplotlib Axes, the front highlighted and coloured by a third objective."""
+        front = self.rank == 0
+        ax.scatter(self.objectives[x][~front], self.objectives[y][~front], s=12, c='lightgray', label='dominated')
+        points = ax.scatter(self.objectives[x][front], self.objectives[y][front], s=28,
+                            c=self.objectives[color][front], cmap='viridis', label='Pareto front')
+        ax.set_xlabel(x.replace('_', ' '))
+        ax.set_ylabel(y.replace('_', ' '))
+        ax.legend(loc='best')
+        return points
+
+    def __repr__(self):
+        return (f"ParetoResults({int(np.sum(self.rank == 0))} non-dominated of {len(self.rank)}, "
+                f"{self.generations} generations, {self.evaluations} runs)")
+
+
+def non_dominated_rank(F):
+    """Front number of every row of the objective matrix F (all minimized; 0 = Pareto front)."""
+    n = len(F)
+    # dominates[i, j]: i is no worse than j everywhere and better somewhere
+    dominates = np.all(F[:, None] <= F[None], axis=2) & np.any(F[:, None] < F[None], axis=2)
+    count = dominates.sum(axis=0)
+    rank = np.full(n, -1)
+    front = 0
+    current = np.flatnonzero(count == 0)
+    while current.size:
+        rank[current] = front
+        count = count - dominates[current].sum(axis=0)
+        count[rank >= 0] = -1
+        current = np.flatnonzero(count == 0)
+        front += 1
+    return rank
+
+
+def crowding_distance(F):
+    """NSGA-II crowding distance of each row within one front (boundary points are infinite)."""
+    n, k = F.shape
+    distance = np.zeros(n)
+    if n <= 2:
+        return np.full(n, np.inf)
+    for j in range(k):
+        order = np.argsort(F[:, j], kind='stable')
+        low, high = F[order[0], j], F[order[-1], j]
+        distance[order[0]] = distance[order[-1]] = np.inf
+        if np.isfinite(low) and np.isfinite(high) and high > low:
+            distance[order[1:-1]] += (F[order[2:], j] - F[order[:-2], j]) / (high - low)
+    return distance
+
+
+def _survivors(F, size):
+    """Indices of the size best rows by (rank, -crowding), with their rank and crowding."""
+    rank = non_dominated_rank(F)
+    crowding = np.zeros(len(F))
+    for front in np.unique(rank):
+        members = rank == front
+        crowding[members] = crowding_distance(F[members])
+    order = np.lexsort((-crowding, rank))[:size]
+    return order, rank[order], crowding[order]
+
+
+def _offspring(X, motors, rank, crowding, n_motors, rng, eta_c=15.0, eta_m=20.0):
+    """Binary tournament, SBX crossover and polynomial mutation on X in [0, 1]; motors cross uniformly."""
+    n, d = X.shape
+    n_genes = d + (n_motors > 1)
+
+    def tournament():
+        a, b = rng.integers(n, size=(2, n))
+        better = (rank[a] < rank[b]) | ((rank[a] == rank[b]) & (crowding[a] > crowding[b]))
+        return np.where(better, a, b)
+
+    p1, p2 = tournament(), tournament()
+    # Simulated binary crossover, gene by gene with probability 0.5
+    u = rng.random((n, d))
+    beta = np.where(u <= 0.5, (2 * u) ** (1 / (eta_c + 1)), (1 / (2 * (1 - u))) ** (1 / (eta_c + 1)))
+    beta = np.where(rng.random((n, d)) < 0.5, beta, 1.0)
+    first = rng.random((n, 1)) < 0.5
+    sign = np.where(first, -1.0, 1.0)
+    child = 0.5 * ((X[p1] + X[p2]) + sign * beta * (X[p2] - X[p1]))
+    # Polynomial mutation
+    mutate = rng.random((n, d)) < 1.0 / n_genes
+    u = rng.random((n, d))
+    delta = np.where(u < 0.5, (2 * u) ** (1 / (eta_m + 1)) - 1, 1 - (2 * (1 - u)) ** (1 / (eta_m + 1)))
+    child = np.clip(np.where(mutate, child + delta, child), 0.0, 1.0)
+    child_motors = np.where(rng.random(n) < 0.5, motors[p1], motors[p2])
+    reset = rng.random(n) < 1.0 / n_genes
+    child_motors = np.where(reset, rng.integers(n_motors, size=n), child_motors)
+    return child, child_motors
+
+
+def pareto_search(base_params, target_apogee, motors=None, bounds=None, objectives=OBJECTIVES, population=48,
+                  generations=30, seed=None, workers=None, pool=None, progress=None):
+    """
+    Evolve designs toward the Pareto front of the objectives (NSGA-II).
+
+    base_params: Airframe keywords shared by every design (Cd, A, rho,
+        integrator, wind_speed for drift, ...); deploy_period defaults to a
+        fixed seed so the objectives are deterministic
+    target_apogee: Apogee the apogee_error objective measures against (m)
+    motors: Thrust curve paths to choose from (default: the whole library)
+    bounds: {variable: (low, high)} for the continuous variables (default: DEFAULT_BOUNDS)
+    objectives: Subset of OBJECTIVES to minimize
+    population, generations: NSGA-II sizes; runs = population × (generations + 1)
+    seed: Seeds the evolution
+    progress: Called as progress(generation, generations, front_size) [optional]
+
+    Designs whose run fails get infinite objectives. Returns ParetoResults.
+    """
+    bounds = dict(DEFAULT_BOUNDS if bounds is None else bounds)
+    names = list(bounds)
+    low = np.array([bounds[name][0] for name in names], dtype=float)
+    high = np.array([bounds[name][1] for name in names], dtype=float)
+    motors = list_thrust_curves(THRUST_CURVE_DIR) if motors is None else list(motors)
+    params = dict(base_params)
+    if params.get('deploy_period') is None and params.get('seed') is None:
+        params['seed'] = 0
+    rng = np.random.default_rng(seed)
+    columns = {key: k for k, key in enumerate(OUTCOME_KEYS)}
+    evaluations = 0
+
+    def evaluate(X, motor_index):
+        nonlocal evaluations
+        values = low + X * (high - low)
+        points = [{**{name: float(values[i, j]) for j, name in enumerate(names)}, 'motor': motors[motor_index[i]]}
+                  for i in range(len(X))]
+        outcomes, _, _, errors = run_points_parallel(params, points, workers, pool)
+        evaluations += len(points)
+        F = np.empty((len(X), len(objectives)))
+        for j, objective in enumerate(objectives):
+            if objective == 'apogee_error':
+                F[:, j] = np.abs(outcomes[columns['apogee']] - target_apogee)
+            elif objective == 'drift':
+                F[:, j] = np.abs(outcomes[columns['drift']])
+            else:
+                F[:, j] = outcomes[columns[objective]]
+        F[~np.isfinite(F)] = np.inf
+        return F
+
+    X = rng.random((population, len(names)))
+    motor_index = rng.integers(len(motors), size=population)
+    F = evaluate(X, motor_index)
+    order, rank, crowding = _survivors(F, population)
+    X, motor_index, F = X[order], motor_index[order], F[order]
+    for generation in range(1, generations + 1):
+        child, child_motors = _offspring(X, motor_index, rank, crowding, len(motors), rng)
+        X = np.vstack([X, child])
+        motor_index = np.concatenate([motor_index, child_motors])
+        F = np.vstack([F, evaluate(child, child_motors)])
+        order, rank, crowding = _survivors(F, population)
+        X, motor_index, F = X[order], motor_index[order], F[order]
+        if progress:
+            progress(generation, generations, int(np.sum(rank == 0)))
+
+    values = low + X * (high - low)
+    variables = {name: values[:, j] for j, name in enumerate(names)}
+    variables['motor'] = [motors[i] for i in motor_index]
+    return ParetoResults(variables, {objective: F[:, j] for j, objective in enumerate(objectives)}, rank,
+                         generations, evaluations)
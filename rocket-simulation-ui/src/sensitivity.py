@@ -0,0 +1,164 @@
+"""
+Global sensitivity analysis: Sobol indices of flight outcomes.
+
+For d uncertain inputs the Saltelli design takes two independent n-point
+samples A and B (one 2d-dimensional scrambled Sobol design) plus, for each
+input i, the matrix AB_i: A with column i taken from B. That is n·(d + 2)
+runs, all evaluated as one batch by monte_carlo.run_points_parallel, which
+streams the outcomes into shared-memory arrays. Per output Y = f(X):
+
+    first-order  S_i  = mean(f(B) · (f(AB_i) - f(A))) / Var(Y)     (Saltelli 2010)
+    total        ST_i = mean((f(A) - f(AB_i))²) / (2 Var(Y))       (Jansen)
+
+S_i is the share of the variance input i explains alone, ST_i the share it
+is involved in at all, interactions included.
+"""
+
+from statistics import NormalDist
+
+import numpy as np
+
+from monte_carlo import (run_points_parallel, _quantile, _unit_design, OUTCOME_KEYS, DEFAULT_DEPLOY_PERIOD)
+
+SENSITIVITY_INPUTS = ('m', 'Cd', 'A', 'rho', 'thrust_scale', 'chute_size', 'chute_cd', 'deploy_period')
+SENSITIVITY_OUTPUTS = ('apogee', 'landing_time', 'descent_rate')
+
+
+class SobolIndices:
+    """
+    Output of sobol_indices.
+
+    inputs, outputs: Names, in the order of the index arrays
+    first, total: {output: array over inputs} of S_i and ST_i
+    first_conf, total_conf: {output: array} of bootstrap confidence half-widths
+    variance: {output: Var(Y)}
+    n: Base sample size; evaluations: runs made (n·(d + 2))
+    errors: (run index, message) of failed runs; a failed run drops its base
+        row from the estimates
+    """
+
+    def __init__(self, inputs, outputs, first, total, first_conf, total_conf, variance, n, evaluations, errors=None):
+        self.inputs = inputs
+        self.outputs = outputs
+        self.first = first
+        self.total = total
+        self.first_conf = first_conf
+        self.total_conf = total_conf
+        self.variance = variance
+        self.n = n
+        self.evaluations = evaluations
+        self.errors = errors or []
+
+    def table(self, output):
+        """One dict per input for an output, largest total index first."""
+        rows = [{'input': name, 'first': float(self.first[output][j]), 'first_conf': float(self.first_conf[output][j]),
+                 'total': float(self.total[output][j]), 'total_conf': float(self.total_conf[output][j])}
+                for j, name in enumerate(self.inputs)]
+        return sorted(rows, key=lambda row: -row['total'])
+
+    def plot(self, ax, output):
+        """Grouped bars of first-order and total indices with their confidence intervals on a matplotlib Axes."""
+        x = np.arange(len(self.inputs))
+        ax.bar(x - 0.2, self.first[output], 0.4, yerr=self.first_conf[output], capsize=3, label='first order')
+        ax.bar(x + 0.2, self.total[output], 0.4, yerr=self.total_conf[output], capsize=3, label='total')
+        ax.set_xticks(x)
+        ax.set_xticklabels(self.inputs, rotation=30)
+        ax.set_ylim(0, 1.05)
+        ax.set_title(output.replace('_', ' '))
+        ax.legend(loc='best')
+
+    def __repr__(self):
+        return f"SobolIndices({len(self.inputs)} inputs x {len(self.outputs)} outputs, {self.evaluations} runs)"
+
+
+def default_dispersions(base_params, inputs=SENSITIVITY_INPUTS, spread=0.1):
+    """
+    Uniform ±spread (relative) around each input's base value; thrust_scale
+    is 1 ± spread and deploy_period defaults to run_simulation's 0.5–2.5 s.
+    Inputs without a base value (e.g. no chute) are left out.
+    """
+    base = {'thrust_scale': 1.0, **base_params}
+    dispersions = {}
+    for name in inputs:
+        value = base.get(name)
+        if name == 'deploy_period' and value is None:
+            dispersions[name] = DEFAULT_DEPLOY_PERIOD
+        elif value:
+            dispersions[name] = ('uniform', value * (1 - spread), value * (1 + spread))
+    return dispersions
+
+
+def _estimates(f_A, f_B, f_AB):
+    """
+    First-order and total indices from run outcomes f_A, f_B of shape (..., n)
+    and f_AB of shape (..., d, n); returns arrays of shape (..., d) and Var(Y).
+    """
+    variance = np.var(np.concatenate([f_A, f_B], axis=-1), axis=-1)
+    f_A, f_B = f_A[..., None, :], f_B[..., None, :]
+    first = np.mean(f_B * (f_AB - f_A), axis=-1) / variance[..., None]
+    total = 0.5 * np.mean((f_A - f_AB) ** 2, axis=-1) / variance[..., None]
+    return first, total, variance
+
+
+def sobol_indices(base_params, dispersions=None, n=512, outputs=SENSITIVITY_OUTPUTS, seed=None, workers=None,
+                  pool=None, progress=None, confidence=0.95, resamples=200):
+    """
+    First-order and total Sobol indices of outputs over the dispersed inputs.
+
+    base_params: run_simulation keyword arguments for the nominal design
+        (m, Cd, A, rho, thrust_curve_path, chute_size, ...)
+    dispersions: {name: spec} as for monte_carlo.run_monte_carlo, over any of
+        SENSITIVITY_INPUTS (default: default_dispersions(base_params))
+    n: Base sample size; a power of two keeps the Sobol design balanced.
+        The study costs n·(d + 2) runs; the indices' error falls as 1/sqrt(n).
+    outputs: OUTCOME_KEYS to analyse
+    seed: Seeds the scrambled Sobol design and the bootstrap
+    workers, pool, progress: As for run_monte_carlo
+    confidence, resamples: Bootstrap confidence level and resample count
+
+    Returns SobolIndices.
+    """
+    dispersions = default_dispersions(base_params) if dispersions is None else dict(dispersions)
+    unknown = set(dispersions) - set(SENSITIVITY_INPUTS)
+    if unknown:
+        raise ValueError(f"Cannot analyse {', '.join(sorted(unknown))}; choose from {', '.join(SENSITIVITY_INPUTS)}.")
+    unknown = set(outputs) - set(OUTCOME_KEYS)
+    if unknown:
+        raise ValueError(f"Unknown outputs {', '.join(sorted(unknown))}; choose from {', '.join(OUTCOME_KEYS)}.")
+    names = [name for name in SENSITIVITY_INPUTS if name in dispersions]
+    d = len(names)
+    if d == 0:
+        raise ValueError("No inputs to analyse.")
+    base = {'thrust_scale': 1.0, **base_params}
+
+    u = _unit_design('sobol', 2 * d, n, seed)
+    values = np.empty_like(u)
+    for j, name in enumerate(names):
+        values[:, j] = _quantile(dispersions[name], base.get(name), u[:, j])
+        values[:, d + j] = _quantile(dispersions[name], base.get(name), u[:, d + j])
+    A, B = values[:, :d], values[:, d:]
+    # Runs in blocks of n: A, B, then AB_1 ... AB_d
+    blocks = [A, B]
+    for i in range(d):
+        AB = A.copy()
+        AB[:, i] = B[:, i]
+        blocks.append(AB)
+    X = np.vstack(blocks)
+    points = [{name: float(X[r, j]) for j, name in enumerate(names)} for r in range(len(X))]
+    outcomes, _, _, errors = run_points_parallel(base_params, points, workers, pool, progress=progress)
+
+    rng = np.random.default_rng(seed)
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    first, total, first_conf, total_conf, variance = {}, {}, {}, {}, {}
+    for output in outputs:
+        Y = outcomes[OUTCOME_KEYS.index(output)].reshape(d + 2, n)
+        keep = np.all(np.isfinite(Y), axis=0)
+        Y = Y[:, keep]
+        S, ST, variance[output] = _estimates(Y[0], Y[1], Y[2:])
+        first[output], total[output] = S, ST
+        # Bootstrap over the base rows that ran
+        rows = rng.integers(Y.shape[1], size=(resamples, Y.shape[1]))
+        S_b, ST_b, _ = _estimates(Y[0][rows], Y[1][rows], Y[2:][:, rows].transpose(1, 0, 2))
+        first_conf[output] = z * np.std(S_b, axis=0)
+        total_conf[output] = z * np.std(ST_b, axis=0)
+    return SobolIndices(names, tuple(outputs), first, total, first_conf, total_conf, variance, n, len(points), errors)
@@ -0,0 +1,135 @@
+"""
+Ensemble outputs in shared memory.
+
+Worker processes write summaries and trajectories straight into columnar
+arrays allocated by the parent in multiprocessing.shared_memory blocks, so
+only block names, offsets and error messages cross the process boundary.
+"""
+
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from simulation import SimulationResults
+
+
+class SharedArray:
+    """
+    A numpy array backed by a shared_memory block.
+
+    Pickling sends only (name, shape, dtype); unpickling in a worker attaches
+    to the same block, so writes land directly in the parent's array. The
+    creating process owns the block and must unlink it when done.
+    """
+
+    def __init__(self, shape, dtype=float, fill=None, name=None):
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        size = max(1, int(np.prod(self.shape)) * self.dtype.itemsize)
+        self.owner = name is None
+        self._shm = shared_memory.SharedMemory(name=name, create=self.owner, size=size)
+        self.array = np.ndarray(self.shape, self.dtype, buffer=self._shm.buf)
+        if fill is not None:
+            self.array.fill(fill)
+
+    def __getstate__(self):
+        return self._shm.name, self.shape, self.dtype.str
+
+    def __setstate__(self, state):
+        name, shape, dtype = state
+        self.__init__(shape, dtype, name=name)
+
+    def close(self):
+        """Drop this process's mapping (the array must not be used afterwards)."""
+        self.array = None
+        self._shm.close()
+
+    def unlink(self):
+        """Close and free the block; only the owner should call this."""
+        self.close()
+        self._shm.unlink()
+
+
+class ResultBuffers:
+    """
+    Columnar outputs for n ensemble points.
+
+    outcomes: (len(keys), n) float64, NaN until a point is written
+    trajectories: (len(SimulationResults.columns), n, trajectory_rows) float64, or None
+    lengths: (n,) stored trajectory rows per point
+
+    With shared=True the arrays live in SharedArrays that can be passed to
+    worker tasks; otherwise they are plain arrays for in-process runs.
+    """
+
+    def __init__(self, keys, n, trajectory_rows=None, shared=True):
+        self.keys = tuple(keys)
+        self.n = n
+        self.trajectory_rows = trajectory_rows
+        self.shared = shared
+        make = SharedArray if shared else _LocalArray
+        self._outcomes = make((len(self.keys), n), float, fill=np.nan)
+        self._trajectories = self._lengths = None
+        if trajectory_rows:
+            self._trajectories = make((len(SimulationResults.columns), n, trajectory_rows), float, fill=0.0)
+            self._lengths = make((n,), np.int64, fill=0)
+
+    @property
+    def outcomes(self):
+        return self._outcomes.array
+
+    @property
+    def trajectories(self):
+        return None if self._trajectories is None else self._trajectories.array
+
+    @property
+    def lengths(self):
+        return None if self._lengths is None else self._lengths.array
+
+    def _blocks(self):
+        return [block for block in (self._outcomes, self._trajectories, self._lengths) if block is not None]
+
+    def write(self, i, summary, results=None):
+        """Store point i's summary dict and, if trajectories are kept, its SimulationResults thinned to fit."""
+        self.outcomes[:, i] = [summary[key] for key in self.keys]
+        if results is not None and self._trajectories is not None:
+            rows = results.decimate(self.trajectory_rows)
+            for c, key in enumerate(SimulationResults.columns):
+                self.trajectories[c, i, :len(rows)] = rows.column(key)
+            self.lengths[i] = len(rows)
+
+    def close(self):
+        """Detach a worker's view of the shared blocks."""
+        if self.shared:
+            for block in self._blocks():
+                block.close()
+
+    def collect(self):
+        """
+        Copy the arrays out and free the shared blocks (parent only).
+        Returns (outcomes, trajectories, lengths) as private arrays.
+        """
+        copies = tuple(None if block is None else block.array.copy()
+                       for block in (self._outcomes, self._trajectories, self._lengths))
+        if self.shared:
+            for block in self._blocks():
+                block.unlink()
+        return copies
+
+
+class _LocalArray:
+    """In-process stand-in for SharedArray."""
+
+    def __init__(self, shape, dtype=float, fill=None):
+        self.array = np.empty(shape, dtype)
+        if fill is not None:
+            self.array.fill(fill)
+
+
+def trajectory_from_buffers(trajectories, lengths, i, metadata=None):
+    """Rebuild point i's stored trajectory as a SimulationResults."""
+    if trajectories is None:
+        raise ValueError("Trajectories were not stored (pass trajectory_rows).")
+    rows = int(lengths[i])
+    columns = {key: trajectories[c, i, :rows] for c, key in enumerate(SimulationResults.columns)}
+    return SimulationResults.from_columns(columns, metadata)
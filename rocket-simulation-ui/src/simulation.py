@@ -1,4 +1,874 @@
-def run_simulation(m, Cd, A, rho, thrust_curve_path=None, chute_height=None, chute_size=None, time_step=None, chute_deploy_start=None, chute_cd=None, **kwargs):
+import math
+import os
+from bisect import bisect_right
+from collections.abc import Sequence
+
+import numpy as np
+
+
+# Default thrust curve (time s, thrust N) used when no file is selected
+DEFAULT_THRUST_DATA = [
+    (0.124, 816.849), (0.375, 796.043), (0.626, 781.861), (0.877, 767.440),
+    (1.129, 759.627), (1.380, 735.948), (1.631, 714.454), (1.883, 701.582),
+    (2.134, 674.667), (2.385, 656.493), (2.637, 636.076), (2.889, 612.409),
+    (3.140, 587.801), (3.391, 567.170), (3.642, 559.971), (3.894, 534.157),
+    (4.145, 444.562), (4.396, 280.510), (4.648, 216.702), (4.899, 163.136),
+    (5.150, 120.571), (5.402, 86.544), (5.653, 59.990), (5.904, 39.527),
+    (6.156, 25.914), (6.408, 0.000),
+]
+
+
+def parse_csv_thrust(path):
+    """Read (time, thrust) pairs from a CSV. Header, comment and metadata rows are skipped."""
+    import csv
+    data = []
+    with open(path, 'r', newline='') as f:
+        reader = csv.reader(f)
+        for row in reader:
+            if not row:
+                continue
+            # skip commented/header lines starting with a non-numeric token
+            first = row[0].strip()
+            if not first:
+                continue
+            if first.startswith('#') or first.startswith(';'):
+                continue
+            try:
+                t = float(first)
+                thrust = float(row[1]) if len(row) > 1 else None
+                if thrust is None:
+                    continue
+                data.append((t, thrust))
+            except Exception:
+                # header line like "time,thrust" -> skip
+                continue
+    return data
+
+
+def parse_rasp_eng_thrust(path):
+    """Parse a simple RASP/ENG motor file. We read the first motor block's time/thrust pairs.
+    Lines starting with ';' or '#' are comments. The first non-comment line is header. Following lines until a blank or non-numeric line are time thrust pairs."""
+    data = []
+    with open(path, 'r') as f:
+        lines = f.readlines()
+    # strip whitespace
+    lines = [ln.strip() for ln in lines]
+    # skip initial comments
+    i = 0
+    while i < len(lines) and (not lines[i] or lines[i].startswith(';') or lines[i].startswith('#')):
+        i += 1
+    if i >= len(lines):
+        return data
+    # header line (ignored for now)
+    i += 1
+    # read pairs
+    while i < len(lines):
+        ln = lines[i]
+        if ln.startswith(';') or ln.startswith('#'):
+            # comments inside the block (e.g. a "; time thrust" caption) are skipped
+            i += 1
+            continue
+        if not ln:
+            # stop at blank line -> end of first motor block
+            break
+        parts = ln.split()
+        if len(parts) < 2:
+            break
+        try:
+            t = float(parts[0])
+            thrust = float(parts[1])
+            data.append((t, thrust))
+        except Exception:
+            # stop on parse failure for safety
+            break
+        i += 1
+    return data
+
+
+def dedupe_thrust_data(thrust_data):
+    """Sort by time and keep the last value for (near-)duplicate timestamps."""
+    deduped = []
+    last_t = None
+    for t, y in sorted(thrust_data, key=lambda p: p[0]):
+        if last_t is None or t > last_t + 1e-9:
+            deduped.append((t, y))
+        else:
+            deduped[-1] = (t, y)
+        last_t = t
+    return deduped
+
+
+class ThrustCurve:
+    """
+    Thrust curve compiled once per file and shared by every simulation path.
+
+    Attributes:
+        times, thrusts: Contiguous float64 arrays, sorted and de-duplicated
+        cumulative_impulse: Trapezoidal impulse from times[0] up to each point (N·s)
+        total_impulse: Same as calculate_total_impulse on the points (N·s)
+        burn_time: Last time in the curve (s); thrust is zero after it
+        peak_thrust, average_thrust: N (average over the curve's duration)
+
+    Calling the curve with a float uses a cached bisect lookup, which is O(1)
+    while the integrator walks forward in time; calling it with an array uses
+    np.interp. Before the first point the first thrust value is held.
+    """
+
+    def __init__(self, thrust_data, name=None, path=None):
+        thrust_data = dedupe_thrust_data(thrust_data)
+        if not thrust_data:
+            raise ValueError("Thrust curve is empty.")
+        self.name = name
+        self.path = path
+        times, thrusts = zip(*thrust_data)
+        self.times = np.ascontiguousarray(times, dtype=float)
+        self.thrusts = np.ascontiguousarray(thrusts, dtype=float)
+        self._times = list(times)
+        self._thrusts = list(thrusts)
+        self._last = 0
+        segments = 0.5 * (self.thrusts[1:] + self.thrusts[:-1]) * np.diff(self.times)
+        self.cumulative_impulse = np.concatenate(([0.0], np.cumsum(segments)))
+        self.total_impulse = calculate_total_impulse(thrust_data)
+        self.burn_time = self._times[-1]
+        self.peak_thrust = float(self.thrusts.max())
+        duration = self._times[-1] - self._times[0]
+        self.average_thrust = self.total_impulse / duration if duration > 0 else self.peak_thrust
+
+    @classmethod
+    def from_file(cls, path):
+        """Parse a CSV or RASP/ENG file (by extension; unknown extensions are tried as CSV)."""
+        _, ext = os.path.splitext(path.lower())
+        if ext in ('.eng', '.rasp'):
+            data = parse_rasp_eng_thrust(path)
+        else:
+            data = parse_csv_thrust(path)
+        return cls(data, name=os.path.splitext(os.path.basename(path))[0], path=path)
+
+    @property
+    def data(self):
+        """The curve as a list of (time, thrust) tuples."""
+        return list(zip(self._times, self._thrusts))
+
+    def __call__(self, t):
+        if np.ndim(t):
+            return self.thrust_array(t)
+        times = self._times
+        if t < times[0]:
+            return self._thrusts[0]
+        if t > times[-1]:
+            return 0.0
+        if len(times) == 1:
+            return self._thrusts[0]
+        i = self._last
+        if not (times[i] <= t < times[i + 1]):
+            i = min(bisect_right(times, t) - 1, len(times) - 2)
+            self._last = i
+        t0 = times[i]
+        F0 = self._thrusts[i]
+        return F0 + (self._thrusts[i + 1] - F0) * (t - t0) / (times[i + 1] - t0)
+
+    def scaled(self, factor):
+        """Return a copy with every thrust multiplied by factor (e.g. a motor-to-motor impulse dispersion)."""
+        return ThrustCurve([(t, F * factor) for t, F in zip(self._times, self._thrusts)],
+                           name=self.name, path=self.path)
+
+    def thrust_array(self, t):
+        """Vectorized thrust lookup for an array of times."""
+        t = np.asarray(t, dtype=float)
+        return np.where(t < self.times[0], self.thrusts[0], np.interp(t, self.times, self.thrusts, right=0.0))
+
+    def impulse_until(self, t):
+        """Impulse delivered from the first curve point up to time t (N·s)."""
+        t = min(max(t, self._times[0]), self._times[-1])
+        i = min(bisect_right(self._times, t) - 1, len(self._times) - 2)
+        if i < 0:
+            return 0.0
+        t0 = self._times[i]
+        F0 = self._thrusts[i]
+        Ft = self(t)
+        return float(self.cumulative_impulse[i]) + 0.5 * (F0 + Ft) * (t - t0)
+
+    def __repr__(self):
+        return f"ThrustCurve({self.name or 'default'}, {self.total_impulse:.1f} N·s, burn {self.burn_time:.2f} s)"
+
+
+_thrust_curve_cache = {}
+# Bundled motor library (csv/ and rasp/ subfolders)
+THRUST_CURVE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'thrust_curves')
+THRUST_CURVE_EXTENSIONS = ('.csv', '.eng', '.rasp')
+
+
+def list_thrust_curves(directory=THRUST_CURVE_DIR):
+    """Return the paths of every thrust curve file under directory, sorted."""
+    paths = []
+    for root, _, files in os.walk(directory):
+        paths.extend(os.path.join(root, name) for name in files
+                     if os.path.splitext(name.lower())[1] in THRUST_CURVE_EXTENSIONS)
+    return sorted(paths)
+
+
+def load_thrust_curve(thrust_curve_path=None):
+    """
+    Return the ThrustCurve for a file (or the default curve when path is None).
+
+    Curves are cached by path and modification time, so repeated runs,
+    animation frames and sweep points don't re-read the file. Returns None if
+    the file holds no usable points; I/O errors propagate.
+    """
+    if not thrust_curve_path:
+        key = None
+    else:
+        stat = os.stat(thrust_curve_path)
+        key = (os.path.abspath(thrust_curve_path), stat.st_mtime, stat.st_size)
+    curve = _thrust_curve_cache.get(key)
+    if curve is None:
+        try:
+            if key is None:
+                curve = ThrustCurve(DEFAULT_THRUST_DATA, name='default')
+            else:
+                curve = ThrustCurve.from_file(thrust_curve_path)
+        except ValueError:
+            return None
+        _thrust_curve_cache[key] = curve
+    return curve
+
+
+class SimulationResults(Sequence):
+    """
+    Trajectory stored as growable NumPy columns instead of a list of per-step dicts.
+
+    Columns: time, altitude, velocity, acceleration, thrust, drag, chute_deployed, mass, mdot
+    metadata: Scalar run values (deployment_time, force_at_deployment) stored once
+    events: Event table, one dict per event (event, time, altitude, velocity)
+    stats: Integrator bookkeeping (scheme, steps taken and rejected), not shown in rows
+
+    Indexing and iteration give row dicts in the old run_simulation format,
+    with the metadata repeated on every row, so code written against the
+    list-of-dicts output keeps working. Use column() for whole arrays.
+    """
+    columns = ('time', 'altitude', 'velocity', 'acceleration', 'thrust', 'drag', 'chute_deployed', 'mass', 'mdot')
+
+    def __init__(self, capacity=1024):
+        self._capacity = max(1, int(capacity))
+        self._size = 0
+        self._data = {key: np.empty(self._capacity, dtype=bool if key == 'chute_deployed' else float)
+                      for key in self.columns}
+        self.metadata = {}
+        self.events = []
+        self.stats = {}
+
+    @classmethod
+    def from_columns(cls, columns, metadata=None):
+        """Build results from equal-length arrays keyed by column name."""
+        size = len(columns['time'])
+        results = cls(capacity=size)
+        for key in cls.columns:
+            results._data[key][:size] = columns[key]
+        results._size = size
+        if metadata:
+            results.metadata.update(metadata)
+        return results
+
+    def append(self, time, altitude, velocity, acceleration, thrust, drag, chute_deployed, mass, mdot):
+        if self._size == self._capacity:
+            self._grow()
+        i = self._size
+        data = self._data
+        data['time'][i] = time
+        data['altitude'][i] = altitude
+        data['velocity'][i] = velocity
+        data['acceleration'][i] = acceleration
+        data['thrust'][i] = thrust
+        data['drag'][i] = drag
+        data['chute_deployed'][i] = chute_deployed
+        data['mass'][i] = mass
+        data['mdot'][i] = mdot
+        self._size = i + 1
+
+    def extend(self, other):
+        """Append the rows, events, metadata and stats of another SimulationResults (e.g. a stream chunk)."""
+        size = self._size + len(other)
+        while self._capacity < size:
+            self._grow()
+        for key in self.columns:
+            self._data[key][self._size:size] = other.column(key)
+        self._size = size
+        self.events.extend(other.events)
+        self.metadata.update(other.metadata)
+        self.stats.update(other.stats)
+
+    def take(self, indices):
+        """Return a new SimulationResults holding only the rows at `indices` (events, metadata and stats kept)."""
+        indices = np.asarray(indices, dtype=int)
+        results = SimulationResults.from_columns({key: self._data[key][:self._size][indices] for key in self.columns},
+                                                 self.metadata)
+        results.events = list(self.events)
+        results.stats = dict(self.stats)
+        return results
+
+    def decimate(self, max_samples):
+        """
+        Return at most max_samples rows, evenly spread in time, always keeping
+        the first and last rows and the first row at or after each event.
+        """
+        n = self._size
+        if n <= max_samples:
+            return self.take(np.arange(n))
+        times = self.column('time')
+        keep = {0, n - 1}
+        keep.update(min(int(np.searchsorted(times, e['time'] - 1e-9)), n - 1) for e in self.events)
+        spare = max_samples - len(keep)
+        if spare > 0:
+            # Evenly spaced in time rather than by index, so fine steps don't crowd out the coast
+            targets = np.linspace(times[0], times[-1], spare + 2)[1:-1]
+            keep.update(np.minimum(np.searchsorted(times, targets), n - 1).tolist())
+        return self.take(sorted(keep)[:max_samples] if len(keep) > max_samples else sorted(keep))
+
+    def _grow(self):
+        self._capacity *= 2
+        for key, values in self._data.items():
+            grown = np.empty(self._capacity, dtype=values.dtype)
+            grown[:self._size] = values[:self._size]
+            self._data[key] = grown
+
+    def column(self, key):
+        """Return a read-only view of one column (no copy)."""
+        view = self._data[key][:self._size]
+        view.flags.writeable = False
+        return view
+
+    def as_columns(self):
+        """Return every column as a dict of arrays, e.g. for pandas.DataFrame."""
+        return {key: self.column(key) for key in self.columns}
+
+    def event(self, name):
+        """Return the first event called `name` ('burnout', 'apogee', 'deployment', 'landing'), or None."""
+        return next((e for e in self.events if e['event'] == name), None)
+
+    def __len__(self):
+        return self._size
+
+    def _row(self, i):
+        data = self._data
+        row = {key: float(data[key][i]) for key in self.columns}
+        row['chute_deployed'] = bool(data['chute_deployed'][i])
+        row.update(self.metadata)
+        return row
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._row(i) for i in range(*index.indices(self._size))]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("SimulationResults index out of range")
+        return self._row(index)
+
+    def __repr__(self):
+        return f"SimulationResults({self._size} rows, metadata={self.metadata})"
+
+
+SUMMARY_KEYS = ('apogee', 'apogee_time', 'max_velocity', 'max_mach', 'max_acceleration', 'burnout_time',
+                'deployment_time', 'force_at_deployment', 'landing_time', 'descent_rate')
+
+
+def _build_summary(events, metadata, max_altitude, max_altitude_time, max_velocity, max_acceleration, speed_of_sound):
+    nan = float('nan')
+    by_name = {}
+    for e in events:
+        by_name.setdefault(e['event'], e)
+    apogee = by_name.get('apogee')
+    burnout = by_name.get('burnout')
+    landing = by_name.get('landing')
+    return {
+        # Located apogee if the rocket climbed, otherwise the highest stored step
+        'apogee': apogee['altitude'] if apogee else max_altitude,
+        'apogee_time': apogee['time'] if apogee else max_altitude_time,
+        'max_velocity': max_velocity,
+        'max_mach': max_velocity / speed_of_sound if speed_of_sound else 0.0,
+        'max_acceleration': max_acceleration,
+        'burnout_time': burnout['time'] if burnout else nan,
+        'deployment_time': metadata.get('deployment_time', nan),
+        'force_at_deployment': metadata.get('force_at_deployment', nan),
+        'landing_time': landing['time'] if landing else nan,
+        'descent_rate': abs(landing['velocity']) if landing else nan,
+    }
+
+
+class SummaryRecorder:
+    """
+    Stand-in for SimulationResults that keeps running maxima instead of rows.
+
+    run_simulation(summary_only=True) integrates into one of these, so memory
+    stays constant however long the flight. summary() gives the same record
+    as summarize_results() on the full trajectory.
+    """
+
+    def __init__(self):
+        self.metadata = {}
+        self.events = []
+        self.stats = {}
+        self.rows = 0
+        self.max_altitude = 0.0
+        self.max_altitude_time = 0.0
+        self.max_velocity = float('-inf')
+        self.max_acceleration = float('-inf')
+
+    def append(self, time, altitude, velocity, acceleration, thrust, drag, chute_deployed, mass, mdot):
+        if self.rows == 0 or altitude > self.max_altitude:
+            self.max_altitude = altitude
+            self.max_altitude_time = time
+        if velocity > self.max_velocity:
+            self.max_velocity = velocity
+        if acceleration > self.max_acceleration:
+            self.max_acceleration = acceleration
+        self.rows += 1
+
+    def event(self, name):
+        return next((e for e in self.events if e['event'] == name), None)
+
+    def summary(self, speed_of_sound=343.0):
+        return _build_summary(self.events, self.metadata, float(self.max_altitude), float(self.max_altitude_time),
+                              float(self.max_velocity), float(self.max_acceleration), speed_of_sound)
+
+
+def summarize_results(results, speed_of_sound=343.0):
+    """Summary record (see SUMMARY_KEYS) post-processed from a full SimulationResults."""
+    altitudes = results.column('altitude')
+    i = int(np.argmax(altitudes))
+    return _build_summary(results.events, results.metadata, float(altitudes[i]), float(results.column('time')[i]),
+                          float(results.column('velocity').max()), float(results.column('acceleration').max()),
+                          speed_of_sound)
+
+
+class FlightModel:
+    """
+    Force model shared by the integrators.
+
+    Thrust comes from the ThrustCurve (zero after burnout), drag uses the body
+    Cd·A until the chute deploys and then blends linearly to the chute values
+    over deploy_period, gravity is constant and mass flow follows the Isp
+    estimate from total impulse. Deployment is the only state the model keeps.
+    """
+    g = 9.81
+    g0 = 9.80665  # Standard gravity for Isp equation
+
+    def __init__(self, thrust_curve, Cd, A, rho, chute_height=None, chute_size=None, chute_cd=None, deploy_period=1.0):
+        self.thrust_curve = thrust_curve
+        self.burn_time = thrust_curve.burn_time
+        self.total_impulse = thrust_curve.total_impulse
+        self.Isp = self.total_impulse / self.g0  # Estimate Isp from total impulse and g0
+        self.Cd = Cd
+        self.A = A
+        self.rho = rho
+        self.target_Cd = chute_cd if chute_cd is not None else Cd
+        self.target_A = chute_size if chute_size is not None else A
+        # Deploy parachute if falling and below chute_height (if provided), else default to 300m
+        self.deploy_height = chute_height if chute_height is not None else 300
+        self.deploy_period = deploy_period
+        self.deploy_start = None
+        self.deploy_end = None
+        self.deployment_stats = None
+
+    @property
+    def chute_deployed(self):
+        return self.deploy_start is not None
+
+    def should_deploy(self, altitude, velocity):
+        return self.deploy_start is None and velocity < 0 and altitude < self.deploy_height
+
+    def deploy(self, time, velocity):
+        """Start opening the chute at `time`; returns the deployment stats."""
+        force = 0.5 * self.rho * velocity**2 * self.Cd * self.A
+        self.deploy_start = time
+        self.deploy_end = time + self.deploy_period
+        self.deployment_stats = {'deployment_time': float(time), 'force_at_deployment': float(force)}
+        return self.deployment_stats
+
+    def drag_parameters(self, time):
+        """Current (Cd, A): body values, a linear blend while opening, then chute values."""
+        start = self.deploy_start
+        if start is None or time < start:
+            return self.Cd, self.A
+        if time >= self.deploy_end:
+            return self.target_Cd, self.target_A
+        deploy_fraction = (time - start) / (self.deploy_end - start)
+        return (self.Cd + deploy_fraction * (self.target_Cd - self.Cd),
+                self.A + deploy_fraction * (self.target_A - self.A))
+
+    def forces(self, time, velocity, mass):
+        """Return (thrust, drag, acceleration, mdot) at one instant."""
+        F = self.thrust_curve(time) if time <= self.burn_time else 0.0
+        current_Cd, current_A = self.drag_parameters(time)
+        F_drag = 0.5 * self.rho * velocity**2 * current_Cd * current_A
+        sign = 1.0 if velocity > 0 else (-1.0 if velocity < 0 else 0.0)
+        a = (F - sign * F_drag) / mass - self.g
+        # Calculate mdot (mass flow rate) using proper specific impulse equation
+        mdot = F / (self.Isp * self.g0) if F > 0 else 0.0
+        return F, F_drag, a, mdot
+
+
+# Dormand–Prince 5(4) tableau
+_DP_C = (0.0, 1/5, 3/10, 4/5, 8/9, 1.0, 1.0)
+_DP_A = (
+    (),
+    (1/5,),
+    (3/40, 9/40),
+    (44/45, -56/15, 32/9),
+    (19372/6561, -25360/2187, 64448/6561, -212/729),
+    (9017/3168, -355/33, 46732/5247, 49/176, -5103/18656),
+    (35/384, 0.0, 500/1113, 125/192, -2187/6784, 11/84),
+)
+# Difference between the 5th and embedded 4th order weights
+_DP_E = (71/57600, 0.0, -71/16695, 71/1920, -17253/339200, 22/525, -1/40)
+
+
+def _hermite(y0, y1, f0, f1, dt, s):
+    """Cubic Hermite interpolant across one step at fraction s (f is dy/dt)."""
+    s2 = s * s
+    s3 = s2 * s
+    return ((2*s3 - 3*s2 + 1) * y0 + (s3 - 2*s2 + s) * dt * f0
+            + (-2*s3 + 3*s2) * y1 + (s3 - s2) * dt * f1)
+
+
+def _crossing_fraction(func):
+    """Fraction in [0, 1] of the step where func first goes from > 0 to <= 0."""
+    from scipy.optimize import brentq
+    if func(0.0) <= 0:
+        return 0.0
+    if func(1.0) >= 0:
+        return 1.0
+    return brentq(func, 0.0, 1.0, xtol=1e-12)
+
+
+def _log_cosh(x):
+    return x + math.log1p(math.exp(-2.0 * x)) - math.log(2.0)
+
+
+def _log_sinh(x):
+    return x + math.log1p(-math.exp(-2.0 * x)) - math.log(2.0)
+
+
+def _steady_descent(model, time, y, sample_dt, record_event):
+    """
+    Closed-form fall under a fully open chute, from state y at `time` to the ground.
+
+    With no thrust, constant mass, constant Cd·A and constant rho, falling at
+    speed u obeys du/dt = g - k·u² with k = ½·rho·Cd·A/m, so
+    u = vt·tanh(x) (or vt·coth(x) when faster than terminal) with
+    x = g·t/vt + x0, and the distance fallen is vt²/g·ln(cosh(x)/cosh(x0))
+    (sinh for the fast branch). Yields rows every sample_dt seconds and one
+    at the landing, which is also recorded as the landing event.
+    """
+    altitude, velocity, mass = y
+    Cd, A = model.drag_parameters(time)
+    g = model.g
+    vt = math.sqrt(g / (0.5 * model.rho * Cd * A / mass))
+    speed = -velocity
+    scale = vt * vt / g  # distance per unit of x
+    if speed < vt:
+        x0 = math.atanh(speed / vt)
+        log_f, speed_at = _log_cosh, lambda x: vt * math.tanh(x)
+        inverse = lambda L: math.acosh(math.exp(L)) if L < 20.0 else L + math.log(2.0)
+    elif speed > vt:
+        x0 = math.atanh(vt / speed)
+        log_f, speed_at = _log_sinh, lambda x: vt / math.tanh(x)
+        inverse = lambda L: math.asinh(math.exp(L)) if L < 20.0 else L + math.log(2.0)
+    else:
+        x0 = 0.0
+        log_f, speed_at, inverse = (lambda x: x), (lambda x: vt), (lambda L: L)
+    x_land = inverse(log_f(x0) + altitude / scale)
+    t_land = time + (x_land - x0) * vt / g
+
+    t = time + sample_dt
+    while t < t_land:
+        x = x0 + (t - time) * g / vt
+        v = -speed_at(x)
+        h = altitude - scale * (log_f(x) - log_f(x0))
+        F, F_drag, a, mdot = model.forces(t, v, mass)
+        yield t, h, v, a, F, F_drag, True, mass, mdot
+        t += sample_dt
+    v_land = -speed_at(x_land)
+    record_event('landing', t_land, (0.0, v_land))
+    F, F_drag, a, mdot = model.forces(t_land, v_land, mass)
+    yield t_land, 0.0, 0.0, a, F, F_drag, True, mass, mdot
+
+
+def _euler_step(y, start, dt):
+    """Fixed-step update used since the first version: mass, then velocity, then altitude with the new velocity."""
+    F, F_drag, a, mdot = start
+    m = y[2] - mdot * dt
+    v = y[1] + a * dt
+    return (y[0] + v * dt, v, m)
+
+
+def _explicit_euler_step(y, start, dt):
+    """Forward Euler: every state variable advances with its rate at the start of the step."""
+    F, F_drag, a, mdot = start
+    return (y[0] + y[1] * dt, y[1] + a * dt, y[2] - mdot * dt)
+
+
+def _rk4_step(model, time, y, start, dt):
+    """One classic fourth-order Runge–Kutta step. Returns (y_new, forces at y_new)."""
+    k1 = (y[1], start[2], -start[3])
+    ys = tuple(y[i] + 0.5 * dt * k1[i] for i in range(3))
+    f = model.forces(time + 0.5 * dt, ys[1], ys[2])
+    k2 = (ys[1], f[2], -f[3])
+    ys = tuple(y[i] + 0.5 * dt * k2[i] for i in range(3))
+    f = model.forces(time + 0.5 * dt, ys[1], ys[2])
+    k3 = (ys[1], f[2], -f[3])
+    ys = tuple(y[i] + dt * k3[i] for i in range(3))
+    f = model.forces(time + dt, ys[1], ys[2])
+    k4 = (ys[1], f[2], -f[3])
+    y_new = tuple(y[i] + dt / 6.0 * (k1[i] + 2.0 * k2[i] + 2.0 * k3[i] + k4[i]) for i in range(3))
+    return y_new, model.forces(time + dt, y_new[1], y_new[2])
+
+
+# Fixed-step schemes selectable with run_simulation(integrator=...)
+INTEGRATORS = ('euler', 'semi_implicit', 'rk4')
+
+
+def _dopri_step(model, time, y, start, dt):
+    """One Dormand–Prince 5(4) step. Returns (y_new, forces at y_new, error estimates)."""
+    ks = [(y[1], start[2], -start[3])]
+    for stage in range(1, 7):
+        coeffs = _DP_A[stage]
+        ys = tuple(y[i] + dt * sum(c * k[i] for c, k in zip(coeffs, ks)) for i in range(3))
+        end = model.forces(time + _DP_C[stage] * dt, ys[1], ys[2])
+        ks.append((ys[1], end[2], -end[3]))
+    # stage 7 is evaluated at the 5th order solution, so its forces describe y_new (FSAL)
+    errors = tuple(dt * sum(e * k[i] for e, k in zip(_DP_E, ks)) for i in range(3))
+    return ys, end, errors
+
+
+def _iter_integrate(model, m, events, time_step, adaptive=False, rtol=1e-6, atol=1e-6, max_step=None, locate_events=True,
+                    fast_descent=False, descent_accel_tol=0.05, descent_sample_dt=1.0, integrator='semi_implicit'):
+    """
+    Shared integration loop for run_simulation and iter_simulation. State is
+    (altitude, velocity, mass); each accepted step yields its row as a tuple
+    in SimulationResults.columns order.
+
+    Fixed steps use `integrator` (see INTEGRATORS; 'semi_implicit' is the
+    original update); adaptive steps use Dormand–Prince 5(4) with error
+    control. Events:
+        burnout: time reaches the end of the thrust curve
+        apogee: velocity crosses zero going down
+        deployment: falling below the deploy height (or apogee, if lower)
+        landing: altitude crosses zero (terminal)
+    Events are appended to `events` before the row of the step they fall in.
+    Each is located by root-finding on the step's Hermite interpolant.
+    With fast_descent, once the chute is fully open, the motor is out and
+    |acceleration| is below descent_accel_tol, the rest of the fall is
+    solved in closed form (_steady_descent) with rows every descent_sample_dt.
+    With locate_events, steps are clipped to end on burnout and shortened to
+    end on deployment and landing, so the chute opens and the rocket lands at
+    the located time. Without it (the original behaviour, kept for the batch
+    engine), deployment is checked at the start of each step and landing
+    clamps the step that goes below ground.
+
+    Returns (deployment_stats, steps, rejected, evaluations) when exhausted.
+    """
+    if integrator not in INTEGRATORS:
+        raise ValueError(f"Unknown integrator {integrator!r}; expected one of {', '.join(INTEGRATORS)}.")
+    rk4 = integrator == 'rk4' and not adaptive
+    euler_step = _explicit_euler_step if integrator == 'euler' else _euler_step
+    # Higher-order steps end with the forces at y_new, which the next step starts from
+    carries_end = adaptive or rk4
+    time = 0.0
+    y = (0.0, 0.0, m)
+    start = model.forces(time, y[1], y[2])
+    evaluations = 1
+    steps = rejected = 0
+    next_dt = time_step
+    deployment_stats = None
+    forced = None  # crossing the pending shortened step must end on
+
+    def record_event(name, t, state):
+        events.append({'event': name, 'time': float(t), 'altitude': float(state[0]), 'velocity': float(state[1])})
+
+    while True:
+        if forced is None:
+            if model.should_deploy(y[0], y[1]):
+                deployment_stats = model.deploy(time, y[1])
+                record_event('deployment', time, y)
+            if not carries_end:
+                start = model.forces(time, y[1], y[2])
+                evaluations += 1
+            if (fast_descent and model.deploy_end is not None and time >= model.deploy_end
+                    and start[0] == 0.0 and y[1] < 0 and abs(start[2]) < descent_accel_tol):
+                samples = 0
+                for row in _steady_descent(model, time, y, descent_sample_dt, record_event):
+                    samples += 1
+                    yield row
+                return deployment_stats, steps + samples, rejected, evaluations + samples
+            dt = next_dt
+            if adaptive and max_step is not None:
+                dt = min(dt, max_step)
+            t_end = time + dt
+            if (adaptive or locate_events) and time < model.burn_time < t_end:
+                # End this step exactly at burnout
+                dt = model.burn_time - time
+                t_end = model.burn_time
+            if dt < 1e-12:
+                raise RuntimeError("Step size underflow.")
+
+        if adaptive:
+            y_new, end, errors = _dopri_step(model, time, y, start, dt)
+            evaluations += 6
+        elif rk4:
+            y_new, end = _rk4_step(model, time, y, start, dt)
+            evaluations += 4
+        else:
+            y_new = euler_step(y, start, dt)
+            end = None
+
+        if forced is None:
+            if adaptive:
+                error = sum((errors[i] / (atol + rtol * max(abs(y[i]), abs(y_new[i])))) ** 2 for i in range(3))
+                error = (error / 3) ** 0.5
+                if error > 1.0:
+                    rejected += 1
+                    next_dt = dt * max(0.2, 0.9 * error ** -0.2)
+                    continue
+                next_dt = dt * min(10.0, max(0.2, 0.9 * error ** -0.2)) if error > 0 else dt * 10.0
+            if locate_events:
+                # Deployment always comes before the landing it would precede; it needs a
+                # descent from above the ground (a rocket that never lifts off just lands)
+                deploy_height = model.deploy_height
+                if not model.chute_deployed and y[0] > 0 and y_new[1] < 0 and y_new[0] < deploy_height:
+                    if end is None:
+                        end = model.forces(t_end, y_new[1], y_new[2])
+                        evaluations += 1
+                    forced = 'deployment'
+                    s = _crossing_fraction(lambda s: max(
+                        _hermite(y[0], y_new[0], y[1], y_new[1], dt, s) - deploy_height,
+                        _hermite(y[1], y_new[1], start[2], end[2], dt, s)))
+                elif y_new[0] < 0:
+                    forced = 'landing'
+                    s = _crossing_fraction(lambda s: _hermite(y[0], y_new[0], y[1], y_new[1], dt, s))
+                if forced == 'deployment' and s == 0.0:
+                    # Already past the deployment condition: open the chute now and retake the step
+                    deployment_stats = model.deploy(time, y[1])
+                    record_event('deployment', time, y)
+                    forced = None
+                    continue
+                if forced is not None and 0.0 < s < 1.0:
+                    # Retake the step so it ends on the crossing
+                    dt *= s
+                    t_end = time + dt
+                    continue
+
+        # Step accepted
+        if end is None and (y[1] > 0 >= y_new[1] or time < model.burn_time <= t_end):
+            end = model.forces(t_end, y_new[1], y_new[2])
+            evaluations += 1
+        if y[1] > 0 >= y_new[1]:
+            s = _crossing_fraction(lambda s: _hermite(y[1], y_new[1], start[2], end[2], dt, s))
+            record_event('apogee', time + s * dt, (_hermite(y[0], y_new[0], y[1], y_new[1], dt, s), 0.0))
+        if time < model.burn_time <= t_end:
+            s = (model.burn_time - time) / dt
+            record_event('burnout', model.burn_time, (_hermite(y[0], y_new[0], y[1], y_new[1], dt, s),
+                                                      _hermite(y[1], y_new[1], start[2], end[2], dt, s)))
+        row = end if carries_end else start
+        time = t_end
+        y = y_new
+        steps += 1
+        landed = y[0] < 0 or forced == 'landing'
+        if landed:
+            record_event('landing', time, (0.0, y[1]))
+            y = (0.0, 0.0, y[2])
+        elif forced == 'deployment':
+            deployment_stats = model.deploy(time, y[1])
+            record_event('deployment', time, y)
+        forced = None
+        if carries_end:
+            start = end
+        yield time, y[0], y[1], row[2], row[0], row[1], model.chute_deployed, y[2], row[3]
+        # Use a small epsilon to avoid floating point issues
+        if y[0] == 0 and y[1] <= 0:
+            break
+    return deployment_stats, steps, rejected, evaluations
+
+
+def _sample_rows(stepper, events, output_dt):
+    """
+    Pass on the rows of an _iter_integrate stream only every output_dt seconds,
+    plus the row of every step that located an event (burnout, deployment and
+    landing steps end on the event; apogee is in the step before its row).
+    Returns the stream's stats.
+    """
+    next_time = output_dt
+    tolerance = 1e-6 * output_dt  # accumulated round-off in time
+    seen = len(events)
+    while True:
+        try:
+            row = next(stepper)
+        except StopIteration as done:
+            return done.value
+        time = row[0]
+        if time >= next_time - tolerance:
+            while next_time <= time + tolerance:
+                next_time += output_dt
+        elif len(events) == seen:
+            continue
+        seen = len(events)
+        yield row
+
+
+def _integrate(model, m, results, *args, output_dt=None):
+    """Run _iter_integrate to the end, appending every (sampled) row to results; returns its stats."""
+    stepper = _iter_integrate(model, m, results.events, *args)
+    if output_dt:
+        stepper = _sample_rows(stepper, results.events, output_dt)
+    append = results.append
+    while True:
+        try:
+            row = next(stepper)
+        except StopIteration as done:
+            return done.value
+        append(*row)
+
+
+def spawn_generators(seed, n):
+    """
+    Return n independent numpy Generators derived from seed with SeedSequence.spawn.
+
+    seed may be None (fresh entropy), an int, a SeedSequence or a Generator.
+    Child i depends only on seed and i, so run i of an ensemble gets the same
+    stream however the runs are split between workers.
+    """
+    if isinstance(seed, np.random.Generator):
+        return seed.spawn(n)
+    return [np.random.default_rng(child) for child in spawn_seeds(seed, n)]
+
+
+def spawn_seeds(seed, n):
+    """
+    The n SeedSequence children behind spawn_generators(seed, n). Unlike
+    Generators they compare and hash by value (entropy, spawn_key), so they
+    can be sent over the network or used to key journal entries.
+    """
+    if isinstance(seed, np.random.Generator):
+        return seed.bit_generator.seed_seq.spawn(n)
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    return seed.spawn(n)
+
+
+def _flight_model(Cd, A, rho, thrust_curve_path=None, thrust_curve=None, chute_height=None, chute_size=None, chute_cd=None, deploy_period=None, seed=None):
+    """Load the thrust curve and build the FlightModel for one run, or return {'error': ...}."""
+    if thrust_curve is None:
+        thrust_curve = load_thrust_curve(thrust_curve_path)
+        if thrust_curve is None:
+            return {'error': "Thrust curve file is empty or invalid."}
+
+    if deploy_period is None:
+        rng = np.random.default_rng(seed)
+        deploy_period = float(rng.uniform(0.5, 2.5))  # random deployment period in seconds
+    return FlightModel(thrust_curve, Cd, A, rho, chute_height, chute_size, chute_cd, deploy_period)
+
+
+def run_simulation(m, Cd, A, rho, thrust_curve_path=None, chute_height=None, chute_size=None, time_step=None, chute_deploy_start=None, chute_cd=None, deploy_period=None, seed=None, thrust_curve=None, integrator='semi_implicit', adaptive=False, rtol=1e-6, atol=1e-6, max_step=None, locate_events=True, fast_descent=False, descent_accel_tol=0.05, descent_sample_dt=1.0, output_dt=None, max_samples=None, summary_only=False, speed_of_sound=343.0, **kwargs):
     """
     Rocket simulation with organized givens and constants.
     
@@ -7,9 +877,39 @@ def run_simulation(m, Cd, A, rho, thrust_curve_path=None, chute_height=None, chu
         Cd: Drag coefficient (rocket body, typical 0.3–1.5)
         A: Cross-sectional area (m²)
         rho: Air density (kg/m³)
-        thrust_curve_path: Path to thrust curve CSV file [optional]
+        thrust_curve_path: Path to thrust curve CSV or RASP/ENG file [optional]
+        thrust_curve: Prebuilt ThrustCurve, used instead of thrust_curve_path [optional]
         chute_cd: Parachute drag coefficient (typical 1.5–2.2, used as entered)
         chute_size: Parachute area (m²)
+        deploy_period: Seconds for the chute to fully open [optional, random 0.5–2.5 s if omitted]
+        seed: Seed or numpy Generator for the random deploy period, so runs can be reproduced [optional]
+
+    Integration Options:
+        integrator: Fixed-step scheme, one of INTEGRATORS:
+            'semi_implicit' (default, the original update: velocity first,
+            then altitude with the new velocity), 'euler' (explicit forward
+            Euler) or 'rk4' (classic Runge–Kutta, 4 force evaluations a step)
+        adaptive: Use Dormand–Prince 5(4) with error control instead of fixed steps;
+            time_step is then only the first trial step
+        rtol, atol: Relative and absolute tolerances for adaptive stepping
+        max_step: Upper bound on the adaptive step (s) [optional]
+        locate_events: Root-find burnout, apogee, deployment and landing inside
+            the step and end steps on them (default). False reproduces the
+            original step-boundary checks, as run_simulation_batch does.
+        fast_descent: Once the chute is fully open and |a| < descent_accel_tol
+            (m/s²), jump to landing with the closed-form terminal-velocity
+            solution, storing a row every descent_sample_dt seconds
+
+    Output Options:
+        output_dt: Store a row only every output_dt seconds (plus the steps that
+            located an event) while still integrating at time_step [optional]
+        max_samples: Thin the stored trajectory to at most this many rows,
+            evenly spread in time, keeping the event rows [optional]
+        summary_only: Keep running maxima and events instead of storing rows and
+            return the summary dict (SUMMARY_KEYS); memory no longer grows
+            with flight time. Every step feeds the maxima (output_dt and
+            max_samples are ignored), so the summary matches the full trajectory's
+        speed_of_sound: Used for max_mach in the summary (m/s)
 
     Simulation Constants:
         g: Gravity acceleration (9.81 m/s²)
@@ -17,10 +917,12 @@ def run_simulation(m, Cd, A, rho, thrust_curve_path=None, chute_height=None, chu
         TimeI: Simulation time increment (0.5 s)
 
     Derived/Calculated:
-        thrust_data: List of (time, thrust) tuples (from file or default)
-        times, thrusts: Arrays from thrust_data
-        Isp: Specific impulse, estimated from total impulse and g0
-        total_impulse:  from thrust curve
+        thrust_curve: ThrustCurve (from file or default), loaded once and cached
+        model: FlightModel with Isp estimated from total impulse and g0
+
+    Returns a SimulationResults (columnar, indexable like a list of row dicts)
+    or {'error': ...}. results.events is the event table and results.stats
+    reports steps taken and rejected.
 
     State Variables (updated during simulation):
         time: Current simulation time
@@ -29,130 +931,354 @@ def run_simulation(m, Cd, A, rho, thrust_curve_path=None, chute_height=None, chu
         mass: Current mass (decreases with fuel burn)
         chute_deployed: Boolean for parachute deployment
     """
-    import numpy as np
-    from scipy.interpolate import interp1d
-    import csv
-    if thrust_curve_path:
-        thrust_data = []
-        with open(thrust_curve_path, newline='') as csvfile:
-            reader = csv.reader(csvfile)
-            for row in reader:
-                # Skip empty or header rows
-                if not row or len(row) < 2:
-                    continue
-                try:
-                    t = float(row[0])
-                    thrust = float(row[1])
-                    thrust_data.append((t, thrust))
-                except Exception:
-                    continue
-        if not thrust_data:
-            return {'error': "Thrust curve file is empty or invalid."}
-    else:
-        thrust_data = [
-            (0.124, 816.849), (0.375, 796.043), (0.626, 781.861), (0.877, 767.440),
-            (1.129, 759.627), (1.380, 735.948), (1.631, 714.454), (1.883, 701.582),
-            (2.134, 674.667), (2.385, 656.493), (2.637, 636.076), (2.889, 612.409),
-            (3.140, 587.801), (3.391, 567.170), (3.642, 559.971), (3.894, 534.157),
-            (4.145, 444.562), (4.396, 280.510), (4.648, 216.702), (4.899, 163.136),
-            (5.150, 120.571), (5.402, 86.544), (5.653, 59.990), (5.904, 39.527),
-            (6.156, 25.914), (6.408, 0.000),
-        ]
-
-    times, thrusts = zip(*thrust_data)
-    # For times before thrust curve starts, use the first thrust value
-    def thrust_func_fixed(t):
-        if t < times[0]:
-            return thrusts[0]
-        return float(interp1d(times, thrusts, bounds_error=False, fill_value=0.0)(t))
-
-    burn_time = times[-1]
-    g = 9.81
-    g0 = 9.80665  # Standard gravity for Isp equation
+    model = _flight_model(Cd, A, rho, thrust_curve_path, thrust_curve, chute_height, chute_size, chute_cd, deploy_period, seed)
+    if isinstance(model, dict):
+        return model
+    thrust_curve = model.thrust_curve
     # Use time_step from UI if provided, else default to 0.05
     TimeI = time_step if time_step is not None else 0.05
-    time = 0.0
-    velocity = 0.0
-    altitude = 0.0
-    results = []
 
-    total_impulse = calculate_total_impulse(thrust_data)
-    Isp = total_impulse/g0  # Estimate Isp from total impulse and g0
+    try:
+        if summary_only:
+            results = SummaryRecorder()
+        else:
+            results = SimulationResults(capacity=256 if adaptive else int(60 / max(TimeI, output_dt or 0)) + 1)
+        deployment_stats, steps, rejected, evaluations = _integrate(
+            model, m, results, TimeI, adaptive, rtol, atol, max_step, locate_events,
+            fast_descent, descent_accel_tol, descent_sample_dt, integrator,
+            # The summary's maxima need every step; sampling only saves memory for stored rows
+            output_dt=None if summary_only else output_dt)
+        results.stats = {'integrator': 'dopri5' if adaptive else integrator, 'steps': steps,
+                         'rejected': rejected, 'evaluations': evaluations}
+        # Deployment stats are stored once; the row view repeats them for UI display
+        if deployment_stats:
+            results.metadata.update(deployment_stats)
+        if summary_only:
+            return results.summary(speed_of_sound)
+        if max_samples and len(results) > max_samples:
+            results = results.decimate(max_samples)
+        print("Total Impulse:", thrust_curve.total_impulse, "N·s")
+        return results
+    except Exception as e:
+        return {'error': str(e)}
+
+def simulate_summary(m, Cd, A, rho, **kwargs):
+    """run_simulation(..., summary_only=True): the summary dict without any per-step rows."""
+    return run_simulation(m, Cd, A, rho, summary_only=True, **kwargs)
 
-    def drag_force(v, Cd_val, A_val):
-        return 0.5 * rho * v**2 * Cd_val * A_val
 
-    import random
-    chute_deployed = False
-    deploy_period = random.uniform(0.5, 2.5)  # random deployment period in seconds
-    deploy_start = None
-    deploy_end = None
+def iter_simulation(m, Cd, A, rho, thrust_curve_path=None, chute_height=None, chute_size=None, time_step=None, chute_deploy_start=None, chute_cd=None, deploy_period=None, seed=None, thrust_curve=None, integrator='semi_implicit', adaptive=False, rtol=1e-6, atol=1e-6, max_step=None, locate_events=True, fast_descent=False, descent_accel_tol=0.05, descent_sample_dt=1.0, output_dt=None, chunk_size=None, **kwargs):
+    """
+    Generator form of run_simulation: yields the trajectory while it is integrated.
 
-    deployment_stats = None
-    try:
-        while True:
-            F = thrust_func_fixed(time) if time <= burn_time else 0.0
-            # Deploy parachute if falling and below chute_height (if provided), else default to 300m
-            deploy_height = chute_height if chute_height is not None else 300
-            if not chute_deployed and velocity < 0 and altitude < deploy_height:
-                chute_deployed = True
-                deploy_start = time
-                deploy_end = time + deploy_period
-                # Record deployment stats
-                deployment_stats = {
-                    'deployment_time': time,
-                    'force_at_deployment': drag_force(velocity, current_Cd, current_A)
-                }
-            # Gradually change Cd and area from normal to parachute values over random deployment period
-            if chute_deployed and deploy_start is not None and deploy_start <= time < deploy_end:
-                deploy_fraction = (time - deploy_start) / (deploy_end - deploy_start)
-                target_Cd = chute_cd if chute_cd is not None else Cd
-                target_A = chute_size if chute_size is not None else A
-                current_Cd = Cd + deploy_fraction * (target_Cd - Cd)
-                current_A = A + deploy_fraction * (target_A - A)
-            elif chute_deployed and deploy_end is not None and time >= deploy_end:
-                current_Cd = chute_cd if chute_cd is not None else Cd
-                current_A = chute_size if chute_size is not None else A
+    Takes the same arguments as run_simulation. With chunk_size None every
+    step is yielded as a row dict (the keys of a SimulationResults row, with
+    the deployment stats once the chute is out) plus 'events', the events
+    located in that step. With chunk_size, SimulationResults of up to
+    chunk_size rows are yielded instead; each carries the events located in
+    it, and the last one carries stats.
+
+    Stop early with close() or by leaving the loop, e.g. at the first sample
+    whose events include apogee. Errors are yielded as a single {'error': ...}.
+    """
+    model = _flight_model(Cd, A, rho, thrust_curve_path, thrust_curve, chute_height, chute_size, chute_cd, deploy_period, seed)
+    if isinstance(model, dict):
+        yield model
+        return
+    TimeI = time_step if time_step is not None else 0.05
+    events = []
+    stepper = _iter_integrate(model, m, events, TimeI, adaptive, rtol, atol, max_step, locate_events,
+                              fast_descent, descent_accel_tol, descent_sample_dt, integrator)
+    if output_dt:
+        stepper = _sample_rows(stepper, events, output_dt)
+    columns = SimulationResults.columns
+    seen = 0
+    chunk = None
+    while True:
+        try:
+            row = next(stepper)
+        except StopIteration as done:
+            stats = done.value
+            break
+        except Exception as e:
+            yield {'error': str(e)}
+            return
+        if chunk_size is None:
+            sample = dict(zip(columns, row))
+            if model.deployment_stats:
+                sample.update(model.deployment_stats)
+            sample['events'] = events[seen:]
+            seen = len(events)
+            yield sample
+            continue
+        if chunk is None:
+            chunk = SimulationResults(capacity=chunk_size)
+        chunk.append(*row)
+        if len(chunk) == chunk_size:
+            chunk.events = events[seen:]
+            seen = len(events)
+            if model.deployment_stats:
+                chunk.metadata.update(model.deployment_stats)
+            yield chunk
+            chunk = None
+    if chunk_size is not None:
+        if chunk is None:
+            chunk = SimulationResults(capacity=1)
+        chunk.events = events[seen:]
+        if model.deployment_stats:
+            chunk.metadata.update(model.deployment_stats)
+        chunk.stats = {'integrator': 'dopri5' if adaptive else integrator, 'steps': stats[1],
+                       'rejected': stats[2], 'evaluations': stats[3]}
+        yield chunk
+
+
+def write_csv(stream, path):
+    """
+    Write the samples or chunks of an iter_simulation stream to a CSV file as
+    they arrive; returns the number of rows written. Raises ValueError on an
+    error sample.
+    """
+    import csv
+    columns = SimulationResults.columns
+    rows = 0
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for item in stream:
+            if isinstance(item, dict):
+                if 'error' in item:
+                    raise ValueError(item['error'])
+                writer.writerow([item[key] for key in columns])
+                rows += 1
             else:
-                current_Cd = Cd
-                current_A = A
-            # Always use current_Cd and current_A for drag, smooth transition
-            F_drag = drag_force(velocity, current_Cd, current_A)
-            a = (F - np.sign(velocity) * F_drag) / m - g
-            # Calculate mdot (mass flow rate) using proper specific impulse equation
-            mdot = F / (Isp * g0) if F > 0 else 0
-            m -= mdot * TimeI  # Update mass
-            velocity += a * TimeI
-            altitude += velocity * TimeI
+                writer.writerows(zip(*(item.column(key).tolist() for key in columns)))
+                rows += len(item)
+    return rows
+
+
+class BatchResults:
+    """
+    Output of run_simulation_batch.
+
+    Per-member summary arrays (length N):
+        apogee, apogee_time, max_velocity, deployment_time, force_at_deployment,
+        landing_time, burnout_time, steps (number of recorded rows per member)
+
+    When trajectories are stored, `time` is the shared time column and every
+    other column is a (steps, N) array; rows past a member's landing repeat
+    its landed state. Use trajectory(i) to get the SimulationResults
+    run_simulation would have returned for member i.
+    """
+    columns = ('altitude', 'velocity', 'acceleration', 'thrust', 'drag', 'chute_deployed', 'mass', 'mdot')
+
+    def __init__(self, n, summary, time=None, trajectories=None):
+        self.n = n
+        self.summary = summary
+        self.time = time
+        self.trajectories = trajectories
+        for key, values in summary.items():
+            setattr(self, key, values)
+
+    def __len__(self):
+        return self.n
+
+    def trajectory(self, i):
+        """Return member i as a SimulationResults, matching what run_simulation returns."""
+        if self.trajectories is None:
+            raise ValueError("Trajectories were not stored for this batch (store_trajectories=False).")
+        steps = int(self.steps[i])
+        columns = {key: values[:steps, i] for key, values in self.trajectories.items()}
+        columns['time'] = self.time[:steps]
+        metadata = None
+        if not np.isnan(self.deployment_time[i]):
+            metadata = {
+                'deployment_time': float(self.deployment_time[i]),
+                'force_at_deployment': float(self.force_at_deployment[i]),
+            }
+        return SimulationResults.from_columns(columns, metadata)
+
+
+def run_simulation_batch(m, Cd, A, rho, thrust_curves=None, curve_index=None, chute_height=None, chute_size=None, time_step=None, chute_cd=None, deploy_period=None, seed=None, store_trajectories=False):
+    """
+    Advance N rockets together with the same physics as run_simulation
+    (fixed steps with locate_events=False).
+
+    Every parameter except thrust_curves and time_step may be a scalar or
+    an array; they are broadcast to a common length N. All members share the
+    integration clock, so each step is a handful of NumPy operations on the
+    members still in the air, and landed members are masked out.
+
+    Batch Inputs:
+        m, Cd, A, rho: as in run_simulation
+        thrust_curves: List of ThrustCurve objects or file paths (None entries use the default curve) [optional]
+        curve_index: Index into thrust_curves for each member (default 0)
+        chute_height, chute_size, chute_cd: as in run_simulation, per member
+        deploy_period: Chute opening time per member [optional, random 0.5–2.5 s if omitted]
+        seed: Seed or Generator for the random deploy periods; member i draws from
+            child stream i of spawn_generators(seed, N)
+        store_trajectories: Also keep every column for every step, in arrays
+            preallocated for about a minute of flight and doubled as needed.
+            This costs steps × N × 9 values, so it is off by default; large
+            studies only need the summary arrays.
+
+    Returns a BatchResults, or {'error': ...} like run_simulation.
+    """
+    try:
+        if thrust_curves is None or isinstance(thrust_curves, (str, ThrustCurve)):
+            thrust_curves = [thrust_curves]
+        curves = []
+        for curve in thrust_curves:
+            if not isinstance(curve, ThrustCurve):
+                path = curve
+                curve = load_thrust_curve(path)
+                if curve is None:
+                    return {'error': f"Thrust curve file is empty or invalid: {path}"}
+            curves.append(curve)
+
+        if curve_index is None:
+            curve_index = 0
+        target_Cd = Cd if chute_cd is None else chute_cd
+        target_A = A if chute_size is None else chute_size
+        deploy_height = 300 if chute_height is None else chute_height
+        mass, Cd, A, rho, curve_index, deploy_height, target_Cd, target_A = (
+            np.array(arr, dtype=float) for arr in np.broadcast_arrays(
+                m, Cd, A, rho, curve_index, deploy_height, target_Cd, target_A))
+        n = mass.size
+        mass, Cd, A, rho, deploy_height, target_Cd, target_A = (
+            arr.reshape(n) for arr in (mass, Cd, A, rho, deploy_height, target_Cd, target_A))
+        curve_index = curve_index.reshape(n).astype(int)
+        if n and (curve_index.min() < 0 or curve_index.max() >= len(curves)):
+            return {'error': "curve_index out of range for thrust_curves."}
+        if deploy_period is None:
+            deploy_period = [rng.uniform(0.5, 2.5) for rng in spawn_generators(seed, n)]
+        deploy_period = np.broadcast_to(np.asarray(deploy_period, dtype=float), (n,))
+
+        burn_times = np.array([c.burn_time for c in curves])
+        impulses = np.array([c.total_impulse for c in curves])
+        g = 9.81
+        TimeI = time_step if time_step is not None else 0.05
+        time = 0.0
+        velocity = np.zeros(n)
+        altitude = np.zeros(n)
+        chute_deployed = np.zeros(n, dtype=bool)
+        deploy_start = np.full(n, np.nan)
+        deploy_end = np.full(n, np.nan)
+        active = np.ones(n, dtype=bool)
+
+        apogee = np.zeros(n)
+        apogee_time = np.zeros(n)
+        max_velocity = np.full(n, -np.inf)
+        deployment_time = np.full(n, np.nan)
+        force_at_deployment = np.full(n, np.nan)
+        landing_time = np.full(n, np.nan)
+        steps = np.zeros(n, dtype=int)
+
+        if store_trajectories:
+            capacity = int(60 / TimeI) + 1
+            filled = 0
+            time_rows = np.empty(capacity)
+            last = {
+                'altitude': altitude.copy(), 'velocity': velocity.copy(),
+                'acceleration': np.zeros(n), 'thrust': np.zeros(n), 'drag': np.zeros(n),
+                'chute_deployed': chute_deployed.copy(), 'mass': mass.copy(), 'mdot': np.zeros(n),
+            }
+            rows = {key: np.empty((capacity, n), dtype=values.dtype) for key, values in last.items()}
+
+        idx = np.arange(n)
+        while idx.size:
+            # Thrust is shared by every member flying the same curve
+            curve_thrust = np.array([c(time) if time <= c.burn_time else 0.0 for c in curves])
+            ci = curve_index[idx]
+            F = curve_thrust[ci]
+            v = velocity[idx]
+            h = altitude[idx]
+            rho_i = rho[idx]
+
+            # Deploy parachute if falling and below chute_height
+            deploying = ~chute_deployed[idx] & (v < 0) & (h < deploy_height[idx])
+            if deploying.any():
+                d = idx[deploying]
+                chute_deployed[d] = True
+                deploy_start[d] = time
+                deploy_end[d] = time + deploy_period[d]
+                deployment_time[d] = time
+                force_at_deployment[d] = 0.5 * rho[d] * velocity[d]**2 * Cd[d] * A[d]
+
+            # Gradually change Cd and area from normal to parachute values over the deployment period
+            Cd_i = Cd[idx]
+            A_i = A[idx]
+            deployed = chute_deployed[idx]
+            start = deploy_start[idx]
+            end = deploy_end[idx]
+            opening = deployed & (start <= time) & (time < end)
+            opened = deployed & (time >= end)
+            with np.errstate(invalid='ignore'):
+                deploy_fraction = np.where(opening, (time - start) / (end - start), 0.0)
+            current_Cd = np.where(opened, target_Cd[idx], Cd_i + deploy_fraction * (target_Cd[idx] - Cd_i))
+            current_A = np.where(opened, target_A[idx], A_i + deploy_fraction * (target_A[idx] - A_i))
+            current_Cd = np.where(opening | opened, current_Cd, Cd_i)
+            current_A = np.where(opening | opened, current_A, A_i)
+
+            F_drag = 0.5 * rho_i * v**2 * current_Cd * current_A
+            m_i = mass[idx]
+            a = (F - np.sign(v) * F_drag) / m_i - g
+            mdot = np.where(F > 0, F / impulses[ci], 0.0)
+            m_i = m_i - mdot * TimeI
+            v = v + a * TimeI
+            h = h + v * TimeI
             time += TimeI
-            if altitude < 0:
-                altitude = 0
-                velocity = 0  # Reset velocity to zero when hitting ground to avoid infinite loop
-            results.append({
-                'time': time,
-                'altitude': altitude,
-                'velocity': velocity,
-                'acceleration': a,
-                'thrust': F,
-                'drag': F_drag,
-                'chute_deployed': chute_deployed,
-                'mass': m,
-                'mdot': mdot
-            })
-            # Use a small epsilon to avoid floating point issues
-            if altitude == 0 and velocity <= 0:
-                break
-        impulse = calculate_total_impulse(thrust_data)
-        print("Total Impulse:", impulse, "N·s")
-        # Attach deployment stats to results for UI display
-        if deployment_stats:
-            for r in results:
-                r['deployment_time'] = deployment_stats['deployment_time']
-                r['force_at_deployment'] = deployment_stats['force_at_deployment']
-        return results
+            grounded = h < 0
+            h[grounded] = 0
+            v[grounded] = 0
+            mass[idx] = m_i
+            velocity[idx] = v
+            altitude[idx] = h
+            steps[idx] += 1
+
+            higher = h > apogee[idx]
+            apogee[idx[higher]] = h[higher]
+            apogee_time[idx[higher]] = time
+            faster = v > max_velocity[idx]
+            max_velocity[idx[faster]] = v[faster]
+
+            if store_trajectories:
+                if filled == capacity:
+                    capacity *= 2
+                    time_rows = np.resize(time_rows, capacity)
+                    for key, values in rows.items():
+                        rows[key] = np.empty((capacity, n), dtype=values.dtype)
+                        rows[key][:filled] = values
+                for key, values in (('altitude', h), ('velocity', v), ('acceleration', a), ('thrust', F),
+                                    ('drag', F_drag), ('chute_deployed', chute_deployed[idx]), ('mass', m_i), ('mdot', mdot)):
+                    last[key][idx] = values
+                    rows[key][filled] = last[key]
+                time_rows[filled] = time
+                filled += 1
+
+            landed = (h == 0) & (v <= 0)
+            if landed.any():
+                landing_time[idx[landed]] = time
+                active[idx[landed]] = False
+                idx = idx[~landed]
+
+        summary = {
+            'apogee': apogee,
+            'apogee_time': apogee_time,
+            'max_velocity': max_velocity,
+            'deployment_time': deployment_time,
+            'force_at_deployment': force_at_deployment,
+            'landing_time': landing_time,
+            'burnout_time': burn_times[curve_index],
+            'steps': steps,
+        }
+        if store_trajectories:
+            trajectories = {key: values[:filled] for key, values in rows.items()}
+            return BatchResults(n, summary, time_rows[:filled], trajectories)
+        return BatchResults(n, summary)
     except Exception as e:
         return {'error': str(e)}
 
+
 def plot_results(results):
     print("Results length:", len(results))
     if not results:
@@ -180,7 +1306,7 @@ def plot_table_and_stats(results):
     import matplotlib.pyplot as plt
     import pandas as pd
     # Convert results to DataFrame for easy table and plotting
-    df = pd.DataFrame(results)
+    df = pd.DataFrame(results.as_columns() if isinstance(results, SimulationResults) else results)
     # Display table in console
     print(df[['time','altitude','velocity','acceleration','thrust','drag','mass','mdot']].head(20))
 
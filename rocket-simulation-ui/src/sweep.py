@@ -0,0 +1,111 @@
+"""
+Full-factorial parameter sweeps.
+
+sweep() evaluates every combination of the axis values in summary-only mode,
+spread over worker processes, and returns the metrics as N-d arrays indexed
+by the axes in the order given.
+"""
+
+from itertools import product
+
+import numpy as np
+
+from simulation import spawn_seeds
+from monte_carlo import run_points_parallel, OUTCOME_KEYS
+from shared_results import trajectory_from_buffers
+
+
+class SweepResults:
+    """
+    Output of sweep.
+
+    axes: {name: list of values} in sweep order; metric arrays have one dimension per axis
+    metrics: {metric: N-d array} for OUTCOME_KEYS (NaN where a point failed)
+    errors: List of (index tuple, message) for failed points
+    trajectories, lengths: Stored trajectories (flat point order) when
+        trajectory_rows was given; use trajectory(**coords)
+    """
+
+    def __init__(self, axes, metrics, errors=None, trajectories=None, lengths=None):
+        self.axes = axes
+        self.metrics = metrics
+        self.errors = errors or []
+        self.trajectories = trajectories
+        self.lengths = lengths
+        self.shape = tuple(len(values) for values in axes.values())
+
+    def trajectory(self, **coords):
+        """The stored trajectory at one point, given a value for every axis."""
+        index = tuple(self._position(name, coords[name]) for name in self.axes)
+        return trajectory_from_buffers(self.trajectories, self.lengths, int(np.ravel_multi_index(index, self.shape)))
+
+    def __getitem__(self, metric):
+        return self.metrics[metric]
+
+    def _position(self, name, value):
+        for i, candidate in enumerate(self.axes[name]):
+            if candidate is value or candidate == value:
+                return i
+        raise KeyError(f"{value!r} is not on the {name} axis.")
+
+    def sel(self, metric, **coords):
+        """
+        Pick by axis value, e.g. sel('apogee', m=5.5, motor=path). Axes not
+        given are kept, so the result is a scalar or a smaller array.
+        """
+        index = tuple(self._position(name, coords[name]) if name in coords else slice(None) for name in self.axes)
+        value = self.metrics[metric][index]
+        return float(value) if np.ndim(value) == 0 else value
+
+    def as_columns(self):
+        """Long format: one entry per point with its axis values and metrics, e.g. for pandas.DataFrame."""
+        columns = {name: [] for name in self.axes}
+        for point in product(*self.axes.values()):
+            for name, value in zip(self.axes, point):
+                columns[name].append(value)
+        columns.update((key, values.ravel()) for key, values in self.metrics.items())
+        return columns
+
+    def __repr__(self):
+        dims = ', '.join(f"{name}: {len(values)}" for name, values in self.axes.items())
+        return f"SweepResults({dims})"
+
+
+def sweep(axes, base_params=None, workers=None, chunk_size=None, progress=None, seed=None, trajectory_rows=None,
+          pool=None, journal=None):
+    """
+    Evaluate every combination of the axis values.
+
+    axes: {name: values}; names are run_simulation keywords (m, Cd, chute_size,
+        integrator, ...) or the run_point extras motor (thrust curve path,
+        ThrustCurve or None), thrust_scale and wind_speed
+    base_params: Keywords shared by every point; m, Cd, A and rho must be
+        given here or as axes
+    workers: Processes to use (default: all cores); 1 runs in this process
+    pool: WarmPool to run on (default: the shared worker_pool.get_pool(workers))
+    chunk_size: Points per submitted task (default: about 4 tasks per worker)
+    progress: Called as progress(done, total) after each chunk finishes
+    seed: Seeds the random deploy period when base_params has none; point i
+        uses child stream i, so results do not depend on workers or chunking
+    trajectory_rows: Also keep each point's trajectory, thinned to at most
+        this many rows [optional]
+    journal: Path (or journal.Journal) to record finished points in; a
+        restarted sweep with the same journal skips the points already there
+        (pass a fixed seed when deploy periods are random, or nothing matches)
+
+    Thrust curves are parsed once per worker process (load_thrust_curve caches
+    them). Workers write into shared-memory arrays and return only errors.
+    Returns SweepResults.
+    """
+    axes = {name: list(values) for name, values in axes.items()}
+    base_params = dict(base_params or {})
+    points = [dict(zip(axes, values)) for values in product(*axes.values())]
+    if base_params.get('deploy_period') is None and 'deploy_period' not in axes:
+        for point, child in zip(points, spawn_seeds(seed, len(points))):
+            point['seed'] = child
+    outcomes, trajectories, lengths, errors = run_points_parallel(base_params, points, workers, pool, chunk_size,
+                                                                  trajectory_rows, progress, journal)
+    shape = tuple(len(values) for values in axes.values())
+    errors = [(np.unravel_index(i, shape), message) for i, message in errors]
+    metrics = {key: outcomes[k].reshape(shape) for k, key in enumerate(OUTCOME_KEYS)}
+    return SweepResults(axes, metrics, errors, trajectories, lengths)
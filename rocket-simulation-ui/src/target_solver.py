@@ -0,0 +1,174 @@
+"""
+Inverse problems: find the value of one input that hits a target outcome,
+e.g. the mass that gives exactly 3000 m apogee with a given motor.
+
+Every evaluation is one summary-only run (monte_carlo.run_point). The root
+is found with Brent's method (scipy.optimize.brentq) inside a bracket that
+starts from earlier solutions for the same motor, parameter and metric, so
+repeated queries converge in a handful of runs.
+"""
+
+import json
+import math
+import os
+
+from scipy.optimize import brentq
+
+from simulation import ThrustCurve
+from monte_carlo import run_point
+
+# Parameters the solver can vary, with the default search bounds (SI units)
+SOLVABLE = {
+    'm': (0.01, 1000.0),
+    'Cd': (0.01, 5.0),
+    'A': (1e-5, 1.0),
+    'chute_size': (0.01, 100.0),
+    'chute_cd': (0.05, 5.0),
+    'thrust_scale': (0.01, 50.0),
+}
+
+
+class _SolveError(Exception):
+    pass
+
+
+class BracketCache:
+    """
+    Earlier solutions per (motor, parameter, metric).
+
+    guess() interpolates between the solved targets nearest a new one, so the
+    next search starts next to its root and only needs a narrow bracket.
+    """
+
+    def __init__(self, max_solutions=32):
+        self.max_solutions = max_solutions
+        self._solutions = {}
+
+    @staticmethod
+    def key(base_params, param, metric):
+        motor = base_params.get('motor', base_params.get('thrust_curve', base_params.get('thrust_curve_path')))
+        if isinstance(motor, ThrustCurve):
+            motor = json.dumps(motor.data)
+        elif isinstance(motor, str):
+            motor = os.path.basename(motor)
+        return motor, param, metric
+
+    def guess(self, key, target):
+        """Estimated parameter value for target, or None with nothing cached."""
+        solutions = sorted(self._solutions.get(key, []), key=lambda s: abs(s[0] - target))[:2]
+        if not solutions:
+            return None
+        if len(solutions) == 1 or solutions[0][0] == solutions[1][0]:
+            return solutions[0][1]
+        (t0, x0), (t1, x1) = solutions
+        return x0 + (target - t0) * (x1 - x0) / (t1 - t0)
+
+    def add(self, key, target, value):
+        solutions = self._solutions.setdefault(key, [])
+        solutions.append((target, value))
+        del solutions[:-self.max_solutions]
+
+    def clear(self):
+        self._solutions.clear()
+
+
+# Shared by every solve_for_target call that does not pass its own cache
+bracket_cache = BracketCache()
+
+
+def _find_bracket(f, x0, lo, hi, step):
+    """
+    Return (a, b) with f(a) and f(b) of opposite sign (or a == b at an exact
+    root), walking outward from x0 with a growing step; None if the bounds
+    are reached first.
+    """
+    f0 = f(x0)
+    if f0 == 0:
+        return x0, x0
+    x1 = min(x0 * (1 + step), hi) if x0 < hi else max(x0 / (1 + step), lo)
+    f1 = f(x1)
+    if f0 * f1 <= 0:
+        return min(x0, x1), max(x0, x1)
+    # Head the way |f| shrinks first, then try the other side
+    uphill = (abs(f1) < abs(f0)) == (x1 > x0)
+    for up in (uphill, not uphill):
+        x, fx = (max(x0, x1), f1 if x1 > x0 else f0) if up else (min(x0, x1), f1 if x1 < x0 else f0)
+        factor = 1 + step
+        while lo < x < hi:
+            new = min(x * factor, hi) if up else max(x / factor, lo)
+            f_new = f(new)
+            if fx * f_new <= 0:
+                return min(x, new), max(x, new)
+            x, fx = new, f_new
+            factor *= factor
+    return None
+
+
+def solve_for_target(param, target, base_params, metric='apogee', bounds=None, xtol=1e-6, rtol=1e-9, maxiter=60,
+                     cache=None):
+    """
+    Find the value of param at which the run's metric equals target.
+
+    param: One of SOLVABLE (m, Cd, A, chute_size, chute_cd, thrust_scale)
+    target: Wanted value of metric (SI units, e.g. 3000.0 m of apogee)
+    base_params: Everything else, as for monte_carlo.run_point (m, Cd, A, rho,
+        thrust_curve_path or motor, chute_size, integrator, ...); the current
+        value of param, if given, is where the search starts
+    metric: Any summary key; chute parameters only change the descent, so
+        solve them for descent_rate or landing_time rather than apogee
+    bounds: (low, high) search range (default: SOLVABLE[param])
+    cache: BracketCache to warm-start from and record into (default: the shared one)
+
+    Without a deploy_period or seed in base_params the runs use seed 0 so the
+    metric is a deterministic function of param. Returns {'param', 'value',
+    'metric', 'target', 'achieved', 'evaluations', 'converged'}, or
+    {'error': ...} when no value within the bounds reaches the target.
+    """
+    if param not in SOLVABLE:
+        raise ValueError(f"Cannot solve for {param!r}; choose from {', '.join(SOLVABLE)}.")
+    params = dict(base_params)
+    if params.get('deploy_period') is None and params.get('seed') is None:
+        params['seed'] = 0
+    lo, hi = bounds or SOLVABLE[param]
+    cache = bracket_cache if cache is None else cache
+    key = cache.key(params, param, metric)
+
+    evaluations = {}
+
+    def f(x):
+        if x not in evaluations:
+            summary = run_point(params, {param: x})
+            if 'error' in summary:
+                raise _SolveError(summary['error'])
+            value = summary[metric]
+            if value is None or math.isnan(value):
+                raise _SolveError(f"{metric} is undefined at {param} = {x:g}.")
+            evaluations[x] = value
+        return evaluations[x] - target
+
+    guess = cache.guess(key, target)
+    if guess is not None:
+        start, step = guess, 0.02
+    else:
+        start, step = params.get(param) or (1.0 if param == 'thrust_scale' else math.sqrt(lo * hi)), 0.1
+    start = min(max(start, lo), hi)
+    unreachable = f"No {param} between {lo:g} and {hi:g} gives {metric} = {target:g}"
+    try:
+        bracket = _find_bracket(f, start, lo, hi, step)
+    except _SolveError as e:
+        return {'error': f"{unreachable} (the search failed: {e})."}
+    if bracket is None:
+        return {'error': f"{unreachable}."}
+    a, b = bracket
+    try:
+        if a == b:
+            value, converged = a, True
+        else:
+            value, info = brentq(f, a, b, xtol=xtol, rtol=rtol, maxiter=maxiter, full_output=True, disp=False)
+            converged = info.converged
+        achieved = f(value) + target
+    except _SolveError as e:
+        return {'error': str(e)}
+    cache.add(key, target, value)
+    return {'param': param, 'value': value, 'metric': metric, 'target': target, 'achieved': achieved,
+            'evaluations': len(evaluations), 'converged': converged}
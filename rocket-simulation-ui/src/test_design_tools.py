@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Checks for the design tools built on the engine (no GUI required)
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(__file__))
+
+import numpy as np
+from simulation import simulate_summary, list_thrust_curves, THRUST_CURVE_DIR
+from target_solver import solve_for_target, BracketCache
+from motor_finder import MotorFinder
+from ejection_delay import ejection_delays
+from pareto import pareto_search, non_dominated_rank
+from sensitivity import sobol_indices
+
+BASE = dict(m=5.5, Cd=0.7, A=0.00456, rho=1.109, chute_size=1.5, chute_cd=2.2, integrator='rk4', fast_descent=True)
+
+
+def test_target_apogee_solver():
+    """Brent's method finds the mass for a target apogee; cached brackets make repeat queries cheaper"""
+    cache = BracketCache()
+    first = solve_for_target('m', 3000.0, BASE, cache=cache)
+    assert first['converged'] and abs(first['achieved'] - 3000.0) < 0.01
+    check = simulate_summary(**dict(BASE, m=first['value'], seed=0))
+    assert abs(check['apogee'] - 3000.0) < 0.01
+    again = solve_for_target('m', 3050.0, BASE, cache=cache)
+    assert abs(again['achieved'] - 3050.0) < 0.01 and again['evaluations'] < first['evaluations']
+    chute = solve_for_target('chute_size', 5.0, BASE, metric='descent_rate', cache=cache)
+    assert abs(chute['achieved'] - 5.0) < 1e-4
+    assert 'error' in solve_for_target('Cd', 1e5, BASE, cache=cache)
+
+
+def test_motor_finder_ranks_library():
+    """Every loadable curve is ranked, filtering reuses cached runs and a pool gives the same table"""
+    finder = MotorFinder(workers=1)
+    table = finder.rank(BASE)
+    apogees = [row['apogee'] for row in table]
+    assert len(table) >= 5 and apogees == sorted(apogees, reverse=True)
+    assert any(os.path.basename(path) == 'brick it.csv' for path, _ in table.errors)
+    k240 = next(row for row in table if row['motor'].endswith('K240'))
+    assert abs(k240['apogee'] - simulate_summary(**dict(BASE, thrust_curve_path=k240['path'], seed=0))['apogee']) < 1e-9
+    cached = len(finder._results)
+    window = finder.rank(BASE, apogee_range=(1000, 3000), sort_by='thrust_to_weight')
+    assert len(finder._results) == cached and all(1000 <= row['apogee'] <= 3000 for row in window)
+    finder.rank(dict(BASE, m=5.6))
+    assert len(finder._results) == 2 * cached
+    pooled = MotorFinder(workers=2).rank(BASE)
+    assert [row['apogee'] for row in pooled] == apogees
+
+
+def test_ejection_delay_table():
+    """Vectorized coast times match the engine's located burnout and apogee events"""
+    masses = [4.0, 5.5, 9.0]
+    table = ejection_delays(BASE, masses, delays=(6, 8, 10, 12, 14))
+    for path in table.paths[:3]:
+        for m in masses:
+            summary = simulate_summary(**dict(BASE, m=m, thrust_curve_path=path, deploy_period=1.0, adaptive=True,
+                                              rtol=1e-10, atol=1e-10))
+            coast = table.sel('coast_time', path, m)
+            assert abs(coast - (summary['apogee_time'] - summary['burnout_time'])) < 1e-5
+            assert abs(table.sel('apogee', path, m) - summary['apogee']) < 1e-2
+            assert table.sel('recommended', path, m) == min((6, 8, 10, 12, 14), key=lambda d: abs(d - coast))
+    example = table.motors.index('example')  # too weak to leave the pad
+    assert np.all(np.isnan(table.coast_time[example]))
+
+
+def test_pareto_front():
+    """The returned front is mutually non-dominated and a worker pool evolves the same population"""
+    motors = [path for path in list_thrust_curves(THRUST_CURVE_DIR) if path.endswith(('K240.csv', 'J317.csv'))]
+    serial = pareto_search(BASE, 2000.0, motors=motors, population=12, generations=3, seed=4, workers=1)
+    assert serial.evaluations == 12 * 4
+    front = serial.as_columns()
+    F = np.column_stack([front[key] for key in serial.objectives])
+    assert len(F) >= 2 and np.all(non_dominated_rank(F) == 0)
+    rows = serial.front()
+    assert [row['apogee_error'] for row in rows] == sorted(row['apogee_error'] for row in rows)
+    pooled = pareto_search(BASE, 2000.0, motors=motors, population=12, generations=3, seed=4, workers=2)
+    assert np.array_equal(pooled.rank, serial.rank)
+    assert all(np.array_equal(pooled.objectives[key], serial.objectives[key]) for key in serial.objectives)
+
+
+def test_sobol_indices():
+    """Inputs that cannot touch an outcome get zero indices, and a worker pool gives the same study"""
+    dispersions = {'m': ('uniform', 5.0, 6.0), 'Cd': ('uniform', 0.6, 0.8), 'chute_size': ('uniform', 1.2, 1.8)}
+    serial = sobol_indices(dict(BASE, seed=0), dispersions, n=64, seed=2, workers=1)
+    assert serial.evaluations == 64 * 5 and serial.inputs == ['m', 'Cd', 'chute_size']
+    apogee = dict(zip(serial.inputs, serial.total['apogee']))
+    assert apogee['chute_size'] == 0 and apogee['Cd'] > 0.5
+    descent = dict(zip(serial.inputs, serial.total['descent_rate']))
+    assert abs(descent['Cd']) < 1e-9 and descent['chute_size'] > 0.3
+    assert serial.table('descent_rate')[0]['input'] in ('m', 'chute_size')
+    pooled = sobol_indices(dict(BASE, seed=0), dispersions, n=64, seed=2, workers=2)
+    assert all(np.array_equal(pooled.total[key], serial.total[key]) for key in serial.outputs)
+
+
+if __name__ == "__main__":
+    test_target_apogee_solver()
+    print("✓ Target apogee solver")
+    test_motor_finder_ranks_library()
+    print("✓ Motor finder ranks the library")
+    test_ejection_delay_table()
+    print("✓ Ejection delay table")
+    test_pareto_front()
+    print("✓ Pareto front")
+    test_sobol_indices()
+    print("✓ Sobol indices")
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Checks for the Monte Carlo dispersion tools (no GUI required)
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(__file__))
+
+import numpy as np
+from monte_carlo import (run_monte_carlo, run_adaptive_monte_carlo, compare_designs, estimate, sample_inputs,
+                         OUTCOME_KEYS)
+from simulation import run_simulation
+
+BASE = dict(m=5.5, Cd=0.7, A=0.00456, rho=1.109, chute_size=1.5, chute_cd=2.2, integrator='rk4', fast_descent=True)
+DISPERSIONS = {'m': 0.1, 'Cd': 0.05, 'thrust_scale': 0.03, 'chute_cd': ('uniform', 1.8, 2.4),
+               'wind_speed': ('uniform', 0.0, 8.0)}
+
+
+def test_monte_carlo_independent_of_workers():
+    """The same seed gives the same table in-process and across a process pool"""
+    serial = run_monte_carlo(BASE, DISPERSIONS, n=24, workers=1, seed=7)
+    pooled = run_monte_carlo(BASE, DISPERSIONS, n=24, workers=2, seed=7, batch_size=5)
+    assert not serial.errors and not pooled.errors
+    for key in OUTCOME_KEYS:
+        assert np.array_equal(serial.outcomes[key], pooled.outcomes[key]), key
+    assert set(serial.inputs) == set(DISPERSIONS) | {'deploy_period'}
+    p = serial.percentiles()['apogee']
+    assert p[1] <= p[50] <= p[99]
+    assert np.all(serial.outcomes['drift'] >= 0)
+
+
+def test_run_streams_stable():
+    """Run i keeps its inputs when n grows, and seeded scalar runs repeat exactly"""
+    small = run_monte_carlo(BASE, DISPERSIONS, n=5, workers=1, seed=11)
+    large = run_monte_carlo(BASE, DISPERSIONS, n=9, workers=1, seed=11)
+    for name, values in small.inputs.items():
+        assert np.array_equal(values, large.inputs[name][:5]), name
+    assert np.array_equal(small.outcomes['apogee'], large.outcomes['apogee'][:5])
+    a = run_simulation(5.5, 0.7, 0.00456, 1.109, chute_size=1.5, chute_cd=2.2, seed=3)
+    b = run_simulation(5.5, 0.7, 0.00456, 1.109, chute_size=1.5, chute_cd=2.2, seed=3)
+    assert a.events == b.events and a.metadata == b.metadata
+
+
+def test_adaptive_stopping():
+    """Rounds stop once every interval is within tolerance, matching a fixed-size study"""
+    targets = [('mean', 'apogee', 60.0), ('percentile', 'drift', 90, 60.0), ('exceedance', 'descent_rate', 7.0, 0.2)]
+    rounds = []
+    adaptive = run_adaptive_monte_carlo(BASE, DISPERSIONS, targets, round_size=10, max_runs=200, seed=5, workers=1,
+                                        on_round=lambda n, estimates: rounds.append(n))
+    assert adaptive.converged and all(e['met'] for e in adaptive.estimates)
+    assert rounds == list(range(10, adaptive.n + 1, 10)) and adaptive.n < 200
+    fixed = run_monte_carlo(BASE, DISPERSIONS, n=adaptive.n, workers=1, seed=5)
+    assert np.array_equal(adaptive.outcomes['apogee'], fixed.outcomes['apogee'])
+    assert f"after {adaptive.n} runs" in adaptive.report()
+    # Interval sanity on known data
+    e = estimate(np.arange(1000.0), ('percentile', 'x', 50, 1.0))
+    assert e['low'] < 499.5 < e['high'] and not e['met']
+    e = estimate(np.r_[np.zeros(90), np.ones(10)], ('exceedance', 'x', 0.5, 0.1))
+    assert e['estimate'] == 0.1 and e['low'] < 0.1 < e['high'] and e['met']
+
+
+def test_space_filling_designs():
+    """Sobol, Halton and LHS designs are seeded, stratified and mapped onto each distribution"""
+    dispersions = {'m': 0.1, 'rho': ('triangular', 1.0, 1.1, 1.3), 'deploy_period': ('uniform', 0.5, 2.5)}
+    for design in ('sobol', 'halton', 'lhs'):
+        a = sample_inputs(BASE, dispersions, 64, seed=3, design=design)
+        b = sample_inputs(BASE, dispersions, 64, seed=3, design=design)
+        for name in dispersions:
+            assert np.array_equal(a[name], b[name]), (design, name)
+        assert 1.0 <= a['rho'].min() and a['rho'].max() <= 1.3
+        # One point in each of the 64 equal-probability slices of the uniform parameter
+        strata = np.floor((a['deploy_period'] - 0.5) / 2.0 * 64).astype(int)
+        assert design == 'halton' or sorted(strata) == list(range(64)), design
+    assert abs(np.mean(a['m']) - BASE['m']) < 0.002
+    results = run_monte_carlo(BASE, dispersions, n=16, workers=1, seed=3, design='sobol')
+    assert not results.errors and np.all(np.isfinite(results.outcomes['apogee']))
+
+
+def test_paired_comparison():
+    """Both designs see the same draws, so the chute size effect is resolved with few runs"""
+    paired = compare_designs(BASE, {'chute_size': 1.4}, {'chute_size': 1.5}, DISPERSIONS, n=30, workers=1, seed=2)
+    alone = run_monte_carlo(dict(BASE, chute_size=1.4), DISPERSIONS, n=30, workers=1, seed=2)
+    assert np.array_equal(paired.a.outcomes['descent_rate'], alone.outcomes['descent_rate'])
+    assert np.array_equal(paired.a.inputs['wind_speed'], paired.b.inputs['wind_speed'])
+    stats = paired.statistics()
+    assert stats['descent_rate']['high'] < 0 and stats['descent_rate']['p_b_greater'] == 0
+    assert stats['descent_rate']['variance_reduction'] > 100
+    assert stats['apogee']['mean'] == 0  # the chute does not change the ascent
+    # Absolute bounds move with the design, so the change is not sampled away
+    bounded = compare_designs(BASE, {'chute_cd': 1.5}, {'chute_cd': 2.5}, {'chute_cd': ('uniform', 1.8, 2.4)},
+                              n=10, workers=1, seed=2)
+    assert np.allclose(bounded.b.inputs['chute_cd'] - bounded.a.inputs['chute_cd'], 1.0)
+    assert bounded.statistics()['descent_rate']['high'] < 0
+
+
+if __name__ == "__main__":
+    test_monte_carlo_independent_of_workers()
+    print("✓ Monte Carlo results independent of worker count")
+    test_run_streams_stable()
+    print("✓ Per-run random streams are stable")
+    test_adaptive_stopping()
+    print("✓ Adaptive Monte Carlo stops on its confidence intervals")
+    test_space_filling_designs()
+    print("✓ Sobol, Halton and LHS designs")
+    test_paired_comparison()
+    print("✓ Paired comparison with common random numbers")
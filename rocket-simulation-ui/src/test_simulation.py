@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Checks for the simulation engine (no GUI required)
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(__file__))
+
+import numpy as np
+from simulation import run_simulation, run_simulation_batch, SimulationResults, ThrustCurve, load_thrust_curve
+from simulation import simulate_summary, summarize_results, SUMMARY_KEYS, iter_simulation
+
+CURVE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'thrust_curves', 'csv')
+K240 = os.path.join(CURVE_DIR, 'Hypertek_835CC125J-K240.csv')
+
+
+def test_batch_matches_scalar():
+    """Every batch member should reproduce the scalar run with the same inputs"""
+    masses = [4.0, 5.5, 7.0]
+    chute_sizes = [15.0, 1.5, 2.0]
+    curve_index = [0, 1, 1]
+    periods = [0.7, 1.3, 2.0]
+    paths = [None, K240]
+    batch = run_simulation_batch(masses, 0.7, 0.00456, 1.109, paths, curve_index=curve_index,
+                                 chute_height=300, chute_size=chute_sizes, chute_cd=2.2,
+                                 deploy_period=periods, store_trajectories=True)
+    assert not isinstance(batch, dict), batch
+    summary_only = run_simulation_batch(masses, 0.7, 0.00456, 1.109, paths, curve_index=curve_index,
+                                        chute_height=300, chute_size=chute_sizes, chute_cd=2.2, deploy_period=periods)
+    assert summary_only.trajectories is None
+    assert np.array_equal(summary_only.apogee, batch.apogee)
+    for i in range(len(masses)):
+        results = run_simulation(masses[i], 0.7, 0.00456, 1.109, thrust_curve_path=paths[curve_index[i]],
+                                 chute_height=300, chute_size=chute_sizes[i], chute_cd=2.2,
+                                 deploy_period=periods[i], locate_events=False)
+        rows = batch.trajectory(i)
+        assert len(rows) == len(results)
+        assert np.isclose(batch.apogee[i], max(r['altitude'] for r in results), rtol=1e-9)
+        assert np.isclose(batch.landing_time[i], results[-1]['time'], rtol=1e-9)
+        assert np.isclose(batch.deployment_time[i], results[0]['deployment_time'], rtol=1e-9)
+        for a, b in zip(results, rows):
+            assert np.isclose(a['altitude'], b['altitude'], rtol=1e-9, atol=1e-9)
+            assert np.isclose(a['velocity'], b['velocity'], rtol=1e-9, atol=1e-9)
+
+
+def test_results_row_view():
+    """Columnar results should still read like the old list of per-step dicts"""
+    results = run_simulation(5.5, 0.7, 0.00456, 1.109, chute_size=15, chute_cd=2.2, deploy_period=1.0)
+    assert isinstance(results, SimulationResults)
+    assert list(results[0].keys())[:9] == list(SimulationResults.columns)
+    assert results[0]['deployment_time'] == results[-1]['deployment_time'] == results.metadata['deployment_time']
+    assert results[-1]['time'] == results.column('time')[-1]
+    assert len(results[:10]) == 10
+    assert max(r['altitude'] for r in results) == results.column('altitude').max()
+
+
+def test_thrust_curve_lookup():
+    """Cached scalar lookups, array lookups and the impulse table should agree"""
+    curve = load_thrust_curve(K240)
+    assert load_thrust_curve(K240) is curve
+    ts = np.linspace(0.0, curve.burn_time + 1.0, 997)
+    scalar = np.array([curve(t) for t in ts])
+    reversed_scalar = np.array([curve(t) for t in ts[::-1]])[::-1]
+    assert np.allclose(scalar, curve(ts))
+    assert np.allclose(reversed_scalar, scalar)
+    assert curve(0.0) == curve.thrusts[0]
+    assert curve(curve.burn_time + 0.01) == 0.0
+    assert np.isclose(curve.impulse_until(curve.burn_time), curve.total_impulse)
+    assert np.isclose(curve.cumulative_impulse[-1], curve.total_impulse)
+    eng = ThrustCurve.from_file(os.path.join(os.path.dirname(CURVE_DIR), 'rasp', 'example.eng'))
+    assert eng.peak_thrust == 120.0 and eng.burn_time == 0.45
+
+
+def test_adaptive_matches_fine_fixed_step():
+    """Dormand–Prince should reach the fine fixed-step answer with far fewer steps"""
+    fine = run_simulation(5.5, 0.7, 0.00456, 1.109, thrust_curve_path=K240, chute_size=1.5, chute_cd=2.2,
+                          time_step=0.001, deploy_period=1.0)
+    adaptive = run_simulation(5.5, 0.7, 0.00456, 1.109, thrust_curve_path=K240, chute_size=1.5, chute_cd=2.2,
+                              adaptive=True, rtol=1e-8, atol=1e-8, deploy_period=1.0)
+    assert adaptive.stats['integrator'] == 'dopri5'
+    assert adaptive.stats['steps'] < len(fine) / 10
+    assert adaptive.stats['rejected'] >= 0
+    assert np.isclose(adaptive.column('altitude').max(), fine.column('altitude').max(), rtol=2e-3)
+    assert np.isclose(adaptive[-1]['time'], fine[-1]['time'], rtol=2e-3)
+    assert np.isclose(adaptive.metadata['deployment_time'], fine.metadata['deployment_time'], atol=0.01)
+
+
+def test_events_located_within_step():
+    """Coarse steps should locate events where fine steps find them"""
+    kwargs = dict(thrust_curve_path=K240, chute_size=1.5, chute_cd=2.2, deploy_period=1.0)
+    fine = run_simulation(5.5, 0.7, 0.00456, 1.109, time_step=0.001, **kwargs)
+    coarse = run_simulation(5.5, 0.7, 0.00456, 1.109, adaptive=True, **kwargs)
+    assert [e['event'] for e in coarse.events] == ['burnout', 'apogee', 'deployment', 'landing']
+    assert coarse.event('burnout')['time'] == load_thrust_curve(K240).burn_time
+    assert np.isclose(coarse.event('deployment')['altitude'], 300.0, atol=1e-3)
+    assert np.isclose(coarse.event('apogee')['altitude'], fine.event('apogee')['altitude'], rtol=5e-4)
+    assert np.isclose(coarse.event('apogee')['time'], fine.event('apogee')['time'], atol=0.01)
+    assert np.isclose(coarse.event('landing')['time'], fine.event('landing')['time'], atol=0.1)
+    # The located apogee is between stored steps, never below the best stored one by more than tolerance
+    assert coarse.event('apogee')['altitude'] >= coarse.column('altitude').max() - 1e-6
+    assert coarse[-1]['time'] == coarse.event('landing')['time']
+
+
+def test_summary_matches_full_trajectory():
+    """summary_only should report exactly what post-processing the full run reports"""
+    for extra in (dict(), dict(adaptive=True)):
+        kwargs = dict(thrust_curve_path=K240, chute_size=1.5, chute_cd=2.2, deploy_period=1.0, **extra)
+        full = run_simulation(5.5, 0.7, 0.00456, 1.109, **kwargs)
+        summary = simulate_summary(5.5, 0.7, 0.00456, 1.109, **kwargs)
+        assert tuple(summary) == SUMMARY_KEYS
+        assert summary == summarize_results(full)
+        assert summary['max_velocity'] == full.column('velocity').max()
+        # Sampling the stored rows must not thin what the summary sees
+        assert simulate_summary(5.5, 0.7, 0.00456, 1.109, output_dt=1.0, **kwargs) == summarize_results(full)
+
+
+def test_no_liftoff_has_no_deployment():
+    """A motor too weak to lift the rocket lands it at once without opening the chute"""
+    for extra in (dict(), dict(adaptive=True), dict(locate_events=False)):
+        results = run_simulation(500.0, 0.7, 0.00456, 1.109, thrust_curve_path=K240, chute_size=1.5, chute_cd=2.2,
+                                 deploy_period=1.0, **extra)
+        assert [event['event'] for event in results.events] == ['landing']
+        assert results.metadata.get('deployment_time') is None
+
+
+def test_stream_matches_run():
+    """Chunks from iter_simulation should rebuild the run_simulation result; close() stops early"""
+    kwargs = dict(thrust_curve_path=K240, chute_size=1.5, chute_cd=2.2, deploy_period=1.0)
+    full = run_simulation(5.5, 0.7, 0.00456, 1.109, **kwargs)
+    streamed = SimulationResults()
+    for chunk in iter_simulation(5.5, 0.7, 0.00456, 1.109, chunk_size=300, **kwargs):
+        assert len(chunk) <= 300
+        streamed.extend(chunk)
+    for key in SimulationResults.columns:
+        assert np.array_equal(streamed.column(key), full.column(key)), key
+    assert streamed.events == full.events and streamed.metadata == full.metadata
+    assert streamed.stats == full.stats
+
+    stream = iter_simulation(5.5, 0.7, 0.00456, 1.109, **kwargs)
+    for sample in stream:
+        if any(e['event'] == 'apogee' for e in sample['events']):
+            stream.close()
+            break
+    assert sample['time'] >= full.event('apogee')['time'] > sample['time'] - 0.05
+    assert next(stream, None) is None
+
+
+def test_fast_descent_matches_integration():
+    """The closed-form chute descent should land where tight adaptive stepping does"""
+    kwargs = dict(chute_size=15.0, chute_cd=2.2, deploy_period=1.0, adaptive=True, rtol=1e-9, atol=1e-9)
+    full = run_simulation(5.5, 0.7, 0.00456, 1.109, **kwargs)
+    fast = run_simulation(5.5, 0.7, 0.00456, 1.109, fast_descent=True, **kwargs)
+    assert len(fast) < 0.6 * len(full)
+    assert np.isclose(fast.event('landing')['time'], full.event('landing')['time'], atol=1e-6)
+    assert np.isclose(fast.event('landing')['velocity'], full.event('landing')['velocity'], rtol=1e-6)
+    # Sparse samples still follow the integrated trajectory
+    t = fast.column('time')
+    assert np.allclose(np.interp(t, full.column('time'), full.column('altitude')), fast.column('altitude'), atol=0.01)
+
+
+def test_rk4_matches_fine_euler():
+    """RK4 at dt=0.05 should give the dt=0.001 apogee to within 0.1%"""
+    kwargs = dict(thrust_curve_path=K240, chute_size=1.5, chute_cd=2.2, deploy_period=1.0)
+    fine = run_simulation(5.5, 0.7, 0.00456, 1.109, time_step=0.001, **kwargs)
+    rk4 = run_simulation(5.5, 0.7, 0.00456, 1.109, time_step=0.05, integrator='rk4', **kwargs)
+    assert rk4.stats['integrator'] == 'rk4'
+    assert np.isclose(rk4.event('apogee')['altitude'], fine.event('apogee')['altitude'], rtol=1e-3)
+    assert 'error' in run_simulation(5.5, 0.7, 0.00456, 1.109, integrator='leapfrog', **kwargs)
+
+
+def test_output_sampling_keeps_events():
+    """output_dt thins the stored rows without changing the integration or losing event rows"""
+    kwargs = dict(thrust_curve_path=K240, chute_size=1.5, chute_cd=2.2, deploy_period=1.0, time_step=0.005)
+    full = run_simulation(5.5, 0.7, 0.00456, 1.109, **kwargs)
+    sampled = run_simulation(5.5, 0.7, 0.00456, 1.109, output_dt=0.5, **kwargs)
+    assert sampled.events == full.events and sampled.stats == full.stats
+    assert len(sampled) < len(full) / 50
+    times = sampled.column('time')
+    assert np.diff(times).max() <= 0.5 + 1e-6
+    for name in ('burnout', 'deployment', 'landing'):
+        assert sampled.event(name)['time'] in times
+    # Stored rows are the integrator's own rows, not interpolated
+    assert np.array_equal(np.interp(times, full.column('time'), full.column('altitude')), sampled.column('altitude'))
+    thinned = run_simulation(5.5, 0.7, 0.00456, 1.109, max_samples=300, **kwargs)
+    assert len(thinned) == 300 and thinned[-1]['time'] == full[-1]['time']
+
+
+if __name__ == "__main__":
+    test_batch_matches_scalar()
+    print("✓ Batch engine matches scalar engine")
+    test_results_row_view()
+    print("✓ Columnar results keep the row view")
+    test_thrust_curve_lookup()
+    print("✓ ThrustCurve lookups agree")
+    test_adaptive_matches_fine_fixed_step()
+    print("✓ Adaptive stepping matches fine fixed steps")
+    test_events_located_within_step()
+    print("✓ Events located within the step")
+    test_summary_matches_full_trajectory()
+    print("✓ Summary mode matches the full trajectory")
+    test_no_liftoff_has_no_deployment()
+    print("✓ No deployment without liftoff")
+    test_stream_matches_run()
+    print("✓ Streamed chunks match the full run")
+    test_fast_descent_matches_integration()
+    print("✓ Closed-form descent matches integration")
+    test_rk4_matches_fine_euler()
+    print("✓ RK4 matches fine-step Euler")
+    test_output_sampling_keeps_events()
+    print("✓ Output sampling keeps event rows")
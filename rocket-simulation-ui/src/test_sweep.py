@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Checks for parameter sweeps and their parallel plumbing (no GUI required)
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(__file__))
+
+import socket
+import tempfile
+import threading
+import time
+
+import numpy as np
+from simulation import simulate_summary, run_simulation, load_thrust_curve
+from sweep import sweep
+from monte_carlo import run_monte_carlo
+from worker_pool import WarmPool, worker_status, get_pool, shutdown_pool
+from distributed import distributed_sweep, run_worker
+from journal import Journal
+
+CURVE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'thrust_curves', 'csv')
+K240 = os.path.join(CURVE_DIR, 'Hypertek_835CC125J-K240.csv')
+BASE = dict(Cd=0.7, A=0.00456, rho=1.109, chute_cd=2.2, deploy_period=1.0, integrator='rk4', fast_descent=True)
+AXES = {'m': [4.5, 5.5, 6.5], 'chute_size': [1.0, 1.5], 'motor': [None, K240]}
+
+
+def test_sweep_cube_matches_single_runs():
+    """Every cell of the cube is the summary of that point, whatever the worker count"""
+    calls = []
+    serial = sweep(AXES, BASE, workers=1, chunk_size=5, progress=lambda done, total: calls.append((done, total)))
+    pooled = sweep(AXES, BASE, workers=2, chunk_size=3)
+    assert serial.shape == (3, 2, 2) and not serial.errors
+    assert calls[-1] == (12, 12) and len(calls) == 3
+    for key, values in serial.metrics.items():
+        assert np.array_equal(values, pooled.metrics[key], equal_nan=True), key
+    single = simulate_summary(m=6.5, chute_size=1.0, thrust_curve_path=K240, **BASE)
+    assert serial.sel('apogee', m=6.5, chute_size=1.0, motor=K240) == single['apogee']
+    assert serial['apogee'][2, 0, 1] == single['apogee']
+    assert serial.sel('apogee', motor=K240).shape == (3, 2)
+
+
+def test_sweep_records_unloadable_curves():
+    """A missing thrust curve file is one entry in errors, not an exception that loses the cube"""
+    results = sweep({'motor': [None, '/nope/missing.csv']}, dict(BASE, m=5.5), workers=1)
+    assert [index for index, _ in results.errors] == [(1,)] and 'missing.csv' in results.errors[0][1]
+    assert not np.isnan(results['apogee'][0]) and np.isnan(results['apogee'][1])
+
+
+def test_shared_memory_trajectories():
+    """Trajectories written by workers into shared memory match an in-process run"""
+    base = dict(m=5.5, chute_size=1.5, **BASE)
+    serial = run_monte_carlo(base, {'m': 0.1}, n=6, workers=1, seed=4, trajectory_rows=120)
+    pooled = run_monte_carlo(base, {'m': 0.1}, n=6, workers=2, seed=4, batch_size=2, trajectory_rows=120)
+    assert np.array_equal(serial.trajectories, pooled.trajectories)
+    assert np.array_equal(serial.lengths, pooled.lengths)
+    run = run_simulation(m=float(serial.inputs['m'][2]), chute_size=1.5, **BASE)
+    stored = pooled.trajectory(2)
+    assert len(stored) <= 120 and stored[-1]['time'] == run[-1]['time']
+    assert stored.metadata == run.metadata
+    assert pooled.outcomes['max_velocity'][2] == run.column('velocity').max()
+
+
+def test_warm_pool_preloads_curves():
+    """Workers start with the curve library parsed and can be handed to the ensemble APIs"""
+    with WarmPool(workers=2, curve_paths=[K240]) as pool:
+        status = pool.submit(worker_status).result()
+        assert status['curves'] >= 2  # at least the default curve and K240
+        assert status['pid'] != os.getpid()
+        results = sweep({'m': [4.5, 5.5]}, BASE, pool=pool, chunk_size=1)
+        assert np.array_equal(results['apogee'], sweep({'m': [4.5, 5.5]}, BASE, workers=1)['apogee'])
+    # workers=None reuses the running shared pool whatever its size instead of rebuilding it
+    shared = get_pool(3)
+    try:
+        results = sweep({'m': [4.5, 5.5]}, BASE, chunk_size=1)
+        assert get_pool() is shared and shared.workers == 3
+        assert np.array_equal(results['apogee'], sweep({'m': [4.5, 5.5]}, BASE, workers=1)['apogee'])
+    finally:
+        shutdown_pool()
+
+
+def _stalled_worker(address):
+    """Takes a chunk and never answers, like a worker on a host that froze."""
+    with socket.create_connection(address) as sock, sock.makefile('r') as reader:
+        sock.sendall(b'{"type": "hello"}\n')
+        reader.readline()  # base
+        reader.readline()  # chunk
+        time.sleep(3)
+
+
+def test_distributed_sweep_requeues_stalled_chunks():
+    """Localhost TCP workers reproduce the local cube even when one of them stalls"""
+    axes = {'m': [4.5, 5.5, 6.5], 'motor': [None, os.path.basename(K240)]}  # workers resolve the bare name
+    def launch(address):
+        address = ('127.0.0.1', address[1])
+        threading.Thread(target=_stalled_worker, args=(address,), daemon=True).start()
+        time.sleep(0.2)  # let the stalled worker grab the first chunk
+        for _ in range(2):
+            threading.Thread(target=run_worker, args=address, daemon=True).start()
+
+    remote = distributed_sweep(axes, BASE, host='127.0.0.1', chunk_size=1, chunk_timeout=0.5,
+                               on_listening=launch, timeout=60)
+    local = sweep({'m': axes['m'], 'motor': [None, K240]}, BASE, workers=1)
+    assert not remote.errors
+    for key, values in local.metrics.items():
+        assert np.array_equal(remote[key], values), key
+
+
+def test_distributed_sweep_reports_failures():
+    """A point that raises is one error, not a dead worker; a chunk nobody finishes is given up"""
+    def launch(address):
+        for _ in range(2):
+            threading.Thread(target=run_worker, args=('127.0.0.1', address[1]), daemon=True).start()
+    results = distributed_sweep({'motor': [None, 'missing.csv']}, dict(BASE, m=5.5), host='127.0.0.1', chunk_size=1,
+                                on_listening=launch, timeout=60)
+    assert [index for index, _ in results.errors] == [(1,)] and not np.isnan(results['apogee'][0])
+    stalled = distributed_sweep({'m': [5.5]}, BASE, host='127.0.0.1', chunk_timeout=0.5, max_requeues=0, timeout=30,
+                                on_listening=lambda address: threading.Thread(
+                                    target=_stalled_worker, args=(('127.0.0.1', address[1]),), daemon=True).start())
+    assert len(stalled.errors) == 1 and 'abandoned' in stalled.errors[0][1]
+    # Values that cannot cross the wire are rejected up front instead of killing worker threads
+    for axes, base in (({'motor': [load_thrust_curve(K240)]}, BASE), ({'m': [5.5]}, dict(BASE, Cd=np.float32(0.7)))):
+        try:
+            distributed_sweep(axes, base, host='127.0.0.1', timeout=5)
+        except ValueError as e:
+            assert 'JSON' in str(e)
+        else:
+            raise AssertionError("expected ValueError")
+
+
+def test_journal_resume():
+    """A sweep killed after its first chunk resumes from the journal and computes only the rest"""
+    base = dict(BASE, deploy_period=None)  # random deploy periods: points carry seeds
+    full = sweep(AXES, base, workers=1, seed=11)
+    class Crash(Exception):
+        pass
+    def crash(done, total):
+        raise Crash()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'sweep.journal')
+        try:
+            sweep(AXES, base, workers=1, chunk_size=4, seed=11, progress=crash, journal=path)
+        except Crash:
+            pass
+        with open(path, 'a') as f:
+            f.write('{"k": "torn')  # the process died mid-write
+        assert len(Journal(path, full.metrics)) == 4
+        calls = []
+        resumed = sweep(AXES, base, workers=1, chunk_size=4, seed=11, journal=path,
+                        progress=lambda done, total: calls.append(done))
+        assert calls == [8, 12]
+        # A second resume still sees everything recorded after the torn line
+        with Journal(path, full.metrics) as journal:
+            assert len(journal) == 12
+        calls.clear()
+        again = sweep(AXES, base, workers=1, chunk_size=4, seed=11, journal=path,
+                      progress=lambda done, total: calls.append(done))
+        assert calls == []
+    for key in full.metrics:
+        np.testing.assert_array_equal(resumed[key], full[key])
+        np.testing.assert_array_equal(again[key], full[key])
+
+
+if __name__ == "__main__":
+    test_sweep_cube_matches_single_runs()
+    print("✓ Sweep cube matches single runs")
+    test_sweep_records_unloadable_curves()
+    print("✓ Sweep records unloadable curves as errors")
+    test_shared_memory_trajectories()
+    print("✓ Shared-memory trajectories match in-process runs")
+    test_warm_pool_preloads_curves()
+    print("✓ Warm pool preloads the curve library")
+    test_distributed_sweep_requeues_stalled_chunks()
+    print("✓ Distributed sweep re-queues stalled chunks")
+    test_distributed_sweep_reports_failures()
+    print("✓ Distributed sweep reports failed points and abandoned chunks")
+    test_journal_resume()
+    print("✓ Journaled sweep resumes after a crash")
@@ -38,6 +38,11 @@ def format_simulation_results(results):
     return formatted_results
 
 def prepare_data_for_visualization(simulation_data):
+    # Columnar SimulationResults: read the arrays directly instead of building rows
+    if hasattr(simulation_data, 'column'):
+        return (simulation_data.column('time').tolist(),
+                simulation_data.column('altitude').tolist(),
+                simulation_data.column('velocity').tolist())
     times = [data['time'] for data in simulation_data]
     altitudes = [data['altitude'] for data in simulation_data]
     velocities = [data['velocity'] for data in simulation_data]
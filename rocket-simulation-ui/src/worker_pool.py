@@ -0,0 +1,124 @@
+"""
+Long-lived process pool shared by the GUI, scripts and the ensemble APIs.
+
+Each worker imports the engine and parses the thrust-curve library once when
+it starts, so later jobs only pay for the simulations themselves. Jobs go
+through the executor's call queue; get_pool() hands out one pool per process
+that run_monte_carlo, sweep and the GUI all reuse.
+"""
+
+import atexit
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+
+from simulation import list_thrust_curves
+
+
+def _warm_worker(curve_paths):
+    """Pool initializer: import the engine and fill load_thrust_curve's cache."""
+    # Deliberate pre-warming imports, unused here: jobs import these lazily (scipy.optimize
+    # for event location, monte_carlo for the task functions), so pay for them up front
+    import scipy.optimize  # noqa: F401
+    import monte_carlo  # noqa: F401
+    from simulation import load_thrust_curve, simulate_summary
+    load_thrust_curve(None)
+    for path in curve_paths:
+        try:
+            load_thrust_curve(path)
+        except (OSError, ValueError):
+            pass
+    # One coarse run so first-call costs are paid before any real job
+    simulate_summary(5.5, 0.7, 0.00456, 1.109, deploy_period=1.0, time_step=0.5)
+
+
+def _ping(delay):
+    time.sleep(delay)
+    return os.getpid()
+
+
+def worker_status():
+    """Job that reports a worker's pid and how many thrust curves it has cached."""
+    import simulation
+    return {'pid': os.getpid(), 'curves': len(simulation._thrust_curve_cache)}
+
+
+class WarmPool:
+    """
+    ProcessPoolExecutor whose workers start with the engine imported and the
+    thrust-curve library parsed.
+
+    workers: Process count (default: all cores)
+    curve_paths: Curves to preload (default: everything in thrust_curves/)
+    warm: Start every worker now instead of on the first jobs
+    """
+
+    def __init__(self, workers=None, curve_paths=None, warm=True):
+        self.workers = workers or os.cpu_count() or 1
+        self.curve_paths = list_thrust_curves() if curve_paths is None else list(curve_paths)
+        if os.name == 'posix':
+            # Workers must share this process's resource tracker; one of their own would
+            # report the shared_results blocks they attach to as leaked when they exit
+            from multiprocessing import resource_tracker
+            resource_tracker.ensure_running()
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_worker,
+                                             initargs=(self.curve_paths,))
+        if warm:
+            self.warm_up()
+
+    def warm_up(self):
+        """Block until every worker process has started and run its initializer."""
+        # Overlapping jobs make the executor start a process for each of them
+        wait([self._executor.submit(_ping, 0.05) for _ in range(self.workers)])
+
+    def submit(self, fn, *args, **kwargs):
+        """Queue fn(*args, **kwargs) on a worker; returns a Future."""
+        return self._executor.submit(fn, *args, **kwargs)
+
+    def map(self, fn, *iterables, chunksize=1):
+        """Like Executor.map: results in order, computed on the workers."""
+        return self._executor.map(fn, *iterables, chunksize=chunksize)
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+    def __repr__(self):
+        return f"WarmPool({self.workers} workers, {len(self.curve_paths)} curves preloaded)"
+
+
+_shared_pool = None
+
+
+def get_pool(workers=None):
+    """
+    Return the process-wide WarmPool, starting it on first use. Asking for a
+    different worker count replaces it; workers=None takes whatever is running.
+    """
+    global _shared_pool
+    if _shared_pool is not None and workers not in (None, _shared_pool.workers):
+        shutdown_pool()
+    if _shared_pool is None:
+        _shared_pool = WarmPool(workers)
+    return _shared_pool
+
+
+def running_pool():
+    """The shared WarmPool if one has been started, else None (never starts one)."""
+    return _shared_pool
+
+
+def shutdown_pool():
+    """Stop the shared pool (also done at interpreter exit)."""
+    global _shared_pool
+    if _shared_pool is not None:
+        _shared_pool.shutdown()
+        _shared_pool = None
+
+
+atexit.register(shutdown_pool)